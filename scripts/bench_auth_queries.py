@@ -0,0 +1,108 @@
+"""统计权限检测每条消息产生的数据库查询次数
+
+PYTHONPATH=. python scripts/bench_auth_queries.py
+"""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import nonebot
+
+nonebot.init(db_url="sqlite://:memory:", log_level="WARNING")
+
+from tortoise import Tortoise
+
+from zhenxun.builtin_plugins.hooks._auth_checker import checker
+from zhenxun.models.bot_console import BotConsole
+from zhenxun.models.group_console import GroupConsole
+from zhenxun.models.level_user import LevelUser
+from zhenxun.models.plugin_info import PluginInfo
+from zhenxun.services.db_context import disconnect, init
+from zhenxun.utils.enum import PluginType
+from zhenxun.utils.manager.auth_snapshot import AuthSnapshot
+
+MESSAGE_COUNT = 200
+
+BOT_ID = "12345"
+GROUP_ID = "20000"
+USER_ID = "10000"
+MODULE_PATH = "zhenxun.plugins.bench"
+
+
+class QueryCounter:
+    METHODS = (
+        "execute_query",
+        "execute_query_dict",
+        "execute_insert",
+        "execute_many",
+    )
+
+    def __init__(self):
+        self.count = 0
+
+    def install(self):
+        db = Tortoise.get_connection("default")
+        for name in self.METHODS:
+            setattr(db, name, self._wrap(getattr(db, name)))
+
+    def _wrap(self, func):
+        async def wrapper(*args: Any, **kwargs: Any):
+            self.count += 1
+            return await func(*args, **kwargs)
+
+        return wrapper
+
+
+async def prepare():
+    await BotConsole.create(bot_id=BOT_ID, platform="qq")
+    await PluginInfo.create(
+        module="bench",
+        module_path=MODULE_PATH,
+        name="bench",
+        plugin_type=PluginType.NORMAL,
+        admin_level=1,
+    )
+    await GroupConsole.create(group_id=GROUP_ID)
+    await LevelUser.set_level(USER_ID, GROUP_ID, 5)
+
+
+def build_args():
+    matcher = SimpleNamespace(
+        type="message",
+        plugin=SimpleNamespace(module_name=MODULE_PATH, name="bench"),
+    )
+    bot = SimpleNamespace(self_id=BOT_ID, config=SimpleNamespace(superusers=set()))
+    session = SimpleNamespace(
+        id1=USER_ID, id2=None, id3=GROUP_ID, platform="qq", bot_type="OneBot V11"
+    )
+    message = SimpleNamespace(extract_plain_text=lambda: "bench")
+    return matcher, object(), bot, session, message
+
+
+async def run(counter: QueryCounter, enabled: bool) -> float:
+    AuthSnapshot.enabled = enabled
+    AuthSnapshot.invalidate()
+    args = build_args()
+    await checker.auth(*args)  # type: ignore
+    counter.count = 0
+    for _ in range(MESSAGE_COUNT):
+        await checker.auth(*args)  # type: ignore
+    return counter.count / MESSAGE_COUNT
+
+
+async def main():
+    await init()
+    await prepare()
+    counter = QueryCounter()
+    counter.install()
+    before = await run(counter, False)
+    after = await run(counter, True)
+    print(f"消息数: {MESSAGE_COUNT}")  # noqa: T201
+    print(f"直接查询数据库: {before:.2f} 次查询/条消息")  # noqa: T201
+    print(f"使用权限快照: {after:.2f} 次查询/条消息")  # noqa: T201
+    await disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+"""统计帮助菜单与签到卡片html渲染的 p50/p99 耗时（需要已下载 resources 资源与浏览器）
+
+PYTHONPATH=. python scripts/bench_html_render.py
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from decimal import Decimal
+import statistics
+import time
+from types import SimpleNamespace
+
+import nonebot
+
+nonebot.init(db_url="sqlite://:memory:", log_level="WARNING")
+nonebot.load_plugin("zhenxun.builtin_plugins.help")
+nonebot.load_plugin("zhenxun.builtin_plugins.sign_in")
+
+from nonebot_plugin_htmlrender import template_to_pic
+
+from zhenxun.builtin_plugins.help.html_help import build_html_image
+from zhenxun.builtin_plugins.sign_in.utils import _generate_html_card
+from zhenxun.models.sign_user import SignUser
+from zhenxun.services.db_context import disconnect, init
+from zhenxun.services.html_render import HtmlRender
+
+NUMBER = 30
+
+USER_ID = "10000"
+
+
+async def legacy_template_to_pic(**kwargs) -> bytes:
+    # 原实现：每次新建页面，networkidle 后截图
+    for key in ("type", "quality", "device_scale_factor", "screenshot_timeout"):
+        kwargs.pop(key, None)
+    return await template_to_pic(**kwargs, wait=2)
+
+
+async def bench(func: Callable[[], Awaitable]) -> tuple[float, float]:
+    await func()
+    costs = []
+    for _ in range(NUMBER):
+        start = time.perf_counter()
+        await func()
+        costs.append((time.perf_counter() - start) * 1000)
+    quantiles = statistics.quantiles(costs, n=100)
+    return quantiles[49], quantiles[98]
+
+
+async def main():
+    await init()
+    user = await SignUser.get_user(USER_ID, "qq")
+    user.impression = Decimal(66)
+    session = SimpleNamespace(user=SimpleNamespace(id=USER_ID, avatar=None))
+
+    async def menu():
+        await build_html_image(None, False)
+
+    async def card():
+        await _generate_html_card(user, session, "bench", 1.5, 100, "好感度+1")  # type: ignore
+
+    render = HtmlRender.template_to_pic
+    print(f"每项渲染次数: {NUMBER}")  # noqa: T201
+    for name, func in (("帮助菜单", menu), ("签到卡片", card)):
+        HtmlRender.template_to_pic = legacy_template_to_pic  # type: ignore
+        before = await bench(func)
+        HtmlRender.template_to_pic = render
+        after = await bench(func)
+        print(f"{name} 每次新建页面: p50 {before[0]:.0f} ms, p99 {before[1]:.0f} ms")  # noqa: T201
+        print(f"{name} HtmlRender: p50 {after[0]:.0f} ms, p99 {after[1]:.0f} ms")  # noqa: T201
+    await HtmlRender.shutdown()
+    await disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
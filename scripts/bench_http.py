@@ -0,0 +1,69 @@
+"""统计本地服务器上 1000 次顺序获取头像的耗时
+
+PYTHONPATH=. python scripts/bench_http.py
+"""
+
+import asyncio
+import time
+
+import httpx
+import nonebot
+
+nonebot.init(log_level="INFO")
+nonebot.require("nonebot_plugin_alconna")
+nonebot.require("nonebot_plugin_htmlrender")
+
+from zhenxun.utils.http_utils import HttpClientPool
+
+NUMBER = 1000
+
+AVATAR = b"\x89PNG\r\n\x1a\n" + b"\x00" * 4096
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    # 简单的 HTTP/1.1 服务，支持连接保持
+    try:
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: image/png\r\n"
+                b"Content-Length: " + str(len(AVATAR)).encode() + b"\r\n\r\n" + AVATAR
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def before(url: str):
+    # 每次请求新建客户端
+    for _ in range(NUMBER):
+        async with httpx.AsyncClient() as client:
+            (await client.get(url)).content
+
+
+async def after(url: str):
+    for _ in range(NUMBER):
+        (await HttpClientPool.get_client().get(url)).content
+
+
+async def main():
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/g?b=qq&nk=10000&s=160"
+    async with server:
+        start = time.perf_counter()
+        await before(url)
+        before_time = time.perf_counter() - start
+        start = time.perf_counter()
+        await after(url)
+        after_time = time.perf_counter() - start
+        await HttpClientPool.close()
+    print(f"请求次数: {NUMBER}")  # noqa: T201
+    print(f"每次新建客户端: {before_time:.2f}s")  # noqa: T201
+    print(f"共享连接池: {after_time:.2f}s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
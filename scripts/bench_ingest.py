@@ -0,0 +1,115 @@
+"""对比聊天记录原写入方式与 IngestPipeline 的写入耗时与事件循环最长阻塞时间
+
+PYTHONPATH=. python scripts/bench_ingest.py
+"""
+
+import asyncio
+from collections.abc import Awaitable
+from datetime import datetime
+from pathlib import Path
+import tempfile
+import time
+
+import nonebot
+
+DB_PATH = Path(tempfile.mkdtemp()) / "bench_ingest.db"
+
+nonebot.init(db_url=f"sqlite://{DB_PATH}", log_level="WARNING")
+
+from zhenxun.models.chat_history import ChatHistory
+from zhenxun.services.db_context import disconnect, init
+from zhenxun.services.ingest import IngestPipeline
+
+MESSAGE_COUNT = 20000
+
+FIELDS = (
+    "user_id",
+    "group_id",
+    "text",
+    "plain_text",
+    "bot_id",
+    "platform",
+    "create_time",
+)
+
+
+def build_row(i: int) -> tuple:
+    text = f"bench message {i}"
+    return (str(10000 + i % 50), "20000", text, text, "12345", "qq", datetime.now())
+
+
+async def measure(aw: Awaitable) -> tuple[float, float]:
+    """返回耗时与期间事件循环的最长阻塞时间"""
+    stall = 0.0
+    done = False
+
+    async def tick():
+        nonlocal stall
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stall = max(stall, now - last - 0.001)
+            last = now
+
+    task = asyncio.create_task(tick())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await aw
+    cost = time.perf_counter() - start
+    done = True
+    await task
+    return cost, stall
+
+
+async def bench_temp_list() -> tuple[float, float, float]:
+    # 原实现：每条消息构造模型实例放入列表，定时任务一次 bulk_create 全部写入
+    temp_list = []
+    start = time.perf_counter()
+    for i in range(MESSAGE_COUNT):
+        temp_list.append(ChatHistory(**dict(zip(FIELDS, build_row(i)))))
+    handle = time.perf_counter() - start
+    cost, stall = await measure(ChatHistory.bulk_create(temp_list))
+    return handle, cost, stall
+
+
+async def bench_pipeline() -> tuple[float, float, float]:
+    pipeline = IngestPipeline(
+        ChatHistory,
+        FIELDS,
+        max_size=MESSAGE_COUNT,
+        batch_size=MESSAGE_COUNT + 1,
+        flush_interval=3600,
+    )
+    start = time.perf_counter()
+    for i in range(MESSAGE_COUNT):
+        await pipeline.put(build_row(i))
+    handle = time.perf_counter() - start
+    cost, stall = await measure(pipeline.flush())
+    await pipeline.stop()
+    IngestPipeline.pipelines.remove(pipeline)
+    return handle, cost, stall
+
+
+async def main():
+    await init()
+    try:
+        result = {
+            "TEMP_LIST + bulk_create": await bench_temp_list(),
+            "IngestPipeline": await bench_pipeline(),
+        }
+        assert await ChatHistory.all().count() == MESSAGE_COUNT * 2
+    finally:
+        await disconnect()
+        DB_PATH.unlink(missing_ok=True)
+    print(f"消息数: {MESSAGE_COUNT}，数据库: sqlite")  # noqa: T201
+    for name, (handle, cost, stall) in result.items():
+        print(  # noqa: T201
+            f"{name}: 入队 {handle * 1e6 / MESSAGE_COUNT:.1f} us/条，"
+            f"写入 {cost:.3f}s ({MESSAGE_COUNT / cost:.0f} 条/s)，"
+            f"事件循环最长阻塞 {stall * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""统计日志等级未启用时一次 logger.debug 调用的耗时
+
+PYTHONPATH=. python scripts/bench_log.py
+"""
+
+from timeit import timeit
+
+import nonebot
+
+nonebot.init(log_level="INFO")
+
+from zhenxun.services.log import logger
+
+NUMBER = 100000
+
+MODULE = "bench"
+USER_ID = "10000"
+GROUP_ID = "20000"
+
+
+def eager():
+    # 未跳过时的调用：先构造消息，再解析模板交由 loguru 过滤
+    logger._logger__log(  # type: ignore
+        "DEBUG",
+        f"开始进行限制 {MODULE}(CD)...",
+        "AuthChecker",
+        session=USER_ID,
+        group_id=GROUP_ID,
+    )
+
+
+def lazy():
+    logger.debug(
+        "开始进行限制 %s(%s)...",
+        "AuthChecker",
+        session=USER_ID,
+        group_id=GROUP_ID,
+        args=(MODULE, "CD"),
+    )
+
+
+def main():
+    before = timeit(eager, number=NUMBER) / NUMBER * 1e9
+    after = timeit(lazy, number=NUMBER) / NUMBER * 1e9
+    print(f"调用次数: {NUMBER}")  # noqa: T201
+    print(f"格式化后由 loguru 过滤: {before:.0f} ns/次")  # noqa: T201
+    print(f"按日志等级直接跳过: {after:.0f} ns/次")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""统计 876x274 卡片透明化与进度条渐变的耗时（需要已下载 resources 资源）
+
+PYTHONPATH=. python scripts/bench_pixel.py
+"""
+
+import asyncio
+import itertools
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+from zhenxun.utils._build_image import BuildImage
+
+NUMBER = 5
+
+WIDTH, HEIGHT = 876, 274
+
+BG_1 = (0, 245, 246)
+BG_2 = (254, 1, 254)
+
+
+def transparent_per_pixel(image: Image.Image, alpha_ratio: float = 2, n: int = 0):
+    # 原实现：逐像素 getpixel/putpixel
+    image = image.convert("RGBA")
+    x, y = image.size
+    for i, k in itertools.product(range(n, x - n), range(n, y - n)):
+        color = image.getpixel((i, k))
+        image.putpixel((i, k), (*color[:-1], int(100 * alpha_ratio)))  # type: ignore
+
+
+async def gradient_per_point():
+    # 原实现：每个像素调用一次 BuildImage.point，每次调用都切换到线程
+    image = BuildImage(950, 50, font=ImageFont.load_default())  # type: ignore
+    steps = [(c2 - c1) / 950 for c1, c2 in zip(BG_1, BG_2)]
+    for y in range(950):
+        fill = tuple(round(c + s * y) for c, s in zip(BG_1, steps))
+        for x in range(50):
+            await image.point((y, x), fill=fill)  # type: ignore
+
+
+def per_call(func) -> float:
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        func()
+    return (time.perf_counter() - start) / NUMBER * 1000
+
+
+async def async_per_call(func) -> float:
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        await func()
+    return (time.perf_counter() - start) / NUMBER * 1000
+
+
+async def main():
+    font = ImageFont.load_default()
+    card = Image.new("RGBA", (WIDTH, HEIGHT), (255, 255, 255))
+    ImageDraw.Draw(card).rectangle((100, 50, 700, 200), fill=(200, 80, 30))
+
+    async def transparent():
+        image = BuildImage(WIDTH, HEIGHT, font=font)  # type: ignore
+        image.markImg = card.copy()
+        await image.transparent(2)
+
+    async def gradient():
+        BuildImage.linear_gradient(950, 50, BG_1, BG_2)
+
+    before = per_call(lambda: transparent_per_pixel(card.copy()))
+    after = await async_per_call(transparent)
+    print(f"{WIDTH}x{HEIGHT} 透明化 逐像素: {before:.1f} ms/次")  # noqa: T201
+    print(f"{WIDTH}x{HEIGHT} 透明化 通道操作: {after:.2f} ms/次")  # noqa: T201
+    before = await async_per_call(gradient_per_point)
+    after = await async_per_call(gradient)
+    print(f"950x50 渐变 逐点绘制: {before:.1f} ms/次")  # noqa: T201
+    print(f"950x50 渐变 linear_gradient: {after:.2f} ms/次")  # noqa: T201
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
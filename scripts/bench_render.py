@@ -0,0 +1,78 @@
+"""统计签到卡片与表格图片每秒生成次数（需要已下载 resources 资源）
+
+PYTHONPATH=. python scripts/bench_render.py
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from decimal import Decimal
+import time
+from types import SimpleNamespace
+
+import nonebot
+
+nonebot.init(db_url="sqlite://:memory:", log_level="WARNING")
+nonebot.load_plugin("zhenxun.builtin_plugins.sign_in")
+
+from zhenxun.builtin_plugins.sign_in.utils import (
+    _generate_card,
+    generate_progress_bar_pic,
+)
+from zhenxun.models.sign_user import SignUser
+from zhenxun.services.db_context import disconnect, init
+from zhenxun.utils import _build_image
+from zhenxun.utils.image_utils import ImageTemplate
+
+NUMBER = 50
+
+USER_ID = "10000"
+
+
+def clear_cache():
+    _build_image._truetype.cache_clear()
+    _build_image._text_bbox.cache_clear()
+
+
+async def bench(func: Callable[[], Awaitable], cached: bool) -> float:
+    clear_cache()
+    await func()
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        if not cached:
+            clear_cache()
+        await func()
+    return NUMBER / (time.perf_counter() - start)
+
+
+async def main():
+    await init()
+    await generate_progress_bar_pic()
+    user = await SignUser.get_user(USER_ID, "qq")
+    user.impression = Decimal(66)
+    session = SimpleNamespace(user=SimpleNamespace(id=USER_ID, avatar=None))
+    data_list = [
+        [f"{i}", f"用户{i}", f"{i * 1000}", f"{i * 3}", "qq"] for i in range(50)
+    ]
+
+    async def card():
+        await _generate_card(user, session, "bench", 1.5, 100, "好感度+1")  # type: ignore
+
+    async def table():
+        await ImageTemplate.table_page(
+            "好感度全局排行",
+            "你的排名在全局第 1 位哦!",
+            ["排名", "名称", "好感度", "签到次数", "平台"],
+            data_list,  # type: ignore
+        )
+
+    print(f"每项生成次数: {NUMBER}")  # noqa: T201
+    for name, func in (("_generate_card", card), ("table_page", table)):
+        before = await bench(func, False)
+        after = await bench(func, True)
+        print(f"{name} 每次生成前清空缓存: {before:.1f} 次/秒")  # noqa: T201
+        print(f"{name} 使用字体与文本尺寸缓存: {after:.1f} 次/秒")  # noqa: T201
+    await disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -66,7 +66,9 @@ def init_mocker(mocker: MockerFixture, tmp_path: Path):
     mock_platform = mocker.patch("zhenxun.builtin_plugins.check.data_source.platform")
     mock_platform.uname.return_value = platform_uname
 
-    mock_template_to_pic = mocker.patch("zhenxun.builtin_plugins.check.template_to_pic")
+    mock_template_to_pic = mocker.patch(
+        "zhenxun.builtin_plugins.check.HtmlRender.template_to_pic"
+    )
     mock_template_to_pic_return = mocker.AsyncMock()
     mock_template_to_pic.return_value = mock_template_to_pic_return
 
@@ -163,7 +165,6 @@ async def test_check(
             "viewport": {"width": 195, "height": 750},
             "base_url": f"file://{mock_template_path_new.absolute()}",
         },
-        wait=2,
     )
     mock_template_to_pic.assert_awaited_once()
     mock_build_message.assert_called_once_with(mock_template_to_pic_return)
@@ -255,7 +256,6 @@ async def test_check_arm(
             "viewport": {"width": 195, "height": 750},
             "base_url": f"file://{mock_template_path_new.absolute()}",
         },
-        wait=2,
     )
     mock_subprocess_check_output.assert_has_calls(
         [
@@ -34,6 +34,14 @@ async def test_plugin_store(
     mock_table_page_return = mocker.AsyncMock()
     mock_table_page.return_value = mock_table_page_return
 
+    async def render_cache_get(template: str, data, render):
+        return await render()
+
+    mocker.patch(
+        "zhenxun.builtin_plugins.plugin_store.data_source.RenderCache.get",
+        side_effect=render_cache_get,
+    )
+
     mock_build_message = mocker.patch(
         "zhenxun.builtin_plugins.plugin_store.MessageUtils.build_message"
     )
@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+from nonebug import App
+from pytest_mock import MockerFixture
+
+
+async def test_check_group_active(app: App, mocker: MockerFixture):
+    """
+    测试两日内未发言的群组关闭全部被动，查询次数与群组数量无关
+    """
+    from zhenxun.builtin_plugins.scheduler.chat_check import check_group_active
+    from zhenxun.models.chat_history import ChatHistory
+    from zhenxun.models.chat_hour_count import ChatHourCount
+    from zhenxun.models.group_console import GroupConsole
+    from zhenxun.models.task_info import TaskInfo
+
+    await TaskInfo.create(module="morning_goodnight", name="早晚安")
+    await TaskInfo.create(module="group_welcome", name="进群欢迎")
+    now = datetime.now()
+    groups = {
+        "active": now - timedelta(hours=3),
+        "inactive": now - timedelta(days=3),
+        "inactive_new": now - timedelta(days=5),
+    }
+    for group_id, time in groups.items():
+        await ChatHistory.create(
+            user_id="1",
+            group_id=group_id,
+            text="hi",
+            plain_text="hi",
+            bot_id="bot",
+            create_time=time,
+        )
+    await GroupConsole.create(group_id="inactive", group_name="inactive")
+    group_list = [
+        GroupConsole(group_id=group_id) for group_id in [*groups, "no_record"]
+    ]
+    mocker.patch(
+        "zhenxun.builtin_plugins.scheduler.chat_check.Config.get_config",
+        return_value=True,
+    )
+    mocker.patch("nonebot.get_bots", return_value={"bot": mocker.MagicMock()})
+    mocker.patch(
+        "zhenxun.builtin_plugins.scheduler.chat_check.PlatformUtils.get_group_list",
+        return_value=(group_list, "qq"),
+    )
+    history_filter = mocker.spy(ChatHistory, "filter")
+    count_filter = mocker.spy(ChatHourCount, "filter")
+
+    await check_group_active()
+
+    assert all("group_id" not in call.kwargs for call in history_filter.mock_calls)
+    assert count_filter.call_count == 2
+    block_task = "<morning_goodnight,<group_welcome,"
+    result = {group.group_id: group.block_task for group in await GroupConsole.all()}
+    assert result == {"inactive": block_task, "inactive_new": block_task}
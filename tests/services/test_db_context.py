@@ -0,0 +1,54 @@
+from nonebug import App
+
+
+async def test_snapshot_invalidate_after_write(app: App):
+    """
+    测试save, update, delete, bulk_create后快照重新加载
+    """
+    from zhenxun.models.group_console import GroupConsole
+    from zhenxun.models.level_user import LevelUser
+    from zhenxun.utils.manager.auth_snapshot import AuthSnapshot
+
+    group = await GroupConsole.create(group_id="snapshot", level=5)
+    assert (await AuthSnapshot.get_group("snapshot")).level == 5  # type: ignore
+
+    group.level = 3
+    await group.save()
+    assert (await AuthSnapshot.get_group("snapshot")).level == 3  # type: ignore
+
+    await GroupConsole.filter(group_id="snapshot").update(level=1)
+    assert (await AuthSnapshot.get_group("snapshot")).level == 1  # type: ignore
+
+    await GroupConsole.filter(group_id="snapshot").delete()
+    assert await AuthSnapshot.get_group("snapshot") is None
+
+    await GroupConsole.bulk_create([GroupConsole(group_id="snapshot", level=2)])
+    assert (await AuthSnapshot.get_group("snapshot")).level == 2  # type: ignore
+
+    assert not await AuthSnapshot.check_level("snapshot_user", "snapshot", 5)
+    await LevelUser.create(user_id="snapshot_user", group_id="snapshot", user_level=5)
+    assert await AuthSnapshot.check_level("snapshot_user", "snapshot", 5)
+
+
+async def test_chained_write_query(app: App):
+    """
+    测试写操作链式调用返回的查询同样更新数据版本
+    """
+    from tortoise.queryset import QuerySet
+
+    from zhenxun.models.group_console import GroupConsole
+    from zhenxun.services.db_context import _WriteQuery
+
+    class Chain:
+        def __init__(self, query):
+            self.query = query
+
+        def chain(self):
+            return self.query
+
+    await GroupConsole.create(group_id="chained", level=5)
+    query = QuerySet(GroupConsole).filter(group_id="chained").update(level=1)
+    version = GroupConsole.get_data_version()
+    wrapped = _WriteQuery(Chain(query), GroupConsole)
+    assert await wrapped.chain() == 1
+    assert GroupConsole.get_data_version() == version + 1
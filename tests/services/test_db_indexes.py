@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from nonebug import App
+from tortoise import Tortoise
+from tortoise.functions import Count, Sum
+
+from tests.config import GroupId, UserId
+
+
+def _index_name(model, *fields: str) -> str:
+    db = Tortoise.get_connection("default")
+    return db.schema_generator(db)._generate_index_name("idx", model, list(fields))
+
+
+async def _explain(query) -> str:
+    db = Tortoise.get_connection("default")
+    rows = await db.execute_query_dict(f"EXPLAIN QUERY PLAN {query.sql()}")
+    return "\n".join(row["detail"] for row in rows)
+
+
+async def test_create_indexes(app: App):
+    """
+    测试大表的索引不在建表时创建，只由create_indexes创建
+    """
+    from zhenxun.models.sign_log import SignLog
+    from zhenxun.services.db_context import MODEL_CLASSES, create_indexes
+
+    db = Tortoise.get_connection("default")
+    schema = db.schema_generator(db).get_create_schema_sql(safe=True)
+    names = [
+        _index_name(model, *index)
+        for model in MODEL_CLASSES
+        for index in getattr(model, "_indexes", ())
+    ]
+    assert names
+    assert all(name not in schema for name in names)
+
+    name = _index_name(SignLog, "user_id", "create_time")
+    await db.execute_script(f'DROP INDEX IF EXISTS "{name}";')
+    await create_indexes()
+    await create_indexes()
+    rows = await db.execute_query_dict(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?",
+        ["sign_log"],
+    )
+    assert name in [row["name"] for row in rows]
+
+
+async def test_query_use_indexes(app: App):
+    """
+    测试排行，调用统计，签到查询使用索引
+    """
+    from zhenxun.models.chat_history import ChatHistory
+    from zhenxun.models.chat_hour_count import ChatHourCount
+    from zhenxun.models.sign_log import SignLog
+    from zhenxun.models.statistics import Statistics
+    from zhenxun.services.db_context import create_indexes
+
+    await create_indexes()
+
+    group_id = str(GroupId.GROUP_ID_LEVEL_5)
+    user_id = str(UserId.SUPERUSER)
+    time = datetime.now() - timedelta(days=7)
+
+    plan = await _explain(
+        ChatHourCount.filter(group_id=group_id, hour__gte=time)
+        .annotate(count=Sum("num"))
+        .group_by("user_id")
+        .order_by("-count")
+        .limit(10)
+        .values_list("user_id", "count")
+    )
+    assert _index_name(ChatHourCount, "group_id", "hour") in plan
+
+    plan = await _explain(ChatHistory.filter(group_id=group_id, create_time__gte=time))
+    assert _index_name(ChatHistory, "group_id", "create_time") in plan
+
+    plan = await _explain(
+        ChatHistory.filter(user_id=user_id, group_id=group_id, create_time__gte=time)
+    )
+    assert _index_name(ChatHistory, "user_id", "group_id", "create_time") in plan
+
+    plan = await _explain(
+        Statistics.filter(user_id=user_id, group_id=group_id)
+        .annotate(count=Count("id"))
+        .group_by("plugin_name")
+        .values_list("plugin_name", "count")
+    )
+    assert _index_name(Statistics, "user_id", "group_id", "create_time") in plan
+
+    plan = await _explain(
+        SignLog.filter(user_id=user_id).order_by("-create_time").limit(1)
+    )
+    assert _index_name(SignLog, "user_id", "create_time") in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,146 @@
+import asyncio
+from collections import defaultdict
+from pathlib import Path
+import re
+
+from nonebug import App
+import pytest
+from pytest_mock import MockerFixture
+
+
+class FakePage:
+    def __init__(self, browser: "FakeBrowser"):
+        self.browser = browser
+        self.closed = False
+        self.handlers = {}
+        self.content = ""
+        self.init_scripts: list[str] = []
+        self.globals: set[str] = set()
+        """模拟 window 上的全局声明，只有导航到新页面时清空"""
+        self.navigations = 0
+
+    def on(self, event: str, handler):
+        self.handlers[event] = handler
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def add_init_script(self, script: str):
+        self.init_scripts.append(script)
+
+    async def goto(self, url: str):
+        self.url = url
+        self.globals.clear()
+        self.navigations += 1
+
+    async def set_content(self, html: str, wait_until: str):
+        for name in re.findall(r"\b(?:const|let|class) (\w+)", html):
+            if name in self.globals:
+                raise RuntimeError(f"Identifier '{name}' has already been declared")
+            self.globals.add(name)
+        self.content = html
+
+    async def wait_for_function(self, script: str, timeout: float):
+        pass
+
+    async def screenshot(self, **kwargs) -> bytes:
+        self.browser.running += 1
+        self.browser.max_running = max(self.browser.max_running, self.browser.running)
+        await asyncio.sleep(0.01)
+        self.browser.running -= 1
+        if self.content == "error":
+            raise RuntimeError("screenshot failed")
+        return self.content.encode()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.pages: list[FakePage] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def new_page(self, **kwargs) -> FakePage:
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+
+@pytest.fixture
+def browser(mocker: MockerFixture, tmp_path: Path):
+    from zhenxun.services.html_render import HtmlRender
+
+    (tmp_path / "main.html").write_text("{{ data }}", encoding="utf8")
+    browser = FakeBrowser()
+    mocker.patch("zhenxun.services.html_render.get_browser", return_value=browser)
+    mocker.patch.object(HtmlRender, "_idle", defaultdict(list))
+    mocker.patch.object(HtmlRender, "_semaphore", None)
+    return browser
+
+
+async def render(path: Path, data: str) -> bytes:
+    from zhenxun.services.html_render import HtmlRender
+
+    return await HtmlRender.template_to_pic(
+        template_path=str(path),
+        template_name="main.html",
+        templates={"data": data},
+        pages={"viewport": {"width": 100, "height": 100}},
+    )
+
+
+async def test_reuse_page(app: App, browser: FakeBrowser, tmp_path: Path):
+    """
+    测试渲染后页面放回池中复用，出错或崩溃的页面被关闭
+    """
+    assert await render(tmp_path, "a") == b"a"
+    assert await render(tmp_path, "b") == b"b"
+    assert len(browser.pages) == 1
+
+    with pytest.raises(RuntimeError):
+        await render(tmp_path, "error")
+    assert browser.pages[0].closed
+    assert await render(tmp_path, "c") == b"c"
+    assert len(browser.pages) == 2
+
+    browser.pages[1].handlers["crash"](browser.pages[1])
+    assert await render(tmp_path, "d") == b"d"
+    assert len(browser.pages) == 3
+    assert browser.pages[1].closed
+
+
+async def test_limit(
+    app: App, browser: FakeBrowser, tmp_path: Path, mocker: MockerFixture
+):
+    """
+    测试同时渲染数量与空闲页面数量
+    """
+    from zhenxun.services.html_render import HtmlRender
+
+    mocker.patch.object(HtmlRender, "limit", 2)
+    results = await asyncio.gather(*(render(tmp_path, str(i)) for i in range(6)))
+    assert results == [str(i).encode() for i in range(6)]
+    assert browser.max_running == 2
+    assert len(browser.pages) == 2
+    assert sum(not page.closed for page in browser.pages) == HtmlRender.max_idle
+
+
+async def test_reset_globals(app: App, browser: FakeBrowser, tmp_path: Path):
+    """
+    测试复用页面前重新打开模板路径，模板声明的全局变量不会重复声明
+    """
+    from zhenxun.services.html_render import ECHARTS_HOOK
+
+    (tmp_path / "main.html").write_text(
+        "<script>const data = {{ data }};</script>", encoding="utf8"
+    )
+    assert await render(tmp_path, "1") == b"<script>const data = 1;</script>"
+    assert await render(tmp_path, "2") == b"<script>const data = 2;</script>"
+    assert len(browser.pages) == 1
+    page = browser.pages[0]
+    assert not page.closed
+    assert page.navigations == 2
+    assert page.url == f"file://{tmp_path}"
+    assert page.init_scripts == [ECHARTS_HOOK]
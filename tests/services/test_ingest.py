@@ -0,0 +1,112 @@
+from datetime import datetime
+from pathlib import Path
+
+from nonebug import App
+from pytest_mock import MockerFixture
+
+
+def _pipeline(tmp_path: Path, **kwargs):
+    from zhenxun.models.chat_history import ChatHistory
+    from zhenxun.services.ingest import IngestPipeline
+
+    pipeline = IngestPipeline(
+        ChatHistory, ("user_id", "group_id", "plain_text", "create_time"), **kwargs
+    )
+    IngestPipeline.pipelines.remove(pipeline)
+    pipeline.spill_file = tmp_path / "chat_history.jsonl"
+    return pipeline
+
+
+def _fail_on(mocker: MockerFixture, calls: set[int]):
+    """execute_many 第 calls 次调用时抛出异常"""
+    from zhenxun.models.chat_history import ChatHistory
+
+    db = ChatHistory._meta.db
+    execute_many = db.execute_many
+    count = 0
+
+    async def wrapper(*args, **kwargs):
+        nonlocal count
+        count += 1
+        if count in calls:
+            raise RuntimeError("insert failed")
+        return await execute_many(*args, **kwargs)
+
+    return mocker.patch.object(db, "execute_many", side_effect=wrapper)
+
+
+async def _texts(group_id: str) -> list[str]:
+    from zhenxun.models.chat_history import ChatHistory
+
+    return sorted(
+        await ChatHistory.filter(group_id=group_id).values_list("plain_text", flat=True)
+    )
+
+
+async def test_retry_from_failed_chunk(app: App, mocker: MockerFixture, tmp_path):
+    """
+    测试分批写入中途失败时只重试未提交的分批
+    """
+    pipeline = _pipeline(tmp_path, chunk_size=2, retry=2)
+    mocker.patch("zhenxun.services.ingest.asyncio.sleep")
+    execute_many = _fail_on(mocker, {2})
+    for i in range(5):
+        await pipeline.put(("user", "retry", str(i), datetime.now()))
+    assert await pipeline.flush() == 5
+    assert execute_many.call_count == 4
+    assert await _texts("retry") == ["0", "1", "2", "3", "4"]
+    assert not pipeline.spill_file.exists()
+    await pipeline.stop()
+
+
+async def test_spill_and_replay(app: App, mocker: MockerFixture, tmp_path):
+    """
+    测试只暂存未写入的数据，重新写入失败时保留剩余数据
+    """
+    pipeline = _pipeline(tmp_path, chunk_size=2, retry=1)
+    now = datetime.now()
+    mock = _fail_on(mocker, {2, 3, 4})
+    for i in range(5):
+        await pipeline.put(("user", "spill", str(i), now))
+    # 暂存文件每次读取两条
+    pipeline.batch_size = 2
+    assert await pipeline.flush() == 2
+    assert pipeline.spilled == 3
+    assert len(pipeline.spill_file.read_text().splitlines()) == 3
+    assert await _texts("spill") == ["0", "1"]
+
+    # 暂存文件第一批写入失败，保留全部数据
+    assert await pipeline.flush() == 0
+    assert len(pipeline.spill_file.read_text().splitlines()) == 3
+
+    mocker.stop(mock)
+    _fail_on(mocker, {2})
+    assert await pipeline.flush() == 2
+    assert len(pipeline.spill_file.read_text().splitlines()) == 1
+    assert await pipeline.flush() == 1
+    assert not pipeline.spill_file.exists()
+    assert await _texts("spill") == ["0", "1", "2", "3", "4"]
+    assert pipeline.flushed == 5
+    await pipeline.stop()
+
+
+async def test_stop_flush(app: App, tmp_path):
+    """
+    测试关闭数据库连接前写入剩余数据
+    """
+    from zhenxun.services.db_context import DISCONNECT_METHOD
+    from zhenxun.services.ingest import IngestPipeline
+
+    pipeline = _pipeline(tmp_path, flush_interval=3600)
+    IngestPipeline.pipelines.append(pipeline)
+    try:
+        for i in range(3):
+            await pipeline.put(("user", "stop", str(i), datetime.now()))
+        assert pipeline.depth == 3
+        assert await _texts("stop") == []
+        assert IngestPipeline.stop_all in DISCONNECT_METHOD
+        await IngestPipeline.stop_all()
+        assert pipeline.depth == 0
+        assert await _texts("stop") == ["0", "1", "2"]
+    finally:
+        IngestPipeline.pipelines.remove(pipeline)
@@ -0,0 +1,45 @@
+from nonebug import App
+from pytest_mock import MockerFixture
+
+
+class Arg:
+    def __init__(self):
+        self.count = 0
+
+    def __str__(self) -> str:
+        self.count += 1
+        return "arg"
+
+
+async def test_skip_disabled_level(app: App, mocker: MockerFixture):
+    """
+    测试低于日志等级的日志不计算info，不格式化args
+    """
+    from zhenxun.services.log import logger, logger_
+
+    log = mocker.patch.object(logger_, "opt")
+    mocker.patch.object(logger, "level_no", logger.LEVEL_DEBUG)
+    logger.set_level("INFO")
+    info = mocker.Mock(return_value="info")
+    arg = Arg()
+    logger.debug(info, "Test")
+    logger.debug("调试 %s", "Test", args=(arg,))
+    assert not logger.is_enabled("DEBUG")
+    assert info.call_count == 0
+    assert arg.count == 0
+    assert log.call_count == 0
+
+    logger.info("信息 %s", "Test", args=(arg,))
+    assert arg.count == 1
+    level, message = log.return_value.log.call_args.args
+    assert level == "INFO"
+    assert message.endswith("信息 arg")
+
+    logger.set_level("DEBUG")
+    logger.debug(info, "Test", session="user", group_id="group")
+    assert info.call_count == 1
+    level, message = log.return_value.log.call_args.args
+    assert level == "DEBUG"
+    assert "user" in message
+    assert "group" in message
+    assert message.endswith("info")
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+import time
+
+from nonebug import App
+from pytest_mock import MockerFixture
+
+
+async def _chat(group_id: str, user_id: str, create_time: datetime, **kwargs):
+    from zhenxun.models.chat_history import ChatHistory
+
+    await ChatHistory.create(
+        user_id=user_id,
+        group_id=group_id,
+        plain_text="hi",
+        bot_id="bot",
+        create_time=create_time,
+        **kwargs,
+    )
+
+
+async def _counts(group_id: str) -> dict[tuple[int, str], int]:
+    from zhenxun.models.chat_hour_count import ChatHourCount
+
+    return {
+        (hour.hour, user_id): num
+        for hour, user_id, num in await ChatHourCount.filter(
+            group_id=group_id
+        ).values_list("hour", "user_id", "num")
+    }
+
+
+async def test_rollup_aggregate(app: App):
+    """
+    测试按小时汇总并增量累加
+    """
+    from zhenxun.models.chat_hour_count import ChatHourCount, chat_rollup
+
+    base = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+    await chat_rollup.run(None)
+    for minute in (0, 10, 59):
+        await _chat("rollup", "a", base + timedelta(minutes=minute))
+    await _chat("rollup", "b", base + timedelta(minutes=30))
+    await _chat("rollup", "a", base + timedelta(hours=1, minutes=5))
+    await _chat("rollup_2", "a", base)
+    assert await chat_rollup.run(None) == 6
+    assert await _counts("rollup") == {(10, "a"): 3, (10, "b"): 1, (11, "a"): 1}
+
+    await _chat("rollup", "a", base + timedelta(minutes=20))
+    assert await chat_rollup.run(None) == 1
+    assert await chat_rollup.run(None) == 0
+    assert (await _counts("rollup"))[(10, "a")] == 4
+    assert await ChatHourCount.get_group_msg_rank("rollup") == [("a", 5), ("b", 1)]
+
+
+async def test_rollup_late_commit(app: App, mocker: MockerFixture):
+    """
+    测试晚于较大id提交的数据在之后的汇总中补上，超时后不再等待
+    """
+    from zhenxun.models.chat_history import ChatHistory
+    from zhenxun.models.chat_hour_count import chat_rollup
+    from zhenxun.models.rollup_state import RollupState
+
+    now = datetime.now()
+    await chat_rollup.run(None)
+    last = await ChatHistory.all().order_by("-id").first()
+    start = last.id if last else 0
+    await _chat("late", "a", now, id=start + 1)
+    await _chat("late", "a", now, id=start + 4)
+    assert await chat_rollup.run(None) == 2
+    state = await RollupState.get(name=chat_rollup.name)
+    assert [idx for idx, _ in state.gaps] == [start + 2, start + 3]
+
+    await _chat("late", "b", now, id=start + 2)
+    assert await chat_rollup.run(None) == 1
+    assert (await _counts("late"))[(now.hour, "b")] == 1
+    assert await chat_rollup.run(None) == 0
+
+    mocker.patch("time.time", return_value=time.time() + chat_rollup.gap_timeout)
+    await chat_rollup.run(None)
+    state = await RollupState.get(name=chat_rollup.name)
+    assert state.gaps == []
+    await _chat("late", "b", now, id=start + 3)
+    assert await chat_rollup.run(None) == 0
+
+
+async def test_get_active_groups(app: App):
+    """
+    测试获取有发言记录的群组
+    """
+    from zhenxun.models.chat_hour_count import ChatHourCount, chat_rollup
+
+    now = datetime.now()
+    await _chat("active_new", "a", now - timedelta(hours=1))
+    await _chat("active_old", "a", now - timedelta(days=3))
+    await _chat("", "a", now)
+    await chat_rollup.run(None)
+    assert {"active_new", "active_old"} <= await ChatHourCount.get_active_groups()
+    assert "" not in await ChatHourCount.get_active_groups()
+    recent = await ChatHourCount.get_active_groups(now - timedelta(days=2))
+    assert "active_new" in recent
+    assert "active_old" not in recent
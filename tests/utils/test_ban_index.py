@@ -0,0 +1,54 @@
+import time
+
+from nonebug import App
+from pytest_mock import MockerFixture
+
+
+async def test_ban_index_expire(app: App):
+    """
+    测试封禁索引到期判断，被覆盖的堆记录在弹出时忽略
+    """
+    from zhenxun.models.ban_console import BanIndex
+
+    now = time.time()
+    index = BanIndex()
+    index.add(1, "user", None, -1)
+    index.add(2, "user", "group", int(now + 100))
+    index.add(3, None, "group", int(now - 1))
+    assert index.get_expire("user", None) == -1
+    assert index.get_expire("user", "group") == int(now + 100)
+    assert index.get_expire(None, "group") is None
+
+    index.add(4, "user", "group", int(now + 200))
+    assert index.pop_expired(now + 150) == [3]
+    assert index.get_expire("user", "group") == int(now + 200)
+    index.remove("user", "group")
+    assert index.pop_expired(now + 300) == []
+    assert index.get_expire("user", "group") is None
+    assert index.get_expire("user", None) == -1
+
+
+async def test_ban_write_through(app: App, mocker: MockerFixture):
+    """
+    测试封禁与解封直接更新索引，不重新加载
+    """
+    from zhenxun.models.ban_console import BanConsole
+
+    assert not await BanConsole.is_ban("ban_user", "ban_group")
+    load = mocker.spy(BanConsole, "_load_index")
+    await BanConsole.ban("ban_user", "ban_group", 9, 100)
+    await BanConsole.ban(None, "ban_group_2", 9, -1)
+    assert await BanConsole.is_ban("ban_user", "ban_group")
+    assert await BanConsole.check_ban_time(None, "ban_group_2") == -1
+    await BanConsole.unban("ban_user", "ban_group")
+    assert not await BanConsole.is_ban("ban_user", "ban_group")
+    assert load.call_count == 0
+
+    await BanConsole.ban("ban_user", None, 9, 100)
+    assert await BanConsole.is_ban("ban_user", "any_group")
+    mocker.patch("time.time", return_value=time.time() + 200)
+    assert not await BanConsole.is_ban("ban_user", None)
+    assert await BanConsole.clear_expired() == 1
+    assert not await BanConsole.exists(user_id="ban_user")
+    assert await BanConsole.is_ban(None, "ban_group_2")
+    assert load.call_count == 0
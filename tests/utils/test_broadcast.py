@@ -0,0 +1,80 @@
+import itertools
+import time
+
+from nonebug import App
+from pytest_mock import MockerFixture
+
+
+class FakeBot:
+    def __init__(self, self_id: str, groups: list[str]):
+        self.self_id = self_id
+        self.groups = groups
+
+
+async def test_broadcast(app: App, mocker: MockerFixture):
+    """
+    测试多Bot同时广播、同一Bot限速、群组去重、批量过滤与网络错误重试
+    """
+    from nonebot.adapters.onebot.v11 import ActionFailed, NetworkError
+    from nonebot_plugin_alconna import UniMessage
+
+    from zhenxun.models.group_console import GroupConsole
+    from zhenxun.utils.platform import Broadcaster
+
+    mocker.patch.object(Broadcaster, "interval", 0.05)
+    mocker.patch.object(Broadcaster, "retry_delay", 0)
+
+    async def get_group_list(bot: FakeBot):
+        return [GroupConsole(group_id=g) for g in bot.groups], "qq"
+
+    async def task_is_block_many(bot: FakeBot, module: str, group_ids: list[str]):
+        assert module == "morning_goodnight"
+        return {g for g in group_ids if g == "blocked"}
+
+    sent: list[tuple[str, str, float]] = []
+    attempts: list[str] = []
+
+    async def send(self, target, bot: FakeBot):
+        attempts.append(target.id)
+        if target.id == "flaky" and attempts.count("flaky") == 1:
+            raise NetworkError("HTTP request failed")
+        if target.id == "broken":
+            raise ActionFailed(retcode=100, wording="bot is muted")
+        if target.id == "timeout":
+            raise NetworkError("WebSocket call api send_group_msg timeout")
+        sent.append((bot.self_id, target.id, time.monotonic()))
+
+    mocker.patch(
+        "zhenxun.utils.platform.PlatformUtils.get_group_list",
+        side_effect=get_group_list,
+    )
+    mocker.patch(
+        "zhenxun.utils.platform.CommonUtils.task_is_block_many",
+        side_effect=task_is_block_many,
+    )
+    mocker.patch.object(UniMessage, "send", send)
+
+    bot_a = FakeBot("a", ["1", "2", "3", "shared", "blocked", "flaky"])
+    bot_b = FakeBot("b", ["shared", "4", "5", "6", "broken", "timeout"])
+    start = time.monotonic()
+    result = await Broadcaster.broadcast(
+        "早上好",
+        [bot_a, bot_b],  # type: ignore
+        ignore_group={"6"},
+        task="morning_goodnight",
+    )
+    cost = time.monotonic() - start
+
+    assert sorted(result.success) == sorted(
+        f"{g}:None" for g in ("1", "2", "3", "shared", "flaky", "4", "5")
+    )
+    assert list(result.failed) == ["broken:None", "timeout:None"]
+    # 平台返回错误与超时不重试
+    assert attempts.count("broken") == attempts.count("timeout") == 1
+    assert attempts.count("flaky") == 2
+    assert result.skipped == ["blocked:None"]
+    assert [g for b, g, _ in sent if b == "b"] == ["4", "5"]
+    times = [t for b, _, t in sent if b == "a"]
+    assert all(t2 - t1 >= 0.04 for t1, t2 in itertools.pairwise(times))
+    # a 共 6 次发送（含一次重试），两个Bot同时进行
+    assert cost < 0.05 * 9
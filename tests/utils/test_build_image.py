@@ -0,0 +1,201 @@
+import asyncio
+import itertools
+import threading
+
+from nonebug import App
+from PIL import Image, ImageChops, ImageDraw
+from PIL.Image import Resampling
+import pytest
+from pytest_mock import MockerFixture
+
+
+@pytest.fixture(autouse=True)
+def _no_font(mocker: MockerFixture):
+    # 测试环境中没有字体资源，这里只测试像素处理
+    from zhenxun.utils.image_utils import BuildImage
+
+    mocker.patch.object(BuildImage, "load_font")
+
+
+def sample_image(width: int, height: int) -> Image.Image:
+    """确定性的测试图片"""
+    image = Image.new("RGBA", (width, height))
+    image.putdata(
+        [
+            ((x * 7) % 256, (y * 13) % 256, (x * y) % 256, 255)
+            for y in range(height)
+            for x in range(width)
+        ]
+    )
+    return image
+
+
+def assert_same(a: Image.Image, b: Image.Image):
+    assert a.mode == b.mode
+    assert a.size == b.size
+    assert ImageChops.difference(a, b).getbbox() is None
+
+
+def golden_transparent(image: Image.Image, alpha_ratio: float, n: int):
+    image = image.convert("RGBA")
+    x, y = image.size
+    for i, k in itertools.product(range(n, x - n), range(n, y - n)):
+        color = image.getpixel((i, k))
+        image.putpixel((i, k), (*color[:-1], int(100 * alpha_ratio)))  # type: ignore
+    return image
+
+
+def golden_gradient(width: int, height: int, bg_1: tuple, bg_2: tuple):
+    image = Image.new("RGBA", (width, height), (255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    steps = [(c2 - c1) / width for c1, c2 in zip(bg_1, bg_2)]
+    for y in range(width):
+        fill = tuple(round(c + s * y) for c, s in zip(bg_1, steps))
+        for x in range(height):
+            draw.point((y, x), fill=fill)
+    return image
+
+
+def golden_circle(image: Image.Image):
+    size = image.size
+    r2 = min(size[0], size[1])
+    if size[0] != size[1]:
+        image = image.resize((r2, r2), Resampling.LANCZOS)
+    antialias = 4
+    ellipse_box = [0, 0, r2 - 2, r2 - 2]
+    mask = Image.new("L", (r2 * antialias, r2 * antialias), "black")
+    draw = ImageDraw.Draw(mask)
+    for offset, fill in (-0.5, "black"), (0.5, "white"):
+        left, top = ((value + offset) * antialias for value in ellipse_box[:2])
+        right, bottom = ((value - offset) * antialias for value in ellipse_box[2:])
+        draw.ellipse([left, top, right, bottom], fill=fill)
+    image.putalpha(mask.resize((r2, r2), Resampling.LANCZOS))
+    return image
+
+
+async def test_transparent(app: App):
+    """
+    测试透明化结果与逐像素处理一致
+    """
+    from zhenxun.utils.image_utils import BuildImage
+
+    for alpha_ratio, n in ((2, 0), (1, 5), (0.5, 100)):
+        image = BuildImage(80, 40)
+        image.markImg = sample_image(80, 40)
+        await image.transparent(alpha_ratio, n)
+        assert_same(
+            image.markImg, golden_transparent(sample_image(80, 40), alpha_ratio, n)
+        )
+
+
+async def test_linear_gradient(app: App):
+    """
+    测试渐变与逐点绘制一致
+    """
+    from zhenxun.utils.image_utils import BuildImage
+
+    bg_1, bg_2 = (0, 245, 246), (254, 1, 254)
+    image = BuildImage.linear_gradient(950, 50, bg_1, bg_2)
+    assert_same(image.markImg, golden_gradient(950, 50, bg_1, bg_2))
+
+
+async def test_circle(app: App):
+    """
+    测试圆形与圆角遮罩
+    """
+    from zhenxun.utils.image_utils import BuildImage
+
+    for width, height in ((107, 107), (120, 90)):
+        image = BuildImage(width, height)
+        image.markImg = sample_image(width, height)
+        await image.circle()
+        assert_same(image.markImg, golden_circle(sample_image(width, height)))
+
+    image = BuildImage(100, 60)
+    image.markImg = sample_image(100, 60)
+    await image.circle_corner(20, ["lt", "rb"])
+    alpha = image.markImg.getchannel("A")
+    assert alpha.getpixel((0, 0)) == 0
+    assert alpha.getpixel((99, 59)) == 0
+    assert alpha.getpixel((99, 0)) == 255
+    assert alpha.getpixel((50, 30)) == 255
+
+
+async def test_compose(app: App):
+    """
+    测试 compose 在同一个线程中执行全部绘图方法
+    """
+    from zhenxun.utils.image_utils import BuildImage
+
+    threads: set[int] = set()
+
+    async def draw(width: int) -> BuildImage:
+        image = BuildImage(width, 40)
+        image.markImg = sample_image(width, 40)
+        threads.add(threading.get_ident())
+        await image.transparent(1, 5)
+        await image.circle_corner(10)
+        await image.resize(width=width // 2, height=20)
+        threads.add(threading.get_ident())
+        return image
+
+    image = await BuildImage.compose(draw, 80)
+    assert len(threads) == 1
+    assert threading.get_ident() not in threads
+    expected = await draw(80)
+    assert_same(image.markImg, expected.markImg)
+
+    async def wait():
+        await asyncio.sleep(0)
+
+    with pytest.raises(RuntimeError):
+        await BuildImage.compose(wait)
+
+
+async def test_font_cache(app: App, mocker: MockerFixture):
+    """
+    测试相同路径与大小的字体只加载一次
+    """
+    from PIL import ImageFont
+
+    from zhenxun.utils._build_image import _truetype
+
+    _truetype.cache_clear()
+    truetype = mocker.patch.object(ImageFont, "truetype")
+    assert _truetype("a.ttf", 10) is _truetype("a.ttf", 10)
+    _truetype("a.ttf", 12)
+    _truetype("b.ttf", 10)
+    assert truetype.call_args_list == [
+        mocker.call("a.ttf", 10),
+        mocker.call("a.ttf", 12),
+        mocker.call("b.ttf", 10),
+    ]
+    _truetype.cache_clear()
+
+
+async def test_text_bbox_cache(app: App):
+    """
+    测试文本尺寸缓存与直接测量结果一致
+    """
+    from PIL import ImageFont
+
+    from zhenxun.utils._build_image import _text_bbox
+    from zhenxun.utils.image_utils import BuildImage
+
+    font = ImageFont.load_default(20)
+    draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    _text_bbox.cache_clear()
+    for text in ["abc", "abc", "a\nbc", "a\nbc"]:
+        box = (
+            draw.multiline_textbbox((0, 0), text, font=font)
+            if "\n" in text
+            else font.getbbox(text)
+        )
+        width, height = BuildImage.get_text_size(text, font)
+        assert (width, height) == (box[2] - box[0], box[3] - box[1] + 10)
+    info = _text_bbox.cache_info()
+    assert (info.hits, info.misses) == (2, 2)
+    image = BuildImage(10, 10, font_size=20)
+    image.font = font
+    assert image.getsize("abc") == BuildImage.get_text_size("abc", font)
+    assert _text_bbox.cache_info().hits == 4
@@ -0,0 +1,73 @@
+from nonebot import get_adapter
+from nonebot.adapters.onebot.v11 import Adapter, Bot
+from nonebug import App
+from pytest_mock import MockerFixture
+from tortoise import Tortoise
+
+BOT_ID = "task_block_bot"
+
+MODULE = "task_block_test"
+
+
+async def _create_groups(count: int) -> list[str]:
+    from zhenxun.models.ban_console import BanConsole
+    from zhenxun.models.group_console import GroupConsole
+
+    group_ids = [f"task_block_{i}" for i in range(count)]
+    await GroupConsole.bulk_create(
+        [
+            GroupConsole(
+                group_id=group_id,
+                block_task=f"<{MODULE}," if i % 3 == 0 else "",
+                level=-1 if i % 5 == 1 else 5,
+            )
+            for i, group_id in enumerate(group_ids)
+        ]
+    )
+    for group_id in group_ids[2::7]:
+        await BanConsole.ban(None, group_id, 9, -1)
+    return group_ids
+
+
+async def test_task_is_block_many(app: App, mocker: MockerFixture):
+    """
+    测试批量判断被动与逐个判断结果一致，且查询次数与群组数量无关
+    """
+    from zhenxun.models.bot_console import BotConsole
+    from zhenxun.models.task_info import TaskInfo
+    from zhenxun.utils.common_utils import CommonUtils
+
+    await BotConsole.create(bot_id=BOT_ID, platform="qq", status=True)
+    await TaskInfo.create(module=MODULE, name="测试被动", status=True)
+    bot = Bot(get_adapter(Adapter), BOT_ID)
+    group_ids = await _create_groups(100)
+
+    blocked = await CommonUtils.task_is_block_many(bot, MODULE, group_ids)
+    assert blocked == {
+        group_id
+        for group_id in group_ids
+        if await CommonUtils.task_is_block(bot, MODULE, group_id)
+    }
+    assert "task_block_0" in blocked
+    assert "task_block_1" in blocked
+    assert "task_block_2" in blocked
+    assert "task_block_4" not in blocked
+
+    db = Tortoise.get_connection("default")
+    query = mocker.spy(type(db), "execute_query")
+    query_dict = mocker.spy(type(db), "execute_query_dict")
+
+    async def count(ids: list[str]) -> int:
+        query.reset_mock()
+        query_dict.reset_mock()
+        await CommonUtils.task_is_block_many(bot, MODULE, ids)
+        return query.call_count + query_dict.call_count
+
+    few = await count(group_ids[:5])
+    assert few > 0
+    assert few == await count(group_ids)
+
+    await TaskInfo.filter(module=MODULE).update(status=False)
+    assert await CommonUtils.task_is_block_many(bot, MODULE, group_ids) == set(
+        group_ids
+    )
@@ -0,0 +1,49 @@
+from nonebug import App
+from pytest_mock import MockerFixture
+
+MODULE = "config_cache_test"
+
+
+async def test_get_config_copy(app: App):
+    """
+    测试修改获取到的可变配置值不影响缓存
+    """
+    from zhenxun.configs.config import Config
+
+    Config.add_plugin_config(MODULE, "LIST", ["a"], type=list[str])
+    Config.add_plugin_config(MODULE, "DICT", {"a": [1]}, type=dict[str, list[int]])
+    Config.get_config(MODULE, "LIST").append("b")
+    Config.get_config(MODULE, "DICT")["a"].append(2)
+    assert Config.get_config(MODULE, "LIST") == ["a"]
+    assert Config.get_config(MODULE, "DICT") == {"a": [1]}
+
+
+async def test_subscribe_refresh(app: App, mocker: MockerFixture):
+    """
+    测试配置变更后缓存失效，值改变时通知订阅者
+    """
+    from zhenxun.configs.config import Config
+
+    mocker.patch.dict(Config._simple_data, {MODULE: {}})
+    Config.add_plugin_config(MODULE, "NUM", 1, type=int)
+    callback = mocker.Mock()
+    Config.subscribe(MODULE, "num", callback)
+    assert Config.get_config(MODULE, "NUM") == 1
+
+    Config.set_config(MODULE, "NUM", 2)
+    assert Config.get_config(MODULE, "NUM") == 2
+    callback.assert_called_once_with(2)
+
+    Config.set_config(MODULE, "NUM", 2)
+    assert callback.call_count == 1
+
+    Config.get(MODULE).configs["NUM"].value = 3
+    assert Config.get_config(MODULE, "NUM") == 2
+    Config._refresh(MODULE)
+    assert Config.get_config(MODULE, "NUM") == 3
+    callback.assert_called_with(3)
+
+    Config.unsubscribe(MODULE, "NUM", callback)
+    Config.set_config(MODULE, "NUM", 4)
+    assert Config.get_config(MODULE, "NUM") == 4
+    assert callback.call_count == 2
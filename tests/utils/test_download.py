@@ -0,0 +1,196 @@
+import asyncio
+import hashlib
+from pathlib import Path
+
+from nonebug import App
+
+CONTENT = bytes(range(256)) * 64
+
+
+class FileServer:
+    """本地文件服务，支持Range与If-Range请求，可在发送部分内容后断开连接"""
+
+    def __init__(self, delay: float = 0, cut: int | None = None, etag: str = '"v1"'):
+        self.delay = delay
+        self.cut = cut
+        self.etag = etag
+        self.ranges: list[str | None] = []
+        self.active = 0
+        self.max_active = 0
+        self.server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        assert self.server
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            request_headers = {
+                key.strip().lower(): value.strip()
+                for key, value in (
+                    line.decode().split(":", 1)
+                    for line in head.split(b"\r\n")[1:]
+                    if b":" in line
+                )
+            }
+            range_ = request_headers.get("range")
+            self.ranges.append(range_)
+            await asyncio.sleep(self.delay)
+            if request_headers.get("if-range", self.etag) != self.etag:
+                # 文件已变化，忽略Range返回完整内容
+                range_ = None
+            start = int(range_[6:].split("-")[0]) if range_ else 0
+            if start >= len(CONTENT):
+                writer.write(
+                    b"HTTP/1.1 416 Range Not Satisfiable\r\n"
+                    + f"Content-Range: bytes */{len(CONTENT)}\r\n".encode()
+                    + b"Content-Length: 0\r\nConnection: close\r\n\r\n"
+                )
+                await writer.drain()
+                return
+            body = CONTENT[start:]
+            status = "206 Partial Content" if range_ else "200 OK"
+            header = (
+                f"HTTP/1.1 {status}\r\nContent-Length: {len(body)}\r\n"
+                f"ETag: {self.etag}\r\n"
+            )
+            if range_:
+                end = len(CONTENT) - 1
+                header += f"Content-Range: bytes {start}-{end}/{len(CONTENT)}\r\n"
+            writer.write(f"{header}Connection: close\r\n\r\n".encode())
+            if self.cut is not None:
+                # 只发送部分内容后断开，之后的请求正常返回
+                writer.write(body[: self.cut])
+                self.cut = None
+            else:
+                writer.write(body)
+            await writer.drain()
+        finally:
+            self.active -= 1
+            writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *_):
+        assert self.server
+        self.server.close()
+
+
+async def test_download_resume(app: App, tmp_path: Path):
+    """
+    测试下载中断后使用Range继续下载并校验哈希值
+    """
+    from zhenxun.utils.http_utils import AsyncHttpx
+
+    async with FileServer(cut=1000) as server:
+        path = tmp_path / "file.bin"
+        assert await AsyncHttpx.download_file(
+            server.url, path, checksum=hashlib.sha256(CONTENT).hexdigest()
+        )
+        assert path.read_bytes() == CONTENT
+        assert not path.with_name("file.bin.part").exists()
+        assert server.ranges == [None, "bytes=1000-"]
+
+
+async def test_download_stale_part(app: App, tmp_path: Path):
+    """
+    测试服务端文件变化时If-Range不匹配，从头下载
+    """
+    from zhenxun.utils.http_utils import AsyncHttpx
+
+    async with FileServer(etag='"v2"') as server:
+        path = tmp_path / "file.bin"
+        path.with_name("file.bin.part").write_bytes(b"\0" * 1000)
+        path.with_name("file.bin.part.meta").write_text('"v1"')
+        assert await AsyncHttpx.download_file(
+            server.url, path, checksum=hashlib.sha256(CONTENT).hexdigest()
+        )
+        assert path.read_bytes() == CONTENT
+        assert server.ranges == ["bytes=1000-"]
+        assert not path.with_name("file.bin.part.meta").exists()
+
+
+async def test_download_part_complete(app: App, tmp_path: Path):
+    """
+    测试path.part已下载完成时响应416，校验后重命名
+    """
+    from zhenxun.utils.http_utils import AsyncHttpx
+
+    async with FileServer() as server:
+        path = tmp_path / "file.bin"
+        path.with_name("file.bin.part").write_bytes(CONTENT)
+        path.with_name("file.bin.part.meta").write_text('"v1"')
+        assert await AsyncHttpx.download_file(server.url, path, size=len(CONTENT))
+        assert path.read_bytes() == CONTENT
+        assert server.ranges == [f"bytes={len(CONTENT)}-"]
+
+
+async def test_download_part_oversize(app: App, tmp_path: Path):
+    """
+    测试path.part大于文件时响应416，删除后从头下载
+    """
+    from zhenxun.utils.http_utils import AsyncHttpx
+
+    async with FileServer() as server:
+        path = tmp_path / "file.bin"
+        path.with_name("file.bin.part").write_bytes(CONTENT + b"\0")
+        path.with_name("file.bin.part.meta").write_text('"v1"')
+        assert await AsyncHttpx.download_file(server.url, path, size=len(CONTENT))
+        assert path.read_bytes() == CONTENT
+        assert server.ranges == [f"bytes={len(CONTENT) + 1}-", None]
+
+
+async def test_download_no_resume_without_check(app: App, tmp_path: Path):
+    """
+    测试未指定大小与哈希值时不继续下载已有的path.part
+    """
+    from zhenxun.utils.http_utils import AsyncHttpx
+
+    async with FileServer() as server:
+        path = tmp_path / "file.bin"
+        path.with_name("file.bin.part").write_bytes(CONTENT[:1000])
+        path.with_name("file.bin.part.meta").write_text('"v1"')
+        assert await AsyncHttpx.download_file(server.url, path)
+        assert path.read_bytes() == CONTENT
+        assert server.ranges == [None]
+
+
+async def test_download_verify_failed(app: App, tmp_path: Path):
+    """
+    测试校验失败时不生成目标文件
+    """
+    from zhenxun.utils.http_utils import AsyncHttpx
+
+    async with FileServer() as server:
+        path = tmp_path / "file.bin"
+        assert not await AsyncHttpx.download_file(
+            server.url, path, size=len(CONTENT) + 1
+        )
+        assert not path.exists()
+        assert not path.with_name("file.bin.part").exists()
+
+
+async def test_gather_download_limit(app: App, tmp_path: Path):
+    """
+    测试同时下载数量限制与汇总进度
+    """
+    from zhenxun.utils.http_utils import AsyncHttpx
+
+    progress: list[tuple[int, int, int]] = []
+    async with FileServer(delay=0.05) as server:
+        paths: list[str | Path] = [tmp_path / f"file{i}" for i in range(6)]
+        result = await AsyncHttpx.gather_download_file(
+            [f"{server.url}{i}" for i in range(6)],
+            paths,
+            limit_async_number=2,
+            on_progress=lambda *args: progress.append(args),
+        )
+        assert result == [True] * 6
+        assert server.max_active <= 2
+        assert progress[-1] == (len(CONTENT) * 6, 6, 6)
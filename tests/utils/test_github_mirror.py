@@ -0,0 +1,116 @@
+import asyncio
+from pathlib import Path
+
+from nonebug import App
+
+
+class MirrorServer:
+    """本地镜像服务，可设置响应延迟与GET状态码"""
+
+    def __init__(self, delay: float = 0, status: int = 200):
+        self.delay = delay
+        self.status = status
+        self.requests: list[str] = []
+        self.server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        assert self.server
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                method = head.split(b" ", 1)[0].decode()
+                self.requests.append(method)
+                await asyncio.sleep(self.delay)
+                status = 200 if method == "HEAD" else self.status
+                body = b"" if method == "HEAD" else b"mirror"
+                writer.write(
+                    f"HTTP/1.1 {status} OK\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *_):
+        assert self.server
+        self.server.close()
+
+
+async def test_probe_order_and_single_flight(app: App):
+    """
+    测试按探测耗时排序，并发获取时只探测一次
+    """
+    from zhenxun.utils.github_utils.func import MirrorGroup
+
+    async with MirrorServer(0.3) as slow, MirrorServer(0.01) as fast:
+        group = MirrorGroup(
+            "test_probe",
+            {slow.url: f"{slow.url}{{path}}", fast.url: f"{fast.url}{{path}}"},
+        )
+        results = await asyncio.gather(*(group.get_formats() for _ in range(5)))
+        assert all(r == [f"{fast.url}{{path}}", f"{slow.url}{{path}}"] for r in results)
+        assert slow.requests == ["HEAD"]
+        assert fast.requests == ["HEAD"]
+        assert group.probe_count == 1
+        stats = group.get_stats()
+        assert stats["available"] == [fast.url, slow.url]
+        assert stats["mirrors"][fast.url]["latency"] is not None
+
+
+async def test_download_failure_demotes_mirror(app: App, tmp_path: Path):
+    """
+    测试下载失败后降低镜像优先级
+    """
+    from zhenxun.utils.github_utils.func import MirrorGroup
+    from zhenxun.utils.http_utils import AsyncHttpx
+
+    async with MirrorServer(0.01, 500) as broken, MirrorServer(0.3) as healthy:
+        group = MirrorGroup(
+            "test_demote",
+            {
+                broken.url: f"{broken.url}{{path}}",
+                healthy.url: f"{healthy.url}{{path}}",
+            },
+        )
+        formats = await group.get_formats()
+        assert formats[0].startswith(broken.url)
+        for i in range(3):
+            urls = [f.format(path=f"file{i}") for f in await group.get_formats()]
+            assert await AsyncHttpx.download_file(urls, tmp_path / f"file{i}")
+            assert (tmp_path / f"file{i}").read_bytes() == b"mirror"
+        formats = await group.get_formats()
+        assert formats[0].startswith(healthy.url)
+        assert broken.requests.count("GET") == 1
+
+
+async def test_expired_probe_in_background(app: App):
+    """
+    测试探测结果过期后返回旧结果并在后台重新探测
+    """
+    from zhenxun.utils.github_utils.func import MirrorGroup
+
+    async with MirrorServer(0.2) as first, MirrorServer(0.01) as second:
+        group = MirrorGroup(
+            "test_expire",
+            {first.url: f"{first.url}{{path}}", second.url: f"{second.url}{{path}}"},
+            ttl=0,
+        )
+        await group.get_formats()
+        assert group.probe_count == 1
+        formats = await group.get_formats()
+        assert len(formats) == 2
+        assert group.probe_count == 1
+        assert group._task
+        await group._task
+        assert group.probe_count == 2
@@ -0,0 +1,93 @@
+import asyncio
+import time
+
+from nonebug import App
+import pytest
+from pytest_mock import MockerFixture
+
+
+async def test_mirror_stats_sort(app: App, mocker: MockerFixture):
+    """
+    测试按耗时与失败率排序，镜像恢复后排序逐渐回到前面
+    """
+    from zhenxun.utils.http_utils import MirrorStats
+
+    mocker.patch.dict(MirrorStats.data, clear=True)
+    urls = ["https://a.test/file", "https://b.test/file", "https://c.test/file"]
+    assert MirrorStats.sort(urls) == urls
+
+    MirrorStats.record("https://a.test/x", None)
+    MirrorStats.record("https://b.test/x", 0.5)
+    MirrorStats.record("https://c.test/x", 0.2)
+    assert MirrorStats.sort(urls) == [urls[2], urls[1], urls[0]]
+    assert MirrorStats.get_stats()["https://a.test"]["error_rate"] == 1
+
+    for _ in range(10):
+        MirrorStats.record("https://a.test/x", 0.1)
+    assert MirrorStats.sort(urls)[0] == urls[0]
+    assert MirrorStats.get_key("http://d.test:8080/x") == "http://d.test:8080"
+
+
+async def test_hedge_slow_mirror(app: App, mocker: MockerFixture):
+    """
+    测试第一个地址超过 delay 未完成时请求下一个地址，并取消其余请求
+    """
+    from zhenxun.utils.http_utils import AsyncHttpx, MirrorStats
+
+    mocker.patch.dict(MirrorStats.data, clear=True)
+    cancelled = []
+
+    async def request(url: str) -> str:
+        try:
+            await asyncio.sleep(5 if "slow" in url else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+        return url
+
+    start = time.perf_counter()
+    result = await AsyncHttpx._hedge(
+        ["https://slow.test/", "https://fast.test/"], request, delay=0.05
+    )
+    assert result == "https://fast.test/"
+    assert time.perf_counter() - start < 1
+    assert cancelled == ["https://slow.test/"]
+    stats = MirrorStats.get_stats()
+    assert stats["https://slow.test"]["latency"] > stats["https://fast.test"]["latency"]
+    assert stats["https://slow.test"]["failure"] == 0
+
+
+async def test_hedge_failure(app: App, mocker: MockerFixture):
+    """
+    测试请求失败时立即请求下一个地址，全部失败时抛出最后一个异常
+    """
+    from zhenxun.utils.http_utils import AsyncHttpx, MirrorStats
+
+    mocker.patch.dict(MirrorStats.data, clear=True)
+    called = []
+
+    async def request(url: str) -> str:
+        called.append(url)
+        if "bad" in url:
+            raise ValueError(url)
+        return url
+
+    start = time.perf_counter()
+    result = await AsyncHttpx._hedge(
+        ["https://bad.test/", "https://good.test/"], request, delay=10
+    )
+    assert result == "https://good.test/"
+    assert time.perf_counter() - start < 1
+    assert MirrorStats.get_stats()["https://bad.test"]["failure"] == 1
+
+    # 失败的镜像排在后面
+    called.clear()
+    await AsyncHttpx._hedge(
+        ["https://bad.test/", "https://good.test/"], request, delay=10
+    )
+    assert called == ["https://good.test/"]
+
+    with pytest.raises(ValueError, match=r"bad\.test"):
+        await AsyncHttpx._hedge(
+            ["https://bad.test/1", "https://bad.test/2"], request, delay=10
+        )
@@ -0,0 +1,49 @@
+import httpx
+from nonebug import App
+from respx import MockRouter
+
+
+async def test_client_reuse(app: App):
+    """
+    测试相同代理与verify复用客户端，关闭后重新创建
+    """
+    from zhenxun.utils.http_utils import HttpClientPool
+
+    client = HttpClientPool.get_client()
+    assert HttpClientPool.get_client() is client
+    assert HttpClientPool.get_client(verify=False) is not client
+    proxy = {"http://": "http://127.0.0.1:7890"}
+    assert HttpClientPool.get_client(proxy) is HttpClientPool.get_client(dict(proxy))
+    assert HttpClientPool.get_client(proxy) is not client
+    await HttpClientPool.close()
+    assert client.is_closed
+    assert HttpClientPool.get_client() is not client
+
+
+async def test_redirect_cookies(app: App, mocked_api: MockRouter):
+    """
+    测试重定向时携带响应设置的cookies，不同请求之间不共享cookies
+    """
+    from zhenxun.utils.http_utils import AsyncHttpx
+
+    mocked_api.get("https://cookie.test/login").respond(
+        302,
+        headers={"Location": "/home", "Set-Cookie": "token=abc; Path=/"},
+    )
+
+    def home(request: httpx.Request) -> httpx.Response:
+        cookie = request.headers.get("Cookie", "")
+        return httpx.Response(200 if "token=abc" in cookie else 403, text=cookie)
+
+    mocked_api.get("https://cookie.test/home").mock(side_effect=home)
+
+    response = await AsyncHttpx.get(
+        "https://cookie.test/login", follow_redirects=True, use_proxy=False
+    )
+    assert response.status_code == 200
+    response = await AsyncHttpx.get("https://cookie.test/home", use_proxy=False)
+    assert response.status_code == 403
+    response = await AsyncHttpx.get(
+        "https://cookie.test/home", cookies={"token": "abc"}, use_proxy=False
+    )
+    assert response.status_code == 200
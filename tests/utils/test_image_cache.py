@@ -0,0 +1,130 @@
+import asyncio
+from pathlib import Path
+
+from nonebug import App
+import pytest
+from pytest_mock import MockerFixture
+
+
+class ImageServer:
+    """本地图片服务，支持ETag校验，可设置响应延迟"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.requests: list[tuple[str, str | None]] = []
+        self.active = 0
+        self.max_active = 0
+        self.server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        assert self.server
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            path = head.split(b" ", 2)[1].decode()
+            etag = next(
+                (
+                    line.split(b":", 1)[1].strip().decode()
+                    for line in head.split(b"\r\n")
+                    if line.lower().startswith(b"if-none-match:")
+                ),
+                None,
+            )
+            self.requests.append((path, etag))
+            await asyncio.sleep(self.delay)
+            body = f"image{path}".encode()
+            if etag == f'"{path}"':
+                writer.write(b"HTTP/1.1 304 Not Modified\r\nConnection: close\r\n\r\n")
+            else:
+                writer.write(
+                    f"HTTP/1.1 200 OK\r\nContent-Length: {len(body)}\r\n"
+                    f'ETag: "{path}"\r\nConnection: close\r\n\r\n'.encode()
+                    + body
+                )
+            await writer.drain()
+        finally:
+            self.active -= 1
+            writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *_):
+        assert self.server
+        self.server.close()
+
+
+@pytest.fixture
+def image_cache(mocker: MockerFixture, tmp_path: Path):
+    from zhenxun.utils.manager.image_cache import ImageCache
+
+    mocker.patch("zhenxun.utils.manager.image_cache.OBJECT_PATH", tmp_path / "o")
+    mocker.patch("zhenxun.utils.manager.image_cache.META_PATH", tmp_path / "m")
+    ImageCache.clear_memory()
+    yield ImageCache
+    ImageCache.clear_memory()
+
+
+async def test_single_flight_and_disk(app: App, image_cache, tmp_path: Path):
+    """
+    测试同时获取同一图片只请求一次，清空内存后从磁盘读取
+    """
+    async with ImageServer(0.05) as server:
+        url = f"{server.url}a"
+        results = await asyncio.gather(*(image_cache.get(url) for _ in range(5)))
+        assert results == [b"image/a"] * 5
+        assert server.requests == [("/a", None)]
+        image_cache.clear_memory()
+        assert await image_cache.get(url) == b"image/a"
+        assert len(server.requests) == 1
+
+
+async def test_revalidate(app: App, image_cache, mocker: MockerFixture):
+    """
+    测试过期后使用ETag重新校验
+    """
+    mocker.patch.object(image_cache, "ttl", 0)
+    async with ImageServer() as server:
+        url = f"{server.url}b"
+        assert await image_cache.get(url) == b"image/b"
+        assert await image_cache.get(url) == b"image/b"
+        assert server.requests == [("/b", None), ("/b", '"/b"')]
+
+
+async def test_get_many(app: App, image_cache):
+    """
+    测试批量获取时限制同时请求数量
+    """
+    async with ImageServer(0.05) as server:
+        urls: list[str | None] = [f"{server.url}{i}" for i in range(6)]
+        results = await image_cache.get_many([*urls, None], limit=3)
+        assert results == [f"image/{i}".encode() for i in range(6)] + [None]
+        assert server.max_active <= 3
+        assert len(server.requests) == 6
+
+
+async def test_max_size(app: App, image_cache, mocker: MockerFixture, tmp_path: Path):
+    """
+    测试磁盘缓存超出容量时删除最久未使用的图片
+    """
+    mocker.patch.object(image_cache, "max_size", 14)
+    async with ImageServer() as server:
+        assert await image_cache.get(f"{server.url}a") == b"image/a"
+        assert await image_cache.get(f"{server.url}b") == b"image/b"
+        assert await image_cache.get(f"{server.url}a") == b"image/a"
+        assert await image_cache.get(f"{server.url}c") == b"image/c"
+        assert len(list((tmp_path / "o").glob("*/*"))) == 2
+        assert await image_cache.get(f"{server.url}a") == b"image/a"
+        assert await image_cache.get(f"{server.url}b") == b"image/b"
+        assert server.requests == [
+            ("/a", None),
+            ("/b", None),
+            ("/c", None),
+            ("/b", None),
+        ]
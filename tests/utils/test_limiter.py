@@ -0,0 +1,103 @@
+import time
+
+from pytest_mock import MockerFixture
+
+
+def test_limiter_store_eviction(mocker: MockerFixture):
+    """
+    测试超出容量时淘汰最久未使用的键，过期键读取时移除
+    """
+    from zhenxun.utils.utils import LimiterStore
+
+    now = time.time()
+    store = LimiterStore(max_size=3)
+    store.set("a", 1, now + 100)
+    store.set("b", 2, now + 100)
+    store.set("c", 3, now + 100)
+    assert store.get("a") == 1
+    store.set("d", 4, now + 100)
+    assert len(store) == 3
+    assert store.get("b") is None
+    assert [store.get(k) for k in "acd"] == [1, 3, 4]
+
+    store.set("a", 5, now + 10)
+    store.set("e", 6, now + 100)
+    assert store.get("c") is None
+    assert store.get("a") == 5
+
+    mocker.patch("time.time", return_value=now + 50)
+    assert store.get("a") is None
+    assert len(store) == 2
+    assert store.get("a", 0) == 0
+
+
+def test_limiter_store_sweep(mocker: MockerFixture):
+    """
+    测试写入新键时定期清理过期数据
+    """
+    from zhenxun.utils.utils import LimiterStore
+
+    now = time.time()
+    store = LimiterStore(sweep_interval=60)
+    for i in range(10):
+        store.set(i, i, now + 10)
+    store.set("keep", 1, now + 1000)
+    mocker.patch("time.time", return_value=now + 30)
+    store.set("new", 1, now + 1000)
+    assert len(store) == 12
+    mocker.patch("time.time", return_value=now + 120)
+    store.set("new_2", 1, now + 1000)
+    assert len(store) == 3
+
+
+def test_rate_limiter_burst(mocker: MockerFixture):
+    """
+    测试GCRA允许连续调用burst次，之后每interval秒恢复一次
+    """
+    from zhenxun.utils.utils import RateLimiter
+
+    now = time.time()
+    mocker.patch("time.time", return_value=now)
+    limiter = RateLimiter(10, 3)
+    for _ in range(3):
+        assert limiter.check("key")
+        limiter.consume("key")
+    assert not limiter.check("key")
+    assert limiter.left_time("key") == 10
+    mocker.patch("time.time", return_value=now + 10)
+    assert limiter.check("key")
+    limiter.consume("key")
+    assert not limiter.check("key")
+
+
+def test_window_limiter(mocker: MockerFixture):
+    """
+    测试任意period秒内最多调用max_count次
+    """
+    from zhenxun.utils.utils import WindowLimiter
+
+    now = time.time()
+    limiter = WindowLimiter(3, 60)
+
+    def call(offset: float) -> bool:
+        mocker.patch("time.time", return_value=now + offset)
+        if limiter.check("key"):
+            limiter.consume("key")
+            return True
+        return False
+
+    # 令牌桶在窗口内可以放行 2 * max_count - 1 次，滑动窗口不会
+    assert [call(t) for t in (0, 1, 59, 59.5, 60, 60.5, 61, 100)] == [
+        True,
+        True,
+        True,
+        False,
+        True,
+        False,
+        True,
+        False,
+    ]
+    mocker.patch("time.time", return_value=now + 100)
+    assert limiter.left_time("key") == 19
+    assert call(119) is True
+    assert limiter.check("other")
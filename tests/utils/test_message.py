@@ -0,0 +1,65 @@
+from io import BytesIO
+import os
+from pathlib import Path
+
+from nonebug import App
+from PIL import Image
+from pytest_mock import MockerFixture
+
+
+def save_gif(path: Path):
+    frames = [Image.new("RGB", (20, 20), color) for color in ("red", "blue")]
+    frames[0].save(path, save_all=True, append_images=frames[1:], loop=0)
+
+
+async def test_path_image_bytes(app: App, mocker: MockerFixture, tmp_path: Path):
+    """
+    测试图片文件直接按原内容发送，修改后重新读取
+    """
+    from zhenxun.utils.message import Config, MessageUtils
+
+    mocker.patch(
+        "zhenxun.utils.message.nonebot.get_plugin_config",
+        return_value=Config(image_to_bytes=True),
+    )
+    file = tmp_path / "menu.gif"
+    save_gif(file)
+    content = file.read_bytes()
+    read_bytes = mocker.spy(Path, "read_bytes")
+
+    for _ in range(2):
+        image = MessageUtils.build_message(file)[0]
+        assert image.raw == content
+    assert read_bytes.call_count == 1
+    assert getattr(Image.open(BytesIO(image.raw)), "n_frames", 1) == 2
+
+    Image.new("RGB", (10, 10), "green").save(file, format="PNG")
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    image = MessageUtils.build_message(file)[0]
+    assert image.raw == file.read_bytes()
+
+
+async def test_build_image_format(app: App, mocker: MockerFixture):
+    """
+    测试BuildImage按配置的格式编码
+    """
+    from zhenxun.utils.image_utils import BuildImage
+    from zhenxun.utils.message import Config, MessageUtils
+
+    mocker.patch.object(BuildImage, "load_font")
+    image = BuildImage(40, 30, (255, 0, 0, 0))
+    config = mocker.patch("zhenxun.utils.message.nonebot.get_plugin_config")
+
+    config.return_value = Config(image_compress_level=1)
+    raw = MessageUtils.build_message(image)[0].raw
+    result = Image.open(BytesIO(raw))
+    assert result.format == "PNG"
+    assert result.getpixel((0, 0)) == (255, 0, 0, 0)
+
+    config.return_value = Config(image_format="JPEG", image_quality=90)
+    raw = MessageUtils.build_message(image)[0].raw
+    result = Image.open(BytesIO(raw))
+    assert result.format == "JPEG"
+    assert result.mode == "RGB"
+    assert all(c > 240 for c in result.getpixel((20, 15)))
@@ -0,0 +1,74 @@
+import asyncio
+from collections import OrderedDict
+from pathlib import Path
+
+from nonebug import App
+import pytest
+from pytest_mock import MockerFixture
+
+
+@pytest.fixture
+def cache_path(mocker: MockerFixture, tmp_path: Path) -> Path:
+    from zhenxun.utils.manager.render_cache import RenderCache
+
+    mocker.patch("zhenxun.utils.manager.render_cache.CACHE_PATH", tmp_path)
+    mocker.patch.object(RenderCache, "_index", None)
+    mocker.patch.object(RenderCache, "_size", 0)
+    mocker.patch.object(RenderCache, "_pending", {})
+    return tmp_path
+
+
+async def test_render_once(app: App, cache_path: Path):
+    """
+    测试相同输入只渲染一次，同时请求共用一次渲染
+    """
+    from zhenxun.utils.manager.render_cache import RenderCache
+
+    calls = []
+
+    async def render() -> bytes:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b"image"
+
+    files = await asyncio.gather(
+        *(RenderCache.get("help", {"b": 1, "a": [1, 2]}, render) for _ in range(5))
+    )
+    assert len(set(files)) == 1
+    assert files[0].read_bytes() == b"image"
+    assert await RenderCache.get("help", {"a": [1, 2], "b": 1}, render) == files[0]
+    assert len(calls) == 1
+
+    await RenderCache.get("help", {"a": [1, 2], "b": 2}, render)
+    await RenderCache.get("help", {"a": [1, 2], "b": 1}, render, version=1)
+    assert len(calls) == 3
+
+    files[0].unlink()
+    assert await RenderCache.get("help", {"a": [1, 2], "b": 1}, render) == files[0]
+    assert len(calls) == 4
+
+
+async def test_max_size(app: App, cache_path: Path, mocker: MockerFixture):
+    """
+    测试超过容量时删除最久未使用的图片，重启后从目录恢复索引
+    """
+    from zhenxun.utils.manager.render_cache import RenderCache
+
+    mocker.patch.object(RenderCache, "max_size", 25)
+
+    async def render() -> bytes:
+        return b"0123456789"
+
+    first = await RenderCache.get("a", 1, render)
+    second = await RenderCache.get("a", 2, render)
+    await RenderCache.get("a", 1, render)
+    third = await RenderCache.get("a", 3, render)
+    assert first.exists()
+    assert not second.exists()
+    assert third.exists()
+
+    RenderCache._index = None
+    index = RenderCache._load_index()
+    assert isinstance(index, OrderedDict)
+    assert set(index) == {first.stem, third.stem}
+    assert RenderCache._size == 20
@@ -0,0 +1,55 @@
+from io import BytesIO
+
+from nonebug import App
+from PIL import Image, ImageFont
+from pytest_mock import MockerFixture
+
+
+async def draw(width: int, height: int, color: str, on_done=None):
+    from zhenxun.utils.image_utils import BuildImage
+
+    image = BuildImage(width, height, color, font=ImageFont.load_default())
+    await image.circle_corner(10)
+    await image.rectangle((10, 10, 30, 30), fill="black")
+    if on_done:
+        on_done()
+    return image
+
+
+async def test_render_in_thread(app: App, mocker: MockerFixture):
+    """
+    测试未启用进程池时在线程中渲染
+    """
+    from zhenxun.utils.render_pool import RenderPool
+
+    mocker.patch.object(RenderPool, "processes", 0)
+    result = await RenderPool.render(draw, 60, 40, "red")
+    image = Image.open(BytesIO(result))
+    assert image.size == (60, 40)
+    assert image.getpixel((20, 20)) == (0, 0, 0, 255)
+    assert image.getpixel((50, 20)) == (255, 0, 0, 255)
+
+
+async def test_render_in_process(app: App, mocker: MockerFixture):
+    """
+    测试进程池渲染结果与线程渲染一致，无法pickle的参数回退到线程
+    """
+    from zhenxun.utils.image_utils import BuildImage
+    from zhenxun.utils.render_pool import RenderPool
+
+    mocker.patch.object(RenderPool, "processes", 0)
+    expected = await RenderPool.render(draw, 60, 40, "red")
+    mocker.patch.object(RenderPool, "processes", 1)
+    try:
+        compose = mocker.spy(BuildImage, "compose")
+        assert await RenderPool.render(draw, 60, 40, "red") == expected
+        assert compose.call_count == 0
+        done = []
+        result = await RenderPool.render(
+            draw, 60, 40, "red", on_done=lambda: done.append(1)
+        )
+        assert result == expected
+        assert compose.call_count == 1
+        assert done == [1]
+    finally:
+        RenderPool.shutdown()
@@ -9,7 +9,7 @@ from zhenxun.services.log import logger
 from zhenxun.utils.enum import BlockType, PluginType
 from zhenxun.utils.message import MessageUtils
 
-from ._data_source import PluginManage, build_plugin, build_task, delete_help_image
+from ._data_source import PluginManage, build_plugin, build_task
 from .command import _group_status_matcher, _status_matcher
 
 base_config = Config.get("plugin_switch")
@@ -148,7 +148,6 @@ async def _(
         else:
             result = await PluginManage.unblock_group_plugin(name, gid)
             logger.info(f"开启功能 {name}", arparma.header_result, session=session)
-        delete_help_image(gid)
         await MessageUtils.build_message(result).finish(reply_to=True)
     elif session.id1 in bot.config.superusers:
         """私聊"""
@@ -208,7 +207,6 @@ async def _(
                 session=session,
                 target=group_id,
             )
-        delete_help_image()
         await MessageUtils.build_message(result).finish(reply_to=True)
 
 
@@ -255,7 +253,6 @@ async def _(
         else:
             result = await PluginManage.block_group_plugin(name, gid)
             logger.info(f"关闭功能 {name}", arparma.header_result, session=session)
-        delete_help_image(gid)
         await MessageUtils.build_message(result).finish(reply_to=True)
     elif session.id1 in bot.config.superusers:
         group_id = group.result if group.available else None
@@ -321,7 +318,6 @@ async def _(
                 session=session,
                 target=group_id,
             )
-        delete_help_image()
         await MessageUtils.build_message(result).finish(reply_to=True)
 
 
@@ -1,27 +1,12 @@
-from zhenxun.configs.path_config import DATA_PATH, IMAGE_PATH
+from pathlib import Path
+
 from zhenxun.models.group_console import GroupConsole
 from zhenxun.models.plugin_info import PluginInfo
 from zhenxun.models.task_info import TaskInfo
 from zhenxun.utils.enum import BlockType, PluginType
 from zhenxun.utils.exception import GroupInfoNotFound
-from zhenxun.utils.image_utils import BuildImage, ImageTemplate, RowStyle
-
-HELP_FILE = IMAGE_PATH / "SIMPLE_HELP.png"
-
-GROUP_HELP_PATH = DATA_PATH / "group_help"
-
-
-def delete_help_image(gid: str | None = None):
-    """删除帮助图片"""
-    if gid:
-        file = GROUP_HELP_PATH / f"{gid}.png"
-        if file.exists():
-            file.unlink()
-    else:
-        if HELP_FILE.exists():
-            HELP_FILE.unlink()
-        for file in GROUP_HELP_PATH.iterdir():
-            file.unlink()
+from zhenxun.utils.image_utils import ImageTemplate, RowStyle
+from zhenxun.utils.manager.render_cache import RenderCache
 
 
 def plugin_row_style(column: str, text: str) -> RowStyle:
@@ -44,7 +29,7 @@ def plugin_row_style(column: str, text: str) -> RowStyle:
     return style
 
 
-async def build_plugin() -> BuildImage:
+async def build_plugin() -> Path:
     column_name = [
         "ID",
         "模块",
@@ -73,12 +58,16 @@ async def build_plugin() -> BuildImage:
         ]
         for plugin in plugin_list
     ]
-    return await ImageTemplate.table_page(
-        "Plugin",
-        "插件状态",
-        column_name,
+    return await RenderCache.get(
+        "plugin_switch.plugin",
         column_data,
-        text_style=plugin_row_style,
+        lambda: ImageTemplate.table_page(
+            "Plugin",
+            "插件状态",
+            column_name,
+            column_data,
+            text_style=plugin_row_style,
+        ),
     )
 
 
@@ -98,7 +87,7 @@ def task_row_style(column: str, text: str) -> RowStyle:
     return style
 
 
-async def build_task(group_id: str | None) -> BuildImage:
+async def build_task(group_id: str | None) -> Path:
     """构造被动技能状态图片
 
     参数:
@@ -108,7 +97,7 @@ async def build_task(group_id: str | None) -> BuildImage:
         GroupInfoNotFound: 未找到群组
 
     返回:
-        BuildImage: 被动技能状态图片
+        Path: 被动技能状态图片
     """
     task_list = await TaskInfo.all()
     column_name = ["ID", "模块", "名称", "群组状态", "全局状态", "运行时间"]
@@ -144,12 +133,16 @@ async def build_task(group_id: str | None) -> BuildImage:
                     task.run_time or "-",
                 ]
             )
-    return await ImageTemplate.table_page(
-        "Task",
-        "被动技能状态",
-        column_name,
-        column_data,
-        text_style=task_row_style,
+    return await RenderCache.get(
+        "plugin_switch.task",
+        [column_name, column_data],
+        lambda: ImageTemplate.table_page(
+            "Task",
+            "被动技能状态",
+            column_name,
+            column_data,
+            text_style=task_row_style,
+        ),
     )
 
 
@@ -1,13 +1,15 @@
+from datetime import datetime
+
 from nonebot import on_message
 from nonebot.plugin import PluginMetadata
 from nonebot_plugin_alconna import UniMsg
-from nonebot_plugin_apscheduler import scheduler
 from nonebot_plugin_session import EventSession
 
 from zhenxun.configs.config import Config
 from zhenxun.configs.utils import PluginExtraData, RegisterConfig
 from zhenxun.models.chat_history import ChatHistory
-from zhenxun.services.log import logger
+from zhenxun.models.chat_hour_count import chat_rollup
+from zhenxun.services.ingest import IngestPipeline
 from zhenxun.utils.enum import PluginType
 
 __plugin_meta__ = PluginMetadata(
@@ -39,40 +41,38 @@ def rule(message: UniMsg) -> bool:
 chat_history = on_message(rule=rule, priority=1, block=False)
 
 
-TEMP_LIST = []
+pipeline = IngestPipeline(
+    ChatHistory,
+    (
+        "user_id",
+        "group_id",
+        "text",
+        "plain_text",
+        "bot_id",
+        "platform",
+        "create_time",
+    ),
+    after_flush=chat_rollup.run,
+)
 
 
 @chat_history.handle()
 async def _(message: UniMsg, session: EventSession):
     # group_id = session.id3 or session.id2
     group_id = session.id2
-    TEMP_LIST.append(
-        ChatHistory(
-            user_id=session.id1,
-            group_id=group_id,
-            text=str(message),
-            plain_text=message.extract_plain_text(),
-            bot_id=session.bot_id,
-            platform=session.platform,
+    await pipeline.put(
+        (
+            session.id1,
+            group_id,
+            str(message),
+            message.extract_plain_text(),
+            session.bot_id,
+            session.platform,
+            datetime.now(),
         )
     )
 
 
-@scheduler.scheduled_job(
-    "interval",
-    minutes=1,
-)
-async def _():
-    try:
-        message_list = TEMP_LIST.copy()
-        TEMP_LIST.clear()
-        if message_list:
-            await ChatHistory.bulk_create(message_list)
-        logger.debug(f"批量添加聊天记录 {len(message_list)} 条", "定时任务")
-    except Exception as e:
-        logger.error("定时批量添加聊天记录", "定时任务", e=e)
-
-
 # @test.handle()
 # async def _(event: MessageEvent):
 #     print(await ChatHistory.get_user_msg(event.user_id, "private"))
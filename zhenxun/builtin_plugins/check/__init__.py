@@ -4,11 +4,11 @@ from nonebot.permission import SUPERUSER
 from nonebot.plugin import PluginMetadata
 from nonebot.rule import Rule, to_me
 from nonebot_plugin_alconna import Alconna, on_alconna
-from nonebot_plugin_htmlrender import template_to_pic
 
 from zhenxun.configs.config import Config
 from zhenxun.configs.path_config import TEMPLATE_PATH
 from zhenxun.configs.utils import PluginExtraData, RegisterConfig
+from zhenxun.services.html_render import HtmlRender
 from zhenxun.services.log import logger
 from zhenxun.utils.enum import PluginType
 from zhenxun.utils.message import MessageUtils
@@ -68,7 +68,7 @@ _self_check_poke_matcher = on_notice(
 async def handle_self_check():
     try:
         data = await get_status_info()
-        image = await template_to_pic(
+        image = await HtmlRender.template_to_pic(
             template_path=str((TEMPLATE_PATH / "check").absolute()),
             template_name="main.html",
             templates={"data": data},
@@ -76,7 +76,6 @@ async def handle_self_check():
                 "viewport": {"width": 195, "height": 750},
                 "base_url": f"file://{TEMPLATE_PATH}",
             },
-            wait=2,
         )
         await MessageUtils.build_message(image).send()
         logger.info("自检成功", "自检")
@@ -13,11 +13,6 @@ from nonebot_plugin_alconna import (
 )
 from nonebot_plugin_uninfo import Uninfo
 
-from zhenxun.builtin_plugins.help._config import (
-    GROUP_HELP_PATH,
-    SIMPLE_DETAIL_HELP_IMAGE,
-    SIMPLE_HELP_IMAGE,
-)
 from zhenxun.configs.utils import PluginExtraData, RegisterConfig
 from zhenxun.services.log import logger
 from zhenxun.utils.enum import PluginType
@@ -87,16 +82,7 @@ async def _(
                 reply_to=True
             )
         logger.info(f"查看帮助详情: {name.result}", "帮助", session=session)
-    elif session.group and (gid := session.group.id):
-        _image_path = GROUP_HELP_PATH / f"{gid}_{is_detail.result}.png"
-        if not _image_path.exists():
-            result = await create_help_img(session, gid, is_detail.result)
-        await MessageUtils.build_message(_image_path).finish()
     else:
-        if is_detail.result:
-            _image_path = SIMPLE_DETAIL_HELP_IMAGE
-        else:
-            _image_path = SIMPLE_HELP_IMAGE
-        if not _image_path.exists():
-            result = await create_help_img(session, None, is_detail.result)
+        gid = session.group.id if session.group else None
+        _image_path = await create_help_img(session, gid, is_detail.result)
         await MessageUtils.build_message(_image_path).finish()
@@ -4,18 +4,16 @@ import nonebot
 from nonebot_plugin_uninfo import Uninfo
 
 from zhenxun.configs.path_config import IMAGE_PATH
+from zhenxun.models.group_console import GroupConsole
 from zhenxun.models.level_user import LevelUser
 from zhenxun.models.plugin_info import PluginInfo
 from zhenxun.utils.enum import PluginType
 from zhenxun.utils.image_utils import BuildImage, ImageTemplate
+from zhenxun.utils.manager.render_cache import RenderCache
+from zhenxun.utils.render_pool import RenderPool
 
-from ._config import (
-    GROUP_HELP_PATH,
-    SIMPLE_DETAIL_HELP_IMAGE,
-    SIMPLE_HELP_IMAGE,
-    base_config,
-)
-from .html_help import build_html_image
+from ._config import base_config
+from .html_help import build_html_image, random_logo_seed
 from .normal_help import build_normal_image
 from .zhenxun_help import build_zhenxun_image
 
@@ -27,34 +25,73 @@ background = IMAGE_PATH / "background" / "0.png"
 driver = nonebot.get_driver()
 
 
+async def get_help_data(
+    session: Uninfo, group_id: str | None, help_type: str, is_detail: bool
+) -> dict:
+    """获取决定帮助图片内容的数据，插件状态相同的群组共用一张帮助图片
+
+    参数:
+        session: Uninfo
+        group_id: 群号
+        help_type: 帮助样式
+        is_detail: 是否详细帮助
+
+    返回:
+        dict: 帮助数据
+    """
+    plugins = (
+        await PluginInfo.filter(
+            menu_type__not="",
+            load_status=True,
+            plugin_type__in=[PluginType.NORMAL, PluginType.DEPENDANT],
+            is_show=True,
+        )
+        .order_by("id")
+        .values()
+    )
+    group = await GroupConsole.get_or_none(group_id=group_id) if group_id else None
+    data = {
+        "type": help_type,
+        "detail": is_detail,
+        "plugins": plugins,
+        "block_plugin": group.block_plugin if group else None,
+    }
+    if help_type == "zhenxun":
+        data["bot"] = session.self_id
+    elif help_type == "html":
+        # html样式随机选择logo，每种选择分别缓存
+        data["logo_seed"] = random_logo_seed()
+    return data
+
+
 async def create_help_img(
     session: Uninfo, group_id: str | None, is_detail: bool
 ) -> Path:
-    """生成帮助图片
+    """获取帮助图片，插件状态未变化时使用缓存
 
     参数:
         session: Uninfo
         group_id: 群号
+        is_detail: 是否详细帮助
+
+    返回:
+        Path: 图片路径
     """
     help_type = base_config.get("type", "").strip().lower()
+    data = await get_help_data(session, group_id, help_type, is_detail)
 
-    match help_type:
-        case "html":
-            result = BuildImage.open(await build_html_image(group_id, is_detail))
-        case "zhenxun":
-            result = BuildImage.open(
-                await build_zhenxun_image(session, group_id, is_detail)
-            )
-        case _:
-            result = await build_normal_image(group_id, is_detail)
-    if group_id:
-        save_path = GROUP_HELP_PATH / f"{group_id}_{is_detail}.png"
-    elif is_detail:
-        save_path = SIMPLE_DETAIL_HELP_IMAGE
-    else:
-        save_path = SIMPLE_HELP_IMAGE
-    await result.save(save_path)
-    return save_path
+    async def render() -> BuildImage | bytes:
+        match help_type:
+            case "html":
+                return await build_html_image(
+                    group_id, is_detail, data.get("logo_seed")
+                )
+            case "zhenxun":
+                return await build_zhenxun_image(session, group_id, is_detail)
+            case _:
+                return await build_normal_image(group_id, is_detail)
+
+    return await RenderCache.get("help", data, render)
 
 
 async def get_user_allow_help(user_id: str) -> list[PluginType]:
@@ -78,9 +115,7 @@ async def get_user_allow_help(user_id: str) -> list[PluginType]:
     return type_list
 
 
-async def get_plugin_help(
-    user_id: str, name: str, is_superuser: bool
-) -> str | BuildImage:
+async def get_plugin_help(user_id: str, name: str, is_superuser: bool) -> str | bytes:
     """获取功能的帮助信息
 
     参数:
@@ -112,6 +147,8 @@ async def get_plugin_help(
                     "用法": _plugin.metadata.usage,
                 }
             if items:
-                return await ImageTemplate.hl_page(plugin.name, items)
+                return await RenderPool.render(
+                    ImageTemplate.hl_page, plugin.name, items
+                )
         return "糟糕! 该功能没有帮助喔..."
     return "没有查找到这个功能噢..."
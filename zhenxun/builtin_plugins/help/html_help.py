@@ -1,12 +1,12 @@
 import os
 import random
 
-from nonebot_plugin_htmlrender import template_to_pic
 from pydantic import BaseModel
 
 from zhenxun.configs.path_config import TEMPLATE_PATH
 from zhenxun.models.group_console import GroupConsole
 from zhenxun.models.plugin_info import PluginInfo
+from zhenxun.services.html_render import HtmlRender
 from zhenxun.utils.enum import BlockType
 
 from ._utils import classify_plugin
@@ -80,11 +80,19 @@ def __handle_item(
     return Item(plugin_name=plugin.name, sta=sta)
 
 
-def build_plugin_data(classify: dict[str, list[Item]]) -> list[dict[str, str]]:
+def random_logo_seed() -> int:
+    """随机选择logo使用的种子，不同种子的数量与logo数量相同"""
+    return random.randrange(max(len(os.listdir(LOGO_PATH)), 1))
+
+
+def build_plugin_data(
+    classify: dict[str, list[Item]], logo_seed: int | None = None
+) -> list[dict[str, str]]:
     """构建前端插件数据
 
     参数:
         classify: 插件数据
+        logo_seed: 随机选择logo的种子，相同种子选择的logo相同.
 
     返回:
         list[dict[str, str]]: 前端插件数据
@@ -94,12 +102,14 @@ def build_plugin_data(classify: dict[str, list[Item]]) -> list[dict[str, str]]:
     menu_key = list(classify.keys())[index]
     max_data = classify[menu_key]
     del classify[menu_key]
+    logos = sorted(os.listdir(LOGO_PATH))
+    rand = random.Random(logo_seed)
     plugin_list = []
     for menu_type in classify:
         icon = "fa fa-pencil-square-o"
         if menu_type in ICON2STR.keys():
             icon = ICON2STR[menu_type]
-        logo = LOGO_PATH / random.choice(os.listdir(LOGO_PATH))
+        logo = LOGO_PATH / rand.choice(logos)
         data = {
             "name": menu_type if menu_type != "normal" else "功能",
             "items": classify[menu_type],
@@ -113,22 +123,25 @@ def build_plugin_data(classify: dict[str, list[Item]]) -> list[dict[str, str]]:
             "name": menu_key if menu_key != "normal" else "功能",
             "items": max_data,
             "icon": "fa fa-pencil-square-o",
-            "logo": str((LOGO_PATH / random.choice(os.listdir(LOGO_PATH))).absolute()),
+            "logo": str((LOGO_PATH / rand.choice(logos)).absolute()),
         },
     )
     return plugin_list
 
 
-async def build_html_image(group_id: str | None, is_detail: bool) -> bytes:
+async def build_html_image(
+    group_id: str | None, is_detail: bool, logo_seed: int | None = None
+) -> bytes:
     """构造HTML帮助图片
 
     参数:
         group_id: 群号
         is_detail: 是否详细帮助
+        logo_seed: 随机选择logo的种子.
     """
     classify = await classify_plugin(group_id, is_detail, __handle_item)
-    plugin_list = build_plugin_data(classify)
-    return await template_to_pic(
+    plugin_list = build_plugin_data(classify, logo_seed)
+    return await HtmlRender.template_to_pic(
         template_path=str((TEMPLATE_PATH / "menu").absolute()),
         template_name="zhenxun_menu.html",
         templates={"plugin_list": plugin_list},
@@ -136,5 +149,4 @@ async def build_html_image(group_id: str | None, is_detail: bool) -> bytes:
             "viewport": {"width": 1903, "height": 975},
             "base_url": f"file://{TEMPLATE_PATH}",
         },
-        wait=2,
     )
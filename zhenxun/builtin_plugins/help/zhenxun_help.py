@@ -1,5 +1,4 @@
 import nonebot
-from nonebot_plugin_htmlrender import template_to_pic
 from nonebot_plugin_uninfo import Uninfo
 from pydantic import BaseModel
 
@@ -8,6 +7,7 @@ from zhenxun.configs.path_config import TEMPLATE_PATH
 from zhenxun.configs.utils import PluginExtraData
 from zhenxun.models.group_console import GroupConsole
 from zhenxun.models.plugin_info import PluginInfo
+from zhenxun.services.html_render import HtmlRender
 from zhenxun.utils.enum import BlockType
 from zhenxun.utils.platform import PlatformUtils
 
@@ -150,7 +150,7 @@ async def build_zhenxun_image(
     width = int(637 * 1.5) if is_detail else 637
     title_font = int(53 * 1.5) if is_detail else 53
     tip_font = int(19 * 1.5) if is_detail else 19
-    return await template_to_pic(
+    return await HtmlRender.template_to_pic(
         template_path=str((TEMPLATE_PATH / "ss_menu").absolute()),
         template_name="main.html",
         templates={
@@ -166,5 +166,4 @@ async def build_zhenxun_image(
             "viewport": {"width": width, "height": 453},
             "base_url": f"file://{TEMPLATE_PATH}",
         },
-        wait=2,
     )
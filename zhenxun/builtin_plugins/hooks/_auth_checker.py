@@ -10,9 +10,6 @@ from pydantic import BaseModel
 from tortoise.exceptions import IntegrityError
 
 from zhenxun.configs.config import Config
-from zhenxun.models.bot_console import BotConsole
-from zhenxun.models.group_console import GroupConsole
-from zhenxun.models.level_user import LevelUser
 from zhenxun.models.plugin_info import PluginInfo
 from zhenxun.models.plugin_limit import PluginLimit
 from zhenxun.models.sign_user import SignUser
@@ -21,20 +18,28 @@ from zhenxun.services.log import logger
 from zhenxun.utils.enum import (
     BlockType,
     GoldHandle,
+    LimitCheckType,
     LimitWatchType,
     PluginLimitType,
     PluginType,
 )
 from zhenxun.utils.exception import InsufficientGold
+from zhenxun.utils.manager.auth_snapshot import AuthSnapshot
 from zhenxun.utils.message import MessageUtils
-from zhenxun.utils.utils import CountLimiter, FreqLimiter, UserBlockLimiter
+from zhenxun.utils.utils import (
+    CountLimiter,
+    FreqLimiter,
+    RateLimiter,
+    UserBlockLimiter,
+    WindowLimiter,
+)
 
 base_config = Config.get("hook")
 
 
 class Limit(BaseModel):
     limit: PluginLimit
-    limiter: FreqLimiter | UserBlockLimiter | CountLimiter
+    limiter: RateLimiter | WindowLimiter | UserBlockLimiter | CountLimiter
 
     class Config:
         arbitrary_types_allowed = True
@@ -56,18 +61,21 @@ class LimitManage:
         """
         if limit.module not in cls.add_module:
             cls.add_module.append(limit.module)
-            if limit.limit_type == PluginLimitType.BLOCK:
-                cls.block_limit[limit.module] = Limit(
-                    limit=limit, limiter=UserBlockLimiter()
-                )
-            elif limit.limit_type == PluginLimitType.CD:
-                cls.cd_limit[limit.module] = Limit(
-                    limit=limit, limiter=FreqLimiter(limit.cd)
-                )
-            elif limit.limit_type == PluginLimitType.COUNT:
-                cls.count_limit[limit.module] = Limit(
-                    limit=limit, limiter=CountLimiter(limit.max_count)
-                )
+        if limit.limit_type == PluginLimitType.BLOCK:
+            cls.block_limit[limit.module] = Limit(
+                limit=limit, limiter=UserBlockLimiter()
+            )
+        elif limit.limit_type == PluginLimitType.CD:
+            cls.cd_limit[limit.module] = Limit(
+                limit=limit, limiter=RateLimiter(limit.cd, limit.burst or 1)
+            )
+        elif limit.limit_type == PluginLimitType.COUNT:
+            limiter = (
+                WindowLimiter(limit.max_count, limit.period)
+                if limit.period
+                else CountLimiter(limit.max_count)
+            )
+            cls.count_limit[limit.module] = Limit(limit=limit, limiter=limiter)
 
     @classmethod
     def unblock(
@@ -148,15 +156,14 @@ class LimitManage:
             return
         limit = limit_model.limit
         limiter = limit_model.limiter
-        is_limit = (
-            LimitWatchType.ALL
-            or (group_id and limit.watch_type == LimitWatchType.GROUP)
-            or (not group_id and limit.watch_type == LimitWatchType.USER)
-        )
+        if (limit.check_type == LimitCheckType.GROUP and not group_id) or (
+            limit.check_type == LimitCheckType.PRIVATE and group_id
+        ):
+            return
         key_type = user_id
         if group_id and limit.watch_type == LimitWatchType.GROUP:
             key_type = channel_id or group_id
-        if is_limit and not limiter.check(key_type):
+        if not limiter.check(key_type):
             if limit.result:
                 await MessageUtils.build_message(limit.result).send()
             logger.debug(
@@ -167,13 +174,14 @@ class LimitManage:
             raise IgnoredException(f"{limit.module} 正在限制中...")
         else:
             logger.debug(
-                f"开始进行限制 {limit.module}({limit.limit_type})...",
+                "开始进行限制 %s(%s)...",
                 "AuthChecker",
                 session=user_id,
                 group_id=group_id,
+                args=(limit.module, limit.limit_type),
             )
-            if isinstance(limiter, FreqLimiter):
-                limiter.start_cd(key_type)
+            if isinstance(limiter, RateLimiter | WindowLimiter):
+                limiter.consume(key_type)
             if isinstance(limiter, UserBlockLimiter):
                 limiter.set_true(key_type)
             if isinstance(limiter, CountLimiter):
@@ -244,7 +252,7 @@ class AuthChecker:
             return
         if user_id and matcher.plugin and (module_path := matcher.plugin.module_name):
             try:
-                user = await UserConsole.get_user(user_id, session.platform)
+                await AuthSnapshot.touch_user(user_id, session.platform)
             except IntegrityError as e:
                 logger.debug(
                     "重复创建用户，已跳过该次权限...",
@@ -253,15 +261,15 @@ class AuthChecker:
                     e=e,
                 )
                 return
-            if plugin := await PluginInfo.get_or_none(module_path=module_path):
+            if plugin := await AuthSnapshot.get_plugin(module_path):
                 if plugin.plugin_type == PluginType.HIDDEN:
                     logger.debug(
-                        f"插件: {plugin.name}:{plugin.module} "
-                        "为HIDDEN，已跳过权限检查..."
+                        "插件: %s:%s 为HIDDEN，已跳过权限检查...",
+                        args=(plugin.name, plugin.module),
                     )
                     return
                 try:
-                    cost_gold = await self.auth_cost(user, plugin, session)
+                    cost_gold = await self.auth_cost(user_id, plugin, session)
                     if session.id1 in bot.config.superusers:
                         if plugin.plugin_type == PluginType.SUPERUSER:
                             raise IsSuperuserException()
@@ -300,7 +308,10 @@ class AuthChecker:
                     u.gold = 0
                     await u.save(update_fields=["gold"])
             logger.debug(
-                f"调用功能花费金币: {cost_gold}", "AuthChecker", session=session
+                "调用功能花费金币: %s",
+                "AuthChecker",
+                session=session,
+                args=(cost_gold,),
             )
         if is_ignore:
             raise IgnoredException("权限检测 ignore")
@@ -312,10 +323,10 @@ class AuthChecker:
             plugin: PluginInfo
             bot_id: bot_id
         """
-        if not await BotConsole.get_bot_status(bot_id):
+        if not await AuthSnapshot.get_bot_status(bot_id):
             logger.debug("Bot休眠中阻断权限检测...", "AuthChecker")
             raise IgnoredException("BotConsole休眠权限检测 ignore")
-        if await BotConsole.is_block_plugin(bot_id, plugin.module):
+        if await AuthSnapshot.is_bot_block_plugin(bot_id, plugin.module):
             logger.debug(
                 f"Bot插件 {plugin.name}({plugin.module}) 权限检查结果为关闭...",
                 "AuthChecker",
@@ -336,10 +347,7 @@ class AuthChecker:
             group_id = channel_id
             channel_id = None
         if plugin.module not in LimitManage.add_module:
-            limit_list: list[PluginLimit] = await plugin.plugin_limit.filter(
-                status=True
-            ).all()  # type: ignore
-            for limit in limit_list:
+            for limit in await AuthSnapshot.get_plugin_limits(plugin):
                 LimitManage.add_limit(limit)
         if user_id:
             await LimitManage.check(
@@ -378,7 +386,7 @@ class AuthChecker:
                     raise IgnoredException("好感度不足...")
             if group_id:
                 sid = group_id or user_id
-                if await GroupConsole.is_superuser_block_plugin(
+                if await AuthSnapshot.is_superuser_block_plugin(
                     group_id, plugin.module
                 ):
                     """超级用户群组插件状态"""
@@ -393,7 +401,7 @@ class AuthChecker:
                         session=session,
                     )
                     raise IgnoredException("超级管理员禁用了该群此功能...")
-                if await GroupConsole.is_normal_block_plugin(group_id, plugin.module):
+                if await AuthSnapshot.is_normal_block_plugin(group_id, plugin.module):
                     """群组插件状态"""
                     if self.is_send_limit_message(plugin, sid):
                         self._flmt_s.start_cd(group_id or user_id)
@@ -452,7 +460,7 @@ class AuthChecker:
                     raise IgnoredException("该插件在私聊中已被禁用...")
             if not plugin.status and plugin.block_type == BlockType.ALL:
                 """全局状态"""
-                if group_id and await GroupConsole.is_super_group(group_id):
+                if group_id and await AuthSnapshot.is_super_group(group_id):
                     raise IsSuperuserException()
                 logger.debug(
                     f"{plugin.name}({plugin.module}) 全局未开启此功能...",
@@ -474,7 +482,7 @@ class AuthChecker:
         user_id = session.id1
         if user_id and plugin.admin_level:
             if group_id := session.id3 or session.id2:
-                if not await LevelUser.check_level(
+                if not await AuthSnapshot.check_level(
                     user_id, group_id, plugin.admin_level
                 ):
                     try:
@@ -500,7 +508,7 @@ class AuthChecker:
                         session=session,
                     )
                     raise IgnoredException("管理员权限不足...")
-            elif not await LevelUser.check_level(user_id, None, plugin.admin_level):
+            elif not await AuthSnapshot.check_level(user_id, None, plugin.admin_level):
                 try:
                     await MessageUtils.build_message(
                         f"你的权限不足喔，该功能需要的权限等级: {plugin.admin_level}"
@@ -529,7 +537,7 @@ class AuthChecker:
         if not (group_id := session.id3 or session.id2):
             return
         text = message.extract_plain_text()
-        group = await GroupConsole.get_group(group_id)
+        group = await AuthSnapshot.get_group(group_id)
         if not group:
             """群不存在"""
             logger.debug(
@@ -562,18 +570,21 @@ class AuthChecker:
             raise IgnoredException(f"{plugin.name}({plugin.module}) 群等级限制...")
 
     async def auth_cost(
-        self, user: UserConsole, plugin: PluginInfo, session: EventSession
+        self, user_id: str, plugin: PluginInfo, session: EventSession
     ) -> int:
         """检测是否满足金币条件
 
         参数:
-            user: UserConsole
+            user_id: 用户id
             plugin: PluginInfo
             session: EventSession
 
         返回:
             int: 需要消耗的金币
         """
+        if not plugin.cost_gold:
+            return 0
+        user = await UserConsole.get_user(user_id, session.platform)
         if user.gold < plugin.cost_gold:
             """插件消耗金币不足"""
             try:
@@ -4,6 +4,7 @@ from nonebot.matcher import Matcher
 from nonebot.message import run_preprocessor
 from nonebot.typing import T_State
 from nonebot_plugin_alconna import At
+from nonebot_plugin_apscheduler import scheduler
 from nonebot_plugin_session import EventSession
 
 from zhenxun.configs.config import Config
@@ -82,3 +83,12 @@ async def _(
                 ).send()
             logger.debug("用户处于黑名单中...", "ban_hook")
             raise IgnoredException("用户处于黑名单中...")
+
+
+# 清理到期封禁数据
+@scheduler.scheduled_job(
+    "interval",
+    minutes=1,
+)
+async def _():
+    await BanConsole.clear_expired()
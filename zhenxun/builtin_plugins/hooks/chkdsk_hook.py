@@ -1,4 +1,3 @@
-from collections import defaultdict
 import time
 
 from nonebot.adapters import Event
@@ -15,6 +14,7 @@ from zhenxun.models.ban_console import BanConsole
 from zhenxun.services.log import logger
 from zhenxun.utils.enum import PluginType
 from zhenxun.utils.message import MessageUtils
+from zhenxun.utils.utils import LimiterStore
 
 malicious_check_time = Config.get_config("hook", "MALICIOUS_CHECK_TIME")
 malicious_ban_count = Config.get_config("hook", "MALICIOUS_BAN_COUNT")
@@ -31,27 +31,23 @@ class BanCheckLimiter:
     """
 
     def __init__(self, default_check_time: float = 5, default_count: int = 4):
-        self.mint = defaultdict(int)
-        self.mtime = defaultdict(float)
+        self.store = LimiterStore()
+        """key: 触发次数，过期时间为检测时间段的结束时间"""
         self.default_check_time = default_check_time
         self.default_count = default_count
 
     def add(self, key: str | float):
-        if self.mint[key] == 1:
-            self.mtime[key] = time.time()
-        self.mint[key] += 1
+        if entry := self.store.get_entry(key):
+            if entry.value == 1:
+                entry.expire = time.time() + self.default_check_time
+            entry.value += 1
+        else:
+            self.store.set(key, 1, time.time() + self.default_check_time)
 
     def check(self, key: str | float) -> bool:
-        if time.time() - self.mtime[key] > self.default_check_time:
-            self.mtime[key] = time.time()
-            self.mint[key] = 0
-            return False
-        if (
-            self.mint[key] >= self.default_count
-            and time.time() - self.mtime[key] < self.default_check_time
-        ):
-            self.mtime[key] = time.time()
-            self.mint[key] = 0
+        entry = self.store.get_entry(key)
+        if entry and entry.value >= self.default_count:
+            self.store.pop(key)
             return True
         return False
 
@@ -62,6 +58,20 @@ _blmt = BanCheckLimiter(
 )
 
 
+def _set_check_time(value: float | None):
+    if value:
+        _blmt.default_check_time = value
+
+
+def _set_ban_count(value: int | None):
+    if value:
+        _blmt.default_count = value
+
+
+Config.subscribe("hook", "MALICIOUS_CHECK_TIME", _set_check_time)
+Config.subscribe("hook", "MALICIOUS_BAN_COUNT", _set_ban_count)
+
+
 # 恶意触发命令检测
 @run_preprocessor
 async def _(
@@ -1,7 +1,6 @@
 from datetime import datetime, timedelta
 import random
 
-from nonebot_plugin_htmlrender import template_to_pic
 from nonebot_plugin_uninfo import Uninfo
 from tortoise.expressions import RawSQL
 from tortoise.functions import Count
@@ -12,6 +11,7 @@ from zhenxun.models.level_user import LevelUser
 from zhenxun.models.sign_user import SignUser
 from zhenxun.models.statistics import Statistics
 from zhenxun.models.user_console import UserConsole
+from zhenxun.services.html_render import HtmlRender
 from zhenxun.utils.platform import PlatformUtils
 
 RACE = [
@@ -182,7 +182,7 @@ async def get_user_info(
         "chart_date": chart_date,
         "count_list": count_list,
     }
-    return await template_to_pic(
+    return await HtmlRender.template_to_pic(
         template_path=str((TEMPLATE_PATH / "my_info").absolute()),
         template_name="main.html",
         templates={"data": data},
@@ -190,5 +190,4 @@ async def get_user_info(
             "viewport": {"width": 1754, "height": 1240},
             "base_url": f"file://{TEMPLATE_PATH}",
         },
-        wait=2,
     )
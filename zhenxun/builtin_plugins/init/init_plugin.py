@@ -90,6 +90,8 @@ async def _handle_setting(
                 result=limit.result,
                 cd=getattr(limit, "cd", None),
                 max_count=getattr(limit, "max_count", None),
+                burst=getattr(limit, "burst", None),
+                period=getattr(limit, "period", None),
             )
             for limit in extra_data.limits
         )
@@ -18,6 +18,7 @@ CD_TEST = """需要cd的功能
 自定义的功能需要cd也可以在此配置
 key：模块名称
 cd：cd 时长（秒）
+burst：cd 内允许连续调用的次数，默认为 1，即 cd 内只能调用一次
 status：此限制的开关状态
 check_type：'PRIVATE'/'GROUP'/'ALL'，限制私聊/群聊/全部
 watch_type：监听对象，以user_id或group_id作为键来限制，'USER'：用户id，'GROUP'：群id
@@ -48,6 +49,7 @@ COUNT_TEST = """命令每日次数限制
 每日调用直到 00:00 刷新
 key：模块名称
 max_count: 每日调用上限
+period: 限制时间段（秒），设置后改为任意 period 秒内最多调用 max_count 次，不再每日刷新
 status：此限制的开关状态
 watch_type：监听对象，以user_id或group_id作为键来限制，'USER'：用户id，'GROUP'：群id
                                      示例：'USER'：用户上限，'group'：群聊上限
@@ -90,6 +92,7 @@ class Manager:
                     watch_type=data.watch_type,
                     result=data.result,
                     cd=data.cd,
+                    burst=data.burst or 1,
                 )
             elif data.limit_type == PluginLimitType.BLOCK:
                 data = BaseBlock(
@@ -104,6 +107,7 @@ class Manager:
                     watch_type=data.watch_type,
                     result=data.result,
                     max_count=data.max_count,
+                    period=data.period,
                 )
         if isinstance(data, PluginCdBlock):
             self.cd_data[module] = data
@@ -282,6 +286,8 @@ class Manager:
                     plugin=module2plugin[k],
                     cd=getattr(limit, "cd", None),
                     max_count=getattr(limit, "max_count", None),
+                    burst=getattr(limit, "burst", None),
+                    period=getattr(limit, "period", None),
                     status=limit.status,
                     check_type=limit.check_type,
                     watch_type=limit.watch_type,
@@ -292,8 +298,10 @@ class Manager:
         db_data = self.__replace_data(db_data, limit)
         if limit_type == PluginLimitType.CD:
             db_data.cd = limit.cd  # type: ignore
+            db_data.burst = limit.burst  # type: ignore
         if limit_type == PluginLimitType.COUNT:
             db_data.max_count = limit.max_count  # type: ignore
+            db_data.period = limit.period  # type: ignore
         return db_data, False
 
     def __get_file_data(self, limit_type: PluginLimitType) -> dict:
@@ -405,6 +413,8 @@ class Manager:
                         "result",
                         "cd",
                         "max_count",
+                        "burst",
+                        "period",
                     ]
                 )
             # TODO: tortoise.exceptions.OperationalError:syntax error at or near "GROUP"
@@ -14,9 +14,10 @@ from zhenxun.utils.github_utils import GithubUtils
 from zhenxun.utils.github_utils.models import RepoAPI
 from zhenxun.utils.http_utils import AsyncHttpx
 from zhenxun.utils.image_utils import BuildImage, ImageTemplate, RowStyle
+from zhenxun.utils.manager.render_cache import RenderCache
 from zhenxun.utils.utils import is_number
 
-from .config import BASE_PATH, DEFAULT_GITHUB_URL, EXTRA_GITHUB_URL
+from .config import BASE_PATH, DEFAULT_GITHUB_URL, DOWNLOAD_LIMIT, EXTRA_GITHUB_URL
 
 
 def row_style(column: str, text: str) -> RowStyle:
@@ -150,11 +151,11 @@ class ShopManage:
         return await PluginInfo.filter(load_status=True).values_list(*args)
 
     @classmethod
-    async def get_plugins_info(cls) -> BuildImage | str:
-        """插件列表
+    async def get_plugins_info(cls) -> Path:
+        """插件列表，插件列表与安装状态未变化时使用缓存
 
         返回:
-            BuildImage | str: 返回消息
+            Path: 插件列表图片
         """
         data: dict[str, StorePluginInfo] = await cls.get_data()
         column_name = ["-", "ID", "名称", "简介", "作者", "版本", "类型"]
@@ -172,12 +173,16 @@ class ShopManage:
             ]
             for id, plugin_info in enumerate(data.items())
         ]
-        return await ImageTemplate.table_page(
-            "插件列表",
-            "通过添加/移除插件 ID 来管理插件",
-            column_name,
+        return await RenderCache.get(
+            "plugin_store",
             data_list,
-            text_style=row_style,
+            lambda: ImageTemplate.table_page(
+                "插件列表",
+                "通过添加/移除插件 ID 来管理插件",
+                column_name,
+                data_list,
+                text_style=row_style,
+            ),
         )
 
     @classmethod
@@ -246,12 +251,14 @@ class ShopManage:
             module_path=replace_module_path + ("" if is_dir else ".py"),
             is_dir=is_dir,
         )
-        download_urls = [await repo_info.get_raw_download_urls(file) for file in files]
+        download_urls = await repo_info.get_raw_download_urls_list(files)
         base_path = BASE_PATH / "plugins" if is_external else BASE_PATH
         base_path = base_path if module_path else base_path / repo_info.repo
         download_paths: list[Path | str] = [base_path / file for file in files]
         logger.debug(f"插件下载路径: {download_paths}", "插件管理")
-        result = await AsyncHttpx.gather_download_file(download_urls, download_paths)
+        result = await AsyncHttpx.gather_download_file(
+            download_urls, download_paths, limit_async_number=DOWNLOAD_LIMIT
+        )
         for _id, success in enumerate(result):
             if not success:
                 break
@@ -266,14 +273,16 @@ class ShopManage:
                     repo_api.get_files(f"{replace_module_path}/requirement.txt", False)
                 )
                 logger.debug(f"获取插件依赖文件列表: {req_files}", "插件管理")
-                req_download_urls = [
-                    await repo_info.get_raw_download_urls(file) for file in req_files
-                ]
+                req_download_urls = await repo_info.get_raw_download_urls_list(
+                    req_files
+                )
                 req_paths: list[Path | str] = [plugin_path / file for file in req_files]
                 logger.debug(f"插件依赖文件下载路径: {req_paths}", "插件管理")
                 if req_files:
                     result = await AsyncHttpx.gather_download_file(
-                        req_download_urls, req_paths
+                        req_download_urls,
+                        req_paths,
+                        limit_async_number=DOWNLOAD_LIMIT,
                     )
                     for success in result:
                         if not success:
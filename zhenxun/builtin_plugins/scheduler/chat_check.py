@@ -2,10 +2,9 @@ from datetime import datetime, timedelta
 
 import nonebot
 from nonebot_plugin_apscheduler import scheduler
-import pytz
 
 from zhenxun.configs.config import Config
-from zhenxun.models.chat_history import ChatHistory
+from zhenxun.models.chat_hour_count import ChatHourCount, chat_rollup
 from zhenxun.models.group_console import GroupConsole
 from zhenxun.models.task_info import TaskInfo
 from zhenxun.services.log import logger
@@ -26,7 +25,7 @@ Config.add_plugin_config(
     hour=4,
     minute=40,
 )
-async def _():
+async def check_group_active():
     if not Config.get_config("chat_history", "FLAG"):
         logger.debug("未开启历史发言记录，过滤群组发言检测...")
         return
@@ -34,35 +33,41 @@ async def _():
         logger.debug("未开启群组聊天时间检查，过滤群组发言检测...")
         return
     """检测群组发言时间并禁用全部被动"""
-    update_list = []
-    if modules := await TaskInfo.annotate().values_list("module", flat=True):
-        for bot in nonebot.get_bots().values():
+    modules = await TaskInfo.annotate().values_list("module", flat=True)
+    if not modules:
+        return
+    # 发言时间来自每小时聊天汇总表，先汇总尚未汇总的聊天记录
+    await chat_rollup.run(None)
+    inactive = (
+        await ChatHourCount.get_active_groups()
+        - await ChatHourCount.get_active_groups(datetime.now() - timedelta(days=2))
+    )
+    group_ids: set[str] = set()
+    for bot in nonebot.get_bots().values():
+        try:
             group_list, _ = await PlatformUtils.get_group_list(bot, True)
-            for group in group_list:
-                try:
-                    last_message = (
-                        await ChatHistory.filter(group_id=group.group_id)
-                        .annotate()
-                        .order_by("-create_time")
-                        .first()
-                    )
-                    if last_message:
-                        now = datetime.now(pytz.timezone("Asia/Shanghai"))
-                        if now - timedelta(days=2) > last_message.create_time:
-                            _group, _ = await GroupConsole.get_or_create(
-                                group_id=group.group_id, channel_id__isnull=True
-                            )
-                            modules = [f"<{module}" for module in modules]
-                            _group.block_task = ",".join(modules) + ","  # type: ignore
-                            update_list.append(_group)
-                            logger.info(
-                                "群组两日内未发送任何消息，关闭该群全部被动",
-                                "Chat检测",
-                                target=_group.group_id,
-                            )
-                except Exception:
-                    logger.error(
-                        "检测群组发言时间失败...", "Chat检测", target=group.group_id
-                    )
+        except Exception as e:
+            logger.error("获取群组列表失败...", "Chat检测", target=bot.self_id, e=e)
+            continue
+        group_ids.update(g.group_id for g in group_list if g.group_id in inactive)
+    if not group_ids:
+        return
+    block_task = GroupConsole.convert_module_format(modules)  # type: ignore
+    update_list = await GroupConsole.filter(
+        group_id__in=group_ids, channel_id__isnull=True
+    )
+    for group in update_list:
+        group.block_task = block_task
+    create_list = [
+        GroupConsole(group_id=group_id, block_task=block_task)
+        for group_id in group_ids - {g.group_id for g in update_list}
+    ]
     if update_list:
-        await GroupConsole.bulk_update(update_list, ["block_task"], 10)
+        await GroupConsole.bulk_update(update_list, ["block_task"], 100)
+    if create_list:
+        await GroupConsole.bulk_create(create_list, 100)
+    logger.info(
+        f"{len(group_ids)} 个群组两日内未发送任何消息，关闭该群全部被动",
+        "Chat检测",
+        target=",".join(sorted(group_ids)),
+    )
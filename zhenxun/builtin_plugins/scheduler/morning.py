@@ -1,5 +1,4 @@
 import nonebot
-from nonebot.adapters import Bot
 from nonebot.plugin import PluginMetadata
 from nonebot_plugin_apscheduler import scheduler
 
@@ -7,7 +6,6 @@ from zhenxun.configs.config import BotConfig
 from zhenxun.configs.path_config import IMAGE_PATH
 from zhenxun.configs.utils import PluginExtraData, Task
 from zhenxun.services.log import logger
-from zhenxun.utils.common_utils import CommonUtils
 from zhenxun.utils.enum import PluginType
 from zhenxun.utils.message import MessageUtils
 from zhenxun.utils.platform import broadcast_group
@@ -34,10 +32,6 @@ __plugin_meta__ = PluginMetadata(
 driver = nonebot.get_driver()
 
 
-async def check(bot: Bot, group_id: str) -> bool:
-    return not await CommonUtils.task_is_block(bot, "morning_goodnight", group_id)
-
-
 # 早上好
 @scheduler.scheduled_job(
     "cron",
@@ -46,7 +40,7 @@ async def check(bot: Bot, group_id: str) -> bool:
 )
 async def _():
     message = MessageUtils.build_message(["早上好", IMAGE_PATH / "zhenxun" / "zao.jpg"])
-    await broadcast_group(message, log_cmd="被动早晚安", check_func=check)
+    await broadcast_group(message, log_cmd="被动早晚安", task="morning_goodnight")
     logger.info("每日早安发送...")
 
 
@@ -66,6 +60,6 @@ async def _():
     await broadcast_group(
         message,
         log_cmd="被动早晚安",
-        check_func=check,
+        task="morning_goodnight",
     )
     logger.info("每日晚安发送...")
@@ -2,6 +2,7 @@ import asyncio
 from collections.abc import Callable
 from datetime import datetime, timedelta
 import inspect
+from pathlib import Path
 import time
 from types import MappingProxyType
 from typing import Any, ClassVar, Literal
@@ -13,6 +14,7 @@ from nonebot_plugin_uninfo import Uninfo
 from pydantic import BaseModel, Field, create_model
 from tortoise.expressions import Q
 
+from zhenxun.configs.config import BotConfig
 from zhenxun.models.friend_user import FriendUser
 from zhenxun.models.goods_info import GoodsInfo
 from zhenxun.models.group_member_info import GroupInfoUser
@@ -22,7 +24,10 @@ from zhenxun.models.user_props_log import UserPropsLog
 from zhenxun.services.log import logger
 from zhenxun.utils.enum import GoldHandle, PropHandle
 from zhenxun.utils.image_utils import BuildImage, ImageTemplate
+from zhenxun.utils.manager.image_cache import ImageCache
+from zhenxun.utils.manager.render_cache import RenderCache
 from zhenxun.utils.platform import PlatformUtils
+from zhenxun.utils.render_pool import RenderPool
 
 from .config import ICON_PATH, PLATFORM_PATH, base_config
 from .html_image import html_image
@@ -83,9 +88,7 @@ class ShopParam(BaseModel):
         return model_dump(self, **kwargs)
 
 
-async def gold_rank(
-    session: Uninfo, group_id: str | None, num: int
-) -> BuildImage | str:
+async def gold_rank(session: Uninfo, group_id: str | None, num: int) -> bytes | str:
     query = UserConsole
     if group_id:
         uid_list = await GroupInfoUser.filter(group_id=group_id).values_list(
@@ -115,10 +118,13 @@ async def gold_rank(
     column_name = ["排名", "-", "名称", "金币", "平台"]
     data_list = []
     platform = PlatformUtils.get_platform(session)
-    for i, user in enumerate(user_list):
-        ava_bytes = await PlatformUtils.get_user_avatar(
-            user[0], platform, session.self_id
-        )
+    avatars = await ImageCache.get_many(
+        [
+            PlatformUtils.get_user_avatar_url(user[0], platform, session.self_id)
+            for user in user_list
+        ]
+    )
+    for i, (user, ava_bytes) in enumerate(zip(user_list, avatars)):
         data_list.append(
             [
                 f"{i + 1}",
@@ -134,17 +140,40 @@ async def gold_rank(
     else:
         title = "金币全局排行"
         tip = f"你的排名在全局第 {index} 位哦!"
-    return await ImageTemplate.table_page(title, tip, column_name, data_list)
+    return await RenderPool.render(
+        ImageTemplate.table_page, title, tip, column_name, data_list
+    )
 
 
 class ShopManage:
     uuid2goods: dict[str, Goods] = {}  # noqa: RUF012
 
     @classmethod
-    async def get_shop_image(cls) -> bytes:
-        if base_config.get("style") == "zhenxun":
-            return await html_image()
-        return await normal_image()
+    async def get_shop_image(cls) -> Path:
+        """获取商店图片，商品未变化时使用缓存
+
+        返回:
+            Path: 图片路径
+        """
+        style = base_config.get("style")
+        goods_list = (
+            await GoodsInfo.filter(
+                Q(goods_limit_time__gte=time.time()) | Q(goods_limit_time=0)
+            )
+            .order_by("id")
+            .values()
+        )
+        data: dict[str, Any] = {
+            "style": style,
+            "nickname": BotConfig.self_nickname,
+            "goods": goods_list,
+        }
+        if style == "zhenxun" and any(g["goods_limit_time"] for g in goods_list):
+            # 限时商品显示剩余时间
+            data["minute"] = int(time.time() // 60)
+        return await RenderCache.get(
+            "shop", data, html_image if style == "zhenxun" else normal_image
+        )
 
     @classmethod
     def __build_params(
@@ -1,13 +1,13 @@
 from datetime import datetime
 import time
 
-from nonebot_plugin_htmlrender import template_to_pic
 from pydantic import BaseModel
 from tortoise.expressions import Q
 
 from zhenxun.configs.config import BotConfig
 from zhenxun.configs.path_config import TEMPLATE_PATH
 from zhenxun.models.goods_info import GoodsInfo
+from zhenxun.services.html_render import HtmlRender
 from zhenxun.utils._build_image import BuildImage
 
 from .config import ICON_PATH
@@ -77,7 +77,7 @@ async def html_image() -> bytes:
         GoodsItem(goods_list=value, partition=partition)
         for partition, value in partition_dict.items()
     ]
-    return await template_to_pic(
+    return await HtmlRender.template_to_pic(
         template_path=str((TEMPLATE_PATH / "shop").absolute()),
         template_name="main.html",
         templates={"name": BotConfig.self_nickname, "data_list": data_list},
@@ -85,5 +85,4 @@ async def html_image() -> bytes:
             "viewport": {"width": 850, "height": 1024},
             "base_url": f"file://{TEMPLATE_PATH}",
         },
-        wait=2,
     )
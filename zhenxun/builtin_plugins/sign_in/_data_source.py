@@ -13,8 +13,10 @@ from zhenxun.models.sign_log import SignLog
 from zhenxun.models.sign_user import SignUser
 from zhenxun.models.user_console import UserConsole
 from zhenxun.services.log import logger
-from zhenxun.utils.image_utils import BuildImage, ImageTemplate
+from zhenxun.utils.image_utils import ImageTemplate
+from zhenxun.utils.manager.image_cache import ImageCache
 from zhenxun.utils.platform import PlatformUtils
+from zhenxun.utils.render_pool import RenderPool
 
 from ._random_event import random_event
 from .utils import get_card
@@ -33,7 +35,7 @@ class SignManage:
     @classmethod
     async def rank(
         cls, session: Uninfo, num: int, group_id: str | None = None
-    ) -> BuildImage | str:  # sourcery skip: avoid-builtin-shadow
+    ) -> bytes | str:  # sourcery skip: avoid-builtin-shadow
         """好感度排行
 
         参数:
@@ -42,7 +44,7 @@ class SignManage:
             group_id: 群组id
 
         返回:
-            BuildImage: 构造图片
+            bytes: 构造图片
         """
         query = SignUser
         if group_id:
@@ -77,10 +79,13 @@ class SignManage:
                 uid2name[g[0]] = g[1]
         data_list = []
         platform = PlatformUtils.get_platform(session)
-        for i, user in enumerate(user_list):
-            bytes = await PlatformUtils.get_user_avatar(
-                user[0], platform, session.self_id
-            )
+        avatars = await ImageCache.get_many(
+            [
+                PlatformUtils.get_user_avatar_url(user[0], platform, session.self_id)
+                for user in user_list
+            ]
+        )
+        for i, (user, bytes) in enumerate(zip(user_list, avatars)):
             data_list.append(
                 [
                     f"{i + 1}",
@@ -97,7 +102,9 @@ class SignManage:
         else:
             title = "好感度全局排行"
             tip = f"你的排名在全局第 {index} 位哦!"
-        return await ImageTemplate.table_page(title, tip, column_name, data_list)
+        return await RenderPool.render(
+            ImageTemplate.table_page, title, tip, column_name, data_list
+        )
 
     @classmethod
     async def sign(
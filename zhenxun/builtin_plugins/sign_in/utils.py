@@ -3,10 +3,10 @@ from io import BytesIO
 import os
 from pathlib import Path
 import random
+from typing import Any
 
 import nonebot
 from nonebot.drivers import Driver
-from nonebot_plugin_htmlrender import template_to_pic
 from nonebot_plugin_uninfo import Uninfo
 import pytz
 
@@ -14,8 +14,9 @@ from zhenxun.configs.config import BotConfig, Config
 from zhenxun.configs.path_config import IMAGE_PATH, TEMPLATE_PATH
 from zhenxun.models.sign_log import SignLog
 from zhenxun.models.sign_user import SignUser
-from zhenxun.utils.http_utils import AsyncHttpx
+from zhenxun.services.html_render import HtmlRender
 from zhenxun.utils.image_utils import BuildImage
+from zhenxun.utils.manager.image_cache import ImageCache
 from zhenxun.utils.platform import PlatformUtils
 
 from .config import (
@@ -134,6 +135,71 @@ async def _generate_card(
         is_double: 是否触发双倍.
         is_card_view: 是否展示好感度卡片.
 
+    返回:
+        Path: 卡片路径
+    """
+    avatar = await ImageCache.get(session.user.avatar) if session.user.avatar else None
+    user_console = await user.user_console
+    if user_console and user_console.uid is not None:
+        uid = f"{user_console.uid}".rjust(12, "0")
+        uid = f"{uid[:4]} {uid[4:8]} {uid[8:]}"
+    else:
+        uid = "XXXX XXXX XXXX"
+    view_data = None
+    if is_card_view:
+        value_list = (
+            await SignUser.annotate()
+            .order_by("-impression")
+            .values_list("user_id", flat=True)
+        )
+        index = value_list.index(user.user_id) + 1  # type: ignore
+        last_log = (
+            await SignLog.filter(user_id=user.user_id).order_by("create_time").first()
+        )
+        last_date = "从未"
+        if last_log:
+            last_date = last_log.create_time.astimezone(
+                pytz.timezone("Asia/Shanghai")
+            ).date()
+        view_data = (index, last_date)
+    return await BuildImage.compose(
+        _draw_card,
+        user,
+        nickname,
+        avatar,
+        uid,
+        add_impression,
+        gold,
+        gift,
+        is_double,
+        view_data,
+    )
+
+
+async def _draw_card(
+    user: SignUser,
+    nickname: str,
+    avatar: bytes | None,
+    uid: str,
+    add_impression: float,
+    gold: int | None,
+    gift: str,
+    is_double: bool,
+    view_data: tuple[int, Any] | None,
+) -> Path:
+    """绘制签到卡片，由 BuildImage.compose 在一个线程中执行
+
+    参数:
+        user: SignUser
+        nickname: 用户昵称
+        avatar: 头像
+        uid: 格式化后的uid
+        add_impression: 新增的好感度
+        gold: 金币
+        gift: 礼物
+        is_double: 是否触发双倍
+        view_data: 展示好感度卡片时为 (好感度排名, 上次签到日期)
+
     返回:
         Path: 卡片路径
     """
@@ -143,10 +209,8 @@ async def _generate_card(
         140,
         background=SIGN_BORDER_PATH / "ava_border_01.png",
     )
-    if session.user.avatar and (
-        byt := await AsyncHttpx.get_content(session.user.avatar)
-    ):
-        ava = BuildImage(107, 107, background=BytesIO(byt))
+    if avatar:
+        ava = BuildImage(107, 107, background=BytesIO(avatar))
     else:
         ava = BuildImage(107, 107, (0, 0, 0))
     await ava.circle()
@@ -195,12 +259,6 @@ async def _generate_card(
     nickname_img = await BuildImage.build_text_image(
         nickname, size=50, font_color=(255, 255, 255)
     )
-    user_console = await user.user_console
-    if user_console and user_console.uid is not None:
-        uid = f"{user_console.uid}".rjust(12, "0")
-        uid = f"{uid[:4]} {uid[4:8]} {uid[8:]}"
-    else:
-        uid = "XXXX XXXX XXXX"
     uid_img = await BuildImage.build_text_image(
         f"UID: {uid}", size=30, font_color=(255, 255, 255)
     )
@@ -226,26 +284,13 @@ async def _generate_card(
         font_color=(155, 155, 155),
     )
     today_data = BuildImage(300, 300, color=(255, 255, 255, 0), font_size=20)
-    if is_card_view:
+    if view_data:
+        index, last_date = view_data
         today_sign_text_img = await BuildImage.build_text_image("", size=30)
-        value_list = (
-            await SignUser.annotate()
-            .order_by("-impression")
-            .values_list("user_id", flat=True)
-        )
-        index = value_list.index(user.user_id) + 1  # type: ignore
         rank_img = await BuildImage.build_text_image(
             f"* 好感度排名第 {index} 位", size=30
         )
         await A.paste(rank_img, ((A.width - rank_img.width - 32), 20))
-        last_log = (
-            await SignLog.filter(user_id=user.user_id).order_by("create_time").first()
-        )
-        last_date = "从未"
-        if last_log:
-            last_date = last_log.create_time.astimezone(
-                pytz.timezone("Asia/Shanghai")
-            ).date()
         await today_data.text(
             (0, 0),
             f"上次签到日期：{last_date}",
@@ -312,19 +357,7 @@ async def generate_progress_bar_pic():
     img_y = BuildImage(50, 50, color=bg_1)
     await img_y.circle()
     await img_y.crop((0, 0, 25, 50))
-    A = BuildImage(950, 50)
-    width, height = A.size
-
-    step_r = (bg_2[0] - bg_1[0]) / width
-    step_g = (bg_2[1] - bg_1[1]) / width
-    step_b = (bg_2[2] - bg_1[2]) / width
-
-    for y in range(width):
-        bg_r = round(bg_1[0] + step_r * y)
-        bg_g = round(bg_1[1] + step_g * y)
-        bg_b = round(bg_1[2] + step_b * y)
-        for x in range(height):
-            await A.point((y, x), fill=(bg_r, bg_g, bg_b))
+    A = BuildImage.linear_gradient(950, 50, bg_1, bg_2)
     await bk.paste(img_y, (0, 0))
     await bk.paste(A, (25, 0))
     await bk.paste(img_x, (975, 0))
@@ -465,7 +498,7 @@ async def _generate_html_card(
         data["impression"] = f"好感度排名第 {index} 位"
         data["gold"] = f"总金币：{gold}"
         data["gift"] = ""
-    pic = await template_to_pic(
+    pic = await HtmlRender.template_to_pic(
         template_path=str((TEMPLATE_PATH / "sign").absolute()),
         template_name="main.html",
         templates={"data": data},
@@ -473,7 +506,6 @@ async def _generate_html_card(
             "viewport": {"width": 465, "height": 926},
             "base_url": f"file://{TEMPLATE_PATH}",
         },
-        wait=2,
     )
     image = BuildImage.open(pic)
     date = now.date()
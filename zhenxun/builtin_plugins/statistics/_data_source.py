@@ -1,11 +1,12 @@
 from datetime import datetime, timedelta
 
-from tortoise.functions import Count
+from tortoise.functions import Sum
 
 from zhenxun.models.group_console import GroupConsole
 from zhenxun.models.group_member_info import GroupInfoUser
 from zhenxun.models.plugin_info import PluginInfo
-from zhenxun.models.statistics import Statistics
+from zhenxun.models.statistics_hour_count import StatisticsHourCount
+from zhenxun.services.rollup import floor_hour
 from zhenxun.utils.echart_utils import ChartUtils
 from zhenxun.utils.echart_utils.models import Barh
 from zhenxun.utils.enum import PluginType
@@ -64,14 +65,14 @@ class StatisticsManage:
     async def get_global_statistics(
         cls, plugin_name: str | None, day: int | None, title: str
     ) -> BuildImage | str:
-        query = Statistics
+        query = StatisticsHourCount
         if plugin_name:
             query = query.filter(plugin_name=plugin_name)
         if day:
             time = datetime.now() - timedelta(days=day)
-            query = query.filter(create_time__gte=time)
+            query = query.filter(hour__gte=floor_hour(time))
         data_list = (
-            await query.annotate(count=Count("id"))
+            await query.annotate(count=Sum("num"))
             .group_by("plugin_name")
             .values_list("plugin_name", "count")
         )
@@ -85,14 +86,14 @@ class StatisticsManage:
     async def get_my_statistics(
         cls, user_id: str, group_id: str | None, day: int | None, title: str
     ):
-        query = Statistics.filter(user_id=user_id)
+        query = StatisticsHourCount.filter(user_id=user_id)
         if group_id:
             query = query.filter(group_id=group_id)
         if day:
             time = datetime.now() - timedelta(days=day)
-            query = query.filter(create_time__gte=time)
+            query = query.filter(hour__gte=floor_hour(time))
         data_list = (
-            await query.annotate(count=Count("id"))
+            await query.annotate(count=Sum("num"))
             .group_by("plugin_name")
             .values_list("plugin_name", "count")
         )
@@ -104,12 +105,12 @@ class StatisticsManage:
 
     @classmethod
     async def get_group_statistics(cls, group_id: str, day: int | None, title: str):
-        query = Statistics.filter(group_id=group_id)
+        query = StatisticsHourCount.filter(group_id=group_id)
         if day:
             time = datetime.now() - timedelta(days=day)
-            query = query.filter(create_time__gte=time)
+            query = query.filter(hour__gte=floor_hour(time))
         data_list = (
-            await query.annotate(count=Count("id"))
+            await query.annotate(count=Sum("num"))
             .group_by("plugin_name")
             .values_list("plugin_name", "count")
         )
@@ -121,7 +122,7 @@ class StatisticsManage:
 
     @classmethod
     async def __build_image(cls, data_list: list[tuple[str, int]], title: str):
-        module2count = {x[0]: x[1] for x in data_list}
+        module2count = {x[0]: int(x[1]) for x in data_list}
         plugin_info = await PluginInfo.filter(
             module__in=module2count.keys(),
             load_status=True,
@@ -1,15 +1,10 @@
-import asyncio
-import random
-
 from nonebot.adapters import Bot
 import nonebot_plugin_alconna as alc
 from nonebot_plugin_alconna import Image, UniMsg
 from nonebot_plugin_session import EventSession
 
-from zhenxun.services.log import logger
-from zhenxun.utils.common_utils import CommonUtils
 from zhenxun.utils.message import MessageUtils
-from zhenxun.utils.platform import PlatformUtils
+from zhenxun.utils.platform import Broadcaster
 
 
 class BroadcastManage:
@@ -33,40 +28,10 @@ class BroadcastManage:
                 message_list.append(Image(url=msg.url))
             elif isinstance(msg, alc.Text):
                 message_list.append(msg.text)
-        group_list, _ = await PlatformUtils.get_group_list(bot)
-        if group_list:
-            error_count = 0
-            for group in group_list:
-                try:
-                    if not await CommonUtils.task_is_block(
-                        bot,
-                        "broadcast",  # group.channel_id
-                        group.group_id,
-                    ):
-                        target = PlatformUtils.get_target(
-                            group_id=group.group_id, channel_id=group.channel_id
-                        )
-                        if target:
-                            await MessageUtils.build_message(message_list).send(
-                                target, bot
-                            )
-                            logger.debug(
-                                "发送成功",
-                                "广播",
-                                session=session,
-                                target=f"{group.group_id}:{group.channel_id}",
-                            )
-                            await asyncio.sleep(random.randint(1, 3))
-                        else:
-                            logger.warning("target为空", "广播", session=session)
-                except Exception as e:
-                    error_count += 1
-                    logger.error(
-                        "发送失败",
-                        "广播",
-                        session=session,
-                        target=f"{group.group_id}:{group.channel_id}",
-                        e=e,
-                    )
-            return len(group_list) - error_count, error_count
-        return 0, 0
+        result = await Broadcaster.broadcast(
+            MessageUtils.build_message(message_list),
+            [bot],
+            task="broadcast",
+            log_cmd="广播",
+        )
+        return len(result.success), len(result.failed)
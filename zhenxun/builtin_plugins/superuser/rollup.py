@@ -0,0 +1,78 @@
+import asyncio
+
+import nonebot
+from nonebot.permission import SUPERUSER
+from nonebot.plugin import PluginMetadata
+from nonebot.rule import to_me
+from nonebot_plugin_alconna import Alconna, on_alconna
+from nonebot_plugin_apscheduler import scheduler
+from nonebot_plugin_session import EventSession
+
+from zhenxun.configs.utils import PluginExtraData
+from zhenxun.models.chat_hour_count import chat_rollup
+from zhenxun.models.statistics_hour_count import statistics_rollup
+from zhenxun.services.log import logger
+from zhenxun.services.rollup import HourRollup
+from zhenxun.utils.enum import PluginType
+from zhenxun.utils.message import MessageUtils
+
+driver = nonebot.get_driver()
+
+__plugin_meta__ = PluginMetadata(
+    name="重建统计数据",
+    description="根据消息记录与功能调用记录重新生成按小时汇总的统计数据",
+    usage="""
+    重建统计数据
+    """.strip(),
+    extra=PluginExtraData(
+        author="HibiKier",
+        version="0.1",
+        plugin_type=PluginType.SUPERUSER,
+    ).to_dict(),
+)
+
+
+_matcher = on_alconna(
+    Alconna("重建统计数据"),
+    rule=to_me(),
+    permission=SUPERUSER,
+    priority=5,
+    block=True,
+)
+
+
+@_matcher.handle()
+async def _(session: EventSession):
+    await MessageUtils.build_message("开始重建统计数据...").send()
+    result = []
+    for rollup in (chat_rollup, statistics_rollup):
+        count = await rollup.rebuild()
+        result.append(f"{rollup.name}: {count} 条")
+    await MessageUtils.build_message("统计数据重建完成\n" + "\n".join(result)).send()
+    logger.info(f"重建统计数据完成 {', '.join(result)}", session=session)
+
+
+@scheduler.scheduled_job(
+    "interval",
+    minutes=5,
+)
+async def run_rollup():
+    """每次最多汇总 max_rows 条，升级后的历史数据由定时任务分多次汇总"""
+    result = await HourRollup.run_all()
+    if any(result.values()):
+        logger.info(
+            "汇总统计数据完成 "
+            + ", ".join(f"{name}: {count} 条" for name, count in result.items()),
+            "HourRollup",
+        )
+
+
+_startup_tasks: set[asyncio.Task] = set()
+
+
+@driver.on_startup
+async def _():
+    # 不等待汇总完成，避免阻塞启动
+    task = asyncio.create_task(run_rollup())
+    _startup_tasks.add(task)
+    task.add_done_callback(_startup_tasks.discard)
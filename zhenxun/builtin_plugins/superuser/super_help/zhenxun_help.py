@@ -1,8 +1,7 @@
-from nonebot_plugin_htmlrender import template_to_pic
-
 from zhenxun.configs.config import BotConfig
 from zhenxun.configs.path_config import TEMPLATE_PATH
 from zhenxun.models.task_info import TaskInfo
+from zhenxun.services.html_render import HtmlRender
 from zhenxun.utils._build_image import BuildImage
 
 from .config import SUPERUSER_HELP_IMAGE
@@ -39,7 +38,7 @@ async def build_html_help():
     if task := await get_task():
         plugin_list.append(task)
     plugin_list.sort(key=lambda p: len(p["description"]) + len(p["usage"]))
-    pic = await template_to_pic(
+    pic = await HtmlRender.template_to_pic(
         template_path=str((TEMPLATE_PATH / "help").absolute()),
         template_name="main.html",
         templates={
@@ -53,7 +52,6 @@ async def build_html_help():
             "viewport": {"width": 1024, "height": 1024},
             "base_url": f"file://{TEMPLATE_PATH}",
         },
-        wait=2,
     )
     result = await BuildImage.open(pic).resize(0.5)
     await result.save(SUPERUSER_HELP_IMAGE)
@@ -5,14 +5,14 @@ import time
 import nonebot
 from nonebot.adapters import Bot
 from nonebot.drivers import Driver
-from tortoise.expressions import RawSQL
-from tortoise.functions import Count
+from tortoise.functions import Sum
 
 from zhenxun.configs.config import BotConfig
 from zhenxun.models.bot_connect_log import BotConnectLog
-from zhenxun.models.chat_history import ChatHistory
-from zhenxun.models.statistics import Statistics
+from zhenxun.models.chat_hour_count import ChatHourCount
+from zhenxun.models.statistics_hour_count import StatisticsHourCount
 from zhenxun.services.log import logger
+from zhenxun.services.rollup import floor_hour, sum_num
 from zhenxun.utils.platform import PlatformUtils
 
 from ....base_model import BaseResultModel, QueryModel
@@ -76,14 +76,13 @@ class ApiDataSource:
             logger.warning("获取bot好友/群组信息失败...", "WebUi", e=e)
             bot_info.group_count = 0
             bot_info.friend_count = 0
-        bot_info.day_call = await Statistics.filter(
-            create_time__gte=now - timedelta(hours=now.hour, minutes=now.minute),
-            bot_id=bot.self_id,
-        ).count()
-        bot_info.received_messages = await ChatHistory.filter(
-            bot_id=bot_info.self_id,
-            create_time__gte=now - timedelta(hours=now.hour, minutes=now.minute),
-        ).count()
+        today = floor_hour(now - timedelta(hours=now.hour))
+        bot_info.day_call = await sum_num(
+            StatisticsHourCount.filter(hour__gte=today, bot_id=bot.self_id)
+        )
+        bot_info.received_messages = await sum_num(
+            ChatHourCount.filter(hour__gte=today, bot_id=bot_info.self_id)
+        )
         bot_info.connect_time = bot_live.get(bot.self_id) or 0
         if bot_info.connect_time:
             connect_date = datetime.fromtimestamp(CONNECT_TIME)
@@ -113,20 +112,17 @@ class ApiDataSource:
             QueryChatCallCount: 数据内容
         """
         now = datetime.now()
-        query = ChatHistory
+        today = floor_hour(now - timedelta(hours=now.hour))
+        query = ChatHourCount.all()
         if bot_id:
             query = query.filter(bot_id=bot_id)
-        chat_all_count = await query.annotate().count()
-        chat_day_count = await query.filter(
-            create_time__gte=now - timedelta(hours=now.hour, minutes=now.minute)
-        ).count()
-        query = Statistics
+        chat_all_count = await sum_num(query)
+        chat_day_count = await sum_num(query.filter(hour__gte=today))
+        query = StatisticsHourCount.all()
         if bot_id:
             query = query.filter(bot_id=bot_id)
-        call_all_count = await query.annotate().count()
-        call_day_count = await query.filter(
-            create_time__gte=now - timedelta(hours=now.hour, minutes=now.minute)
-        ).count()
+        call_all_count = await sum_num(query)
+        call_day_count = await sum_num(query.filter(hour__gte=today))
         return QueryChatCallCount(
             chat_num=chat_all_count,
             chat_day=chat_day_count,
@@ -146,35 +142,23 @@ class ApiDataSource:
         返回:
             AllChatAndCallCount: 数据内容
         """
-        now = datetime.now()
-        query = ChatHistory
+        today = floor_hour(datetime.now())
+        today -= timedelta(hours=today.hour)
+        week = today - timedelta(days=7)
+        month = today - timedelta(days=30)
+        year = today - timedelta(days=365)
+        query = ChatHourCount.all()
         if bot_id:
             query = query.filter(bot_id=bot_id)
-        chat_week_count = await query.filter(
-            create_time__gte=now - timedelta(days=7, hours=now.hour, minutes=now.minute)
-        ).count()
-        chat_month_count = await query.filter(
-            create_time__gte=now
-            - timedelta(days=30, hours=now.hour, minutes=now.minute)
-        ).count()
-        chat_year_count = await query.filter(
-            create_time__gte=now
-            - timedelta(days=365, hours=now.hour, minutes=now.minute)
-        ).count()
-        query = Statistics
+        chat_week_count = await sum_num(query.filter(hour__gte=week))
+        chat_month_count = await sum_num(query.filter(hour__gte=month))
+        chat_year_count = await sum_num(query.filter(hour__gte=year))
+        query = StatisticsHourCount.all()
         if bot_id:
             query = query.filter(bot_id=bot_id)
-        call_week_count = await query.filter(
-            create_time__gte=now - timedelta(days=7, hours=now.hour, minutes=now.minute)
-        ).count()
-        call_month_count = await query.filter(
-            create_time__gte=now
-            - timedelta(days=30, hours=now.hour, minutes=now.minute)
-        ).count()
-        call_year_count = await query.filter(
-            create_time__gte=now
-            - timedelta(days=365, hours=now.hour, minutes=now.minute)
-        ).count()
+        call_week_count = await sum_num(query.filter(hour__gte=week))
+        call_month_count = await sum_num(query.filter(hour__gte=month))
+        call_year_count = await sum_num(query.filter(hour__gte=year))
         return AllChatAndCallCount(
             chat_week=chat_week_count,
             chat_month=chat_month_count,
@@ -195,29 +179,17 @@ class ApiDataSource:
             ChatCallMonthCount: 数据内容
         """
         now = datetime.now()
-        filter_date = now - timedelta(days=30, hours=now.hour, minutes=now.minute)
-        chat_query = ChatHistory
-        call_query = Statistics
+        filter_date = floor_hour(now - timedelta(days=30, hours=now.hour))
+        chat_query = ChatHourCount.filter(hour__gte=filter_date)
+        call_query = StatisticsHourCount.filter(hour__gte=filter_date)
         if bot_id:
             chat_query = chat_query.filter(bot_id=bot_id)
             call_query = call_query.filter(bot_id=bot_id)
-        chat_date_list = (
-            await chat_query.filter(create_time__gte=filter_date)
-            .annotate(date=RawSQL("DATE(create_time)"), count=Count("id"))
-            .group_by("date")
-            .values("date", "count")
-        )
-        call_date_list = (
-            await call_query.filter(create_time__gte=filter_date)
-            .annotate(date=RawSQL("DATE(create_time)"), count=Count("id"))
-            .group_by("date")
-            .values("date", "count")
-        )
         date_list = []
         chat_count_list = []
         call_count_list = []
-        chat_date2cnt = {str(date["date"]): date["count"] for date in chat_date_list}
-        call_date2cnt = {str(date["date"]): date["count"] for date in call_date_list}
+        chat_date2cnt = await cls.__count_by_date(chat_query)
+        call_date2cnt = await cls.__count_by_date(call_query)
         date = now.date()
         for _ in range(30):
             if str(date) in chat_date2cnt:
@@ -237,6 +209,26 @@ class ApiDataSource:
             chat=chat_count_list, call=call_count_list, date=date_list
         )
 
+    @classmethod
+    async def __count_by_date(cls, query) -> dict[str, int]:
+        """按日期统计汇总表数据条数
+
+        参数:
+            query: 汇总表查询
+
+        返回:
+            dict[str, int]: 日期: 数据条数
+        """
+        date2cnt: dict[str, int] = {}
+        for hour, count in (
+            await query.annotate(count=Sum("num"))
+            .group_by("hour")
+            .values_list("hour", "count")
+        ):
+            date = str(hour.date())
+            date2cnt[date] = date2cnt.get(date, 0) + int(count)
+        return date2cnt
+
     @classmethod
     async def get_connect_log(cls, query: QueryModel) -> BaseResultModel:
         """获取bot连接日志
@@ -5,16 +5,17 @@ import time
 import nonebot
 from nonebot.adapters import Bot
 from nonebot.drivers import Driver
-from tortoise.functions import Count
+from tortoise.functions import Sum
 
 from zhenxun.models.bot_connect_log import BotConnectLog
 from zhenxun.models.bot_console import BotConsole
-from zhenxun.models.chat_history import ChatHistory
+from zhenxun.models.chat_hour_count import ChatHourCount
 from zhenxun.models.group_console import GroupConsole
 from zhenxun.models.plugin_info import PluginInfo
-from zhenxun.models.statistics import Statistics
+from zhenxun.models.statistics_hour_count import StatisticsHourCount
 from zhenxun.models.task_info import TaskInfo
 from zhenxun.services.log import logger
+from zhenxun.services.rollup import floor_hour, sum_num
 from zhenxun.utils.common_utils import CommonUtils
 from zhenxun.utils.enum import PluginType
 from zhenxun.utils.platform import PlatformUtils
@@ -105,10 +106,10 @@ class ApiDataSource:
         """
         now = datetime.now()
         # 今日累计接收消息
-        select_bot.received_messages = await ChatHistory.filter(
-            bot_id=select_bot.self_id,
-            create_time__gte=now - timedelta(hours=now.hour),
-        ).count()
+        today = floor_hour(now - timedelta(hours=now.hour))
+        select_bot.received_messages = await sum_num(
+            ChatHourCount.filter(bot_id=select_bot.self_id, hour__gte=today)
+        )
         # 群聊数量
         try:
             select_bot.group_count = len(
@@ -129,9 +130,7 @@ class ApiDataSource:
             connect_date = datetime.fromtimestamp(select_bot.connect_time)
             select_bot.connect_date = connect_date.strftime("%Y-%m-%d %H:%M:%S")
         select_bot.version = cls.__get_bot_version()
-        day_call = await Statistics.filter(
-            create_time__gte=now - timedelta(hours=now.hour)
-        ).count()
+        day_call = await sum_num(StatisticsHourCount.filter(hour__gte=today))
         select_bot.day_call = day_call
         select_bot.connect_count = await BotConnectLog.filter(
             bot_id=select_bot.self_id
@@ -173,25 +172,16 @@ class ApiDataSource:
         返回:
             QueryCount: 数据内容
         """
-        now = datetime.now()
-        query = ChatHistory
+        today = floor_hour(datetime.now())
+        today -= timedelta(hours=today.hour)
+        query = ChatHourCount.all()
         if bot_id:
             query = query.filter(bot_id=bot_id)
-        all_count = await query.annotate().count()
-        day_count = await query.filter(
-            create_time__gte=now - timedelta(hours=now.hour, minutes=now.minute)
-        ).count()
-        week_count = await query.filter(
-            create_time__gte=now - timedelta(days=7, hours=now.hour, minutes=now.minute)
-        ).count()
-        month_count = await query.filter(
-            create_time__gte=now
-            - timedelta(days=30, hours=now.hour, minutes=now.minute)
-        ).count()
-        year_count = await query.filter(
-            create_time__gte=now
-            - timedelta(days=365, hours=now.hour, minutes=now.minute)
-        ).count()
+        all_count = await sum_num(query)
+        day_count = await sum_num(query.filter(hour__gte=today))
+        week_count = await sum_num(query.filter(hour__gte=today - timedelta(days=7)))
+        month_count = await sum_num(query.filter(hour__gte=today - timedelta(days=30)))
+        year_count = await sum_num(query.filter(hour__gte=today - timedelta(days=365)))
         return QueryCount(
             num=all_count,
             day=day_count,
@@ -210,25 +200,16 @@ class ApiDataSource:
         返回:
             QueryCount: 数据内容
         """
-        now = datetime.now()
-        query = Statistics
+        today = floor_hour(datetime.now())
+        today -= timedelta(hours=today.hour)
+        query = StatisticsHourCount.all()
         if bot_id:
             query = query.filter(bot_id=bot_id)
-        all_count = await query.annotate().count()
-        day_count = await query.filter(
-            create_time__gte=now - timedelta(hours=now.hour, minutes=now.minute)
-        ).count()
-        week_count = await query.filter(
-            create_time__gte=now - timedelta(days=7, hours=now.hour, minutes=now.minute)
-        ).count()
-        month_count = await query.filter(
-            create_time__gte=now
-            - timedelta(days=30, hours=now.hour, minutes=now.minute)
-        ).count()
-        year_count = await query.filter(
-            create_time__gte=now
-            - timedelta(days=365, hours=now.hour, minutes=now.minute)
-        ).count()
+        all_count = await sum_num(query)
+        day_count = await sum_num(query.filter(hour__gte=today))
+        week_count = await sum_num(query.filter(hour__gte=today - timedelta(days=7)))
+        month_count = await sum_num(query.filter(hour__gte=today - timedelta(days=30)))
+        year_count = await sum_num(query.filter(hour__gte=today - timedelta(days=365)))
         return QueryCount(
             num=all_count,
             day=day_count,
@@ -240,46 +221,30 @@ class ApiDataSource:
     @classmethod
     def __get_query(
         cls,
-        base_query: type[ChatHistory | Statistics],
+        base_query: type[ChatHourCount | StatisticsHourCount],
         date_type: QueryDateType | None = None,
         bot_id: str | None = None,
     ):
         """构建日期查询条件
 
         参数:
+            base_query: 汇总表.
             date_type: 日期类型.
             bot_id: bot id.
         """
-        query = base_query
-        now = datetime.now()
+        query = base_query.all()
+        today = floor_hour(datetime.now())
+        today -= timedelta(hours=today.hour)
         if bot_id:
             query = query.filter(bot_id=bot_id)
         if date_type == QueryDateType.DAY:
-            query = query.filter(
-                create_time__gte=now
-                - timedelta(hours=now.hour, minutes=now.minute, seconds=now.second)
-            )
+            query = query.filter(hour__gte=today)
         if date_type == QueryDateType.WEEK:
-            query = query.filter(
-                create_time__gte=now
-                - timedelta(
-                    days=7, hours=now.hour, minutes=now.minute, seconds=now.second
-                )
-            )
+            query = query.filter(hour__gte=today - timedelta(days=7))
         if date_type == QueryDateType.MONTH:
-            query = query.filter(
-                create_time__gte=now
-                - timedelta(
-                    days=30, hours=now.hour, minutes=now.minute, seconds=now.second
-                )
-            )
+            query = query.filter(hour__gte=today - timedelta(days=30))
         if date_type == QueryDateType.YEAR:
-            query = query.filter(
-                create_time__gte=now
-                - timedelta(
-                    days=365, hours=now.hour, minutes=now.minute, seconds=now.second
-                )
-            )
+            query = query.filter(hour__gte=today - timedelta(days=365))
         return query
 
     @classmethod
@@ -295,10 +260,10 @@ class ApiDataSource:
         返回:
             list[ActiveGroup]: 活跃群组列表
         """
-        query = cls.__get_query(ChatHistory, date_type, bot_id)
+        query = cls.__get_query(ChatHourCount, date_type, bot_id)
         data_list = (
-            await query.annotate(count=Count("id"))
-            .filter(group_id__not_isnull=True)
+            await query.annotate(count=Sum("num"))
+            .exclude(group_id="")
             .group_by("group_id")
             .order_by("-count")
             .limit(5)
@@ -315,7 +280,7 @@ class ApiDataSource:
             ActiveGroup(
                 group_id=data[0],
                 name=id2name.get(data[0]) or data[0],
-                chat_num=data[1],
+                chat_num=int(data[1]),
                 ava_img=GROUP_AVA_URL.format(data[0], data[0]),
             )
             for data in data_list
@@ -340,9 +305,9 @@ class ApiDataSource:
         返回:
             list[HotPlugin]: 热门插件列表
         """
-        query = cls.__get_query(Statistics, date_type, bot_id)
+        query = cls.__get_query(StatisticsHourCount, date_type, bot_id)
         data_list = (
-            await query.annotate(count=Count("id"))
+            await query.annotate(count=Sum("num"))
             .group_by("plugin_name")
             .order_by("-count")
             .limit(5)
@@ -355,7 +320,9 @@ class ApiDataSource:
         for data in data_list:
             module = data[0]
             name = module2name.get(module) or module
-            hot_plugin_list.append(HotPlugin(module=module, name=name, count=data[1]))
+            hot_plugin_list.append(
+                HotPlugin(module=module, name=name, count=int(data[1]))
+            )
         hot_plugin_list = sorted(hot_plugin_list, key=lambda x: x.count, reverse=True)
         if len(hot_plugin_list) > 5:
             hot_plugin_list = hot_plugin_list[:5]
@@ -19,6 +19,18 @@ class BotSetting(BaseModel):
     """平台超级用户"""
     qbot_id_data: dict[str, str] = Field(default_factory=dict)
     """官bot id:账号id"""
+    http_max_connections: int = 100
+    """http连接池最大连接数"""
+    http_max_keepalive: int = 20
+    """http连接池最大保持连接数"""
+    http_keepalive_expiry: float = 30
+    """http空闲连接保持时间（秒）"""
+    http_host_limit: int = 10
+    """单个域名最大同时请求数"""
+    http2: bool = True
+    """安装h2时是否启用HTTP/2"""
+    render_processes: int = 0
+    """图片渲染进程数，为0时在线程中渲染"""
 
     def get_qbot_uid(self, qbot_id: str) -> str | None:
         """获取官bot账号id
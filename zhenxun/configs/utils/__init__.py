@@ -1,4 +1,5 @@
 from collections.abc import Callable
+import contextlib
 import copy
 from datetime import datetime
 from pathlib import Path
@@ -138,6 +139,8 @@ class PluginCdBlock(BaseBlock):
 
     cd: int = 5
     """cd"""
+    burst: int = 1
+    """cd内允许连续调用的次数"""
     _type: PluginLimitType = PluginLimitType.CD
     """类型"""
 
@@ -149,6 +152,8 @@ class PluginCountBlock(BaseBlock):
 
     max_count: int
     """最大调用次数"""
+    period: int | None = None
+    """限制时间段（秒），任意 period 秒内最多调用 max_count 次，为空时每日刷新"""
     _type: PluginLimitType = PluginLimitType.COUNT
     """类型"""
 
@@ -294,6 +299,9 @@ class NoSuchConfig(Exception):
     pass
 
 
+_MISSING = object()
+
+
 class ConfigsManager:
     """
     插件配置 与 资源 管理器
@@ -304,6 +312,10 @@ class ConfigsManager:
         self._simple_data: dict = {}
         self._simple_file = DATA_PATH / "config.yaml"
         self.add_module = []
+        self._value_cache: dict[tuple[str, str], Any] = {}
+        """(module, key): 转换类型后的配置值"""
+        self._subscribers: dict[tuple[str, str], list[Callable[[Any], Any]]] = {}
+        """(module, key): 配置值变更回调"""
         _yaml = YAML()
         if file:
             file.parent.mkdir(exist_ok=True, parents=True)
@@ -384,6 +396,7 @@ class ConfigsManager:
                 default_value=default_value,
                 type=type,
             )
+        self._refresh(module, key.upper())
 
     def set_config(
         self,
@@ -407,6 +420,7 @@ class ConfigsManager:
             else:
                 self.add_plugin_config(module, key, value)
             self._simple_data[module][key] = value
+            self._refresh(module, key)
             if auto_save:
                 self.save(save_simple_data=True)
 
@@ -424,15 +438,33 @@ class ConfigsManager:
         返回:
             Any: 配置值
         """
-        logger.debug(
-            f"尝试获取配置MODULE: [<u><y>{module}</y></u>] | KEY: [<u><y>{key}</y></u>]"
-        )
         key = key.upper()
+        value = self._value_cache.get((module, key), _MISSING)
+        if value is _MISSING:
+            value = self._value_cache[(module, key)] = self._structure(module, key)
+        if value is None:
+            return default
+        # 可变的值返回副本，防止调用方修改缓存
+        if isinstance(value, list | dict | set):
+            return copy.deepcopy(value)
+        return value
+
+    def _structure(self, module: str, key: str) -> Any:
+        """将配置值转换为配置类型
+
+        参数:
+            module: 模块名
+            key: 配置键
+
+        异常:
+            NoSuchConfig: 未查询到配置
+
+        返回:
+            Any: 配置值
+        """
         value = None
         if module in self._data.keys():
-            config = self._data[module].configs.get(key) or self._data[
-                module
-            ].configs.get(key)
+            config = self._data[module].configs.get(key)
             if not config:
                 raise NoSuchConfig(
                     f"未查询到配置项 MODULE: [ {module} ] | KEY: [ {key} ]"
@@ -441,7 +473,6 @@ class ConfigsManager:
                 if config.arg_parser:
                     value = config.arg_parser(value or config.default_value)
                 elif config.value is not None:
-                    # try:
                     value = (
                         cattrs.structure(config.value, config.type)
                         if config.type
@@ -460,14 +491,73 @@ class ConfigsManager:
                     e=e,
                 )
                 value = config.value or config.default_value
-        if value is None:
-            value = default
         logger.debug(
-            f"获取配置 MODULE: [<u><y>{module}</y></u>] | "
-            f" KEY: [<u><y>{key}</y></u>] -> [<u><c>{value}</c></u>]"
+            "获取配置 MODULE: [<u><y>%s</y></u>] |  KEY: [<u><y>%s</y></u>] -> "
+            "[<u><c>%s</c></u>]",
+            args=(module, key, value),
         )
         return value
 
+    def subscribe(self, module: str, key: str, callback: Callable[[Any], Any]):
+        """订阅配置值变更，配置值通过 set_config, reload 等方式改变后调用回调
+
+        参数:
+            module: 模块名
+            key: 配置键
+            callback: 回调函数，参数为新的配置值
+        """
+        self._subscribers.setdefault((module, key.upper()), []).append(callback)
+        with contextlib.suppress(NoSuchConfig):
+            self.get_config(module, key)
+
+    def unsubscribe(self, module: str, key: str, callback: Callable[[Any], Any]):
+        """取消订阅配置值变更
+
+        参数:
+            module: 模块名
+            key: 配置键
+            callback: 回调函数
+        """
+        if callbacks := self._subscribers.get((module, key.upper())):
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def _refresh(self, module: str | None = None, key: str | None = None):
+        """使配置值缓存失效，并通知值发生变化的订阅者
+
+        参数:
+            module: 模块名，为空时刷新全部.
+            key: 配置键，为空时刷新整个模块.
+        """
+        if module is None:
+            keys = set(self._value_cache) | set(self._subscribers)
+        elif key is None:
+            keys = {
+                k
+                for k in set(self._value_cache) | set(self._subscribers)
+                if k[0] == module
+            }
+        else:
+            keys = {(module, key)}
+        for k in keys:
+            old = self._value_cache.pop(k, _MISSING)
+            if callbacks := self._subscribers.get(k):
+                try:
+                    value = self.get_config(*k)
+                except NoSuchConfig:
+                    continue
+                if old is not _MISSING and old == value:
+                    continue
+                for callback in callbacks:
+                    try:
+                        callback(value)
+                    except Exception as e:
+                        logger.error(
+                            f"配置变更回调执行失败 MODULE: [<u><y>{k[0]}</y></u>]"
+                            f" | KEY: [<u><y>{k[1]}</y></u>]",
+                            e=e,
+                        )
+
     def get(self, key: str) -> ConfigGroup:
         """获取插件配置数据
 
@@ -509,6 +599,7 @@ class ConfigsManager:
         for key in self._simple_data.keys():
             for k in self._simple_data[key].keys():
                 self._data[key].configs[k].value = self._simple_data[key][k]
+        self._refresh()
         self.save()
 
     def load_data(self):
@@ -536,6 +627,7 @@ class ConfigsManager:
                 config_group.configs[config] = ConfigModel(**temp_data[module][config])
                 count += 1
             self._data[module] = config_group
+        self._refresh()
         logger.info(
             f"加载配置完成，共加载 <u><y>{len(temp_data)}</y></u> 个配置组及对应"
             f" <u><y>{count}</y></u> 个配置项"
@@ -555,6 +647,7 @@ class ConfigsManager:
 
     def __setitem__(self, key, value):
         self._data[key] = value
+        self._refresh(key)
 
     def __getitem__(self, key):
         return self._data[key]
@@ -1,13 +1,88 @@
+import heapq
 import time
 from typing_extensions import Self
 
 from tortoise import fields
 
-from zhenxun.services.db_context import Model
+from zhenxun.services.db_context import Model, TableCache
 from zhenxun.services.log import logger
 from zhenxun.utils.exception import UserAndGroupIsNone
 
 
+class BanIndex:
+    """封禁数据内存索引
+
+    以 (user_id, group_id) 为键记录封禁数据id与到期时间，
+    非永久封禁按到期时间存入最小堆，供定时任务批量清理
+    """
+
+    def __init__(self):
+        self.data: dict[tuple[str, str], tuple[int, int]] = {}
+        """(user_id, group_id): (id, 到期时间，-1为永久)"""
+        self.heap: list[tuple[int, tuple[str, str], int]] = []
+        """(到期时间, (user_id, group_id), id)"""
+
+    @staticmethod
+    def key(user_id: str | None, group_id: str | None) -> tuple[str, str]:
+        return user_id or "", group_id or ""
+
+    def add(self, idx: int, user_id: str | None, group_id: str | None, expire: int):
+        """添加封禁数据
+
+        参数:
+            idx: 数据id
+            user_id: 用户id
+            group_id: 群组id
+            expire: 到期时间，-1为永久
+        """
+        key = self.key(user_id, group_id)
+        self.data[key] = (idx, expire)
+        if expire != -1:
+            heapq.heappush(self.heap, (expire, key, idx))
+
+    def remove(self, user_id: str | None, group_id: str | None):
+        """移除封禁数据，堆中的记录在弹出时忽略
+
+        参数:
+            user_id: 用户id
+            group_id: 群组id
+        """
+        self.data.pop(self.key(user_id, group_id), None)
+
+    def get_expire(self, user_id: str | None, group_id: str | None) -> int | None:
+        """获取未到期封禁的到期时间
+
+        参数:
+            user_id: 用户id
+            group_id: 群组id
+
+        返回:
+            int | None: 到期时间，-1为永久，None为未被ban
+        """
+        if value := self.data.get(self.key(user_id, group_id)):
+            expire = value[1]
+            if expire == -1 or expire > time.time():
+                return expire
+        return None
+
+    def pop_expired(self, now: float) -> list[int]:
+        """弹出所有已到期的封禁数据
+
+        参数:
+            now: 当前时间
+
+        返回:
+            list[int]: 到期的数据id
+        """
+        id_list = []
+        while self.heap and self.heap[0][0] <= now:
+            expire, key, idx = heapq.heappop(self.heap)
+            if self.data.get(key) == (idx, expire):
+                del self.data[key]
+                id_list.append(idx)
+        return id_list
+
+
 class BanConsole(Model):
     id = fields.IntField(pk=True, generated=True, auto_increment=True)
     """自增id"""
@@ -88,16 +163,16 @@ class BanConsole(Model):
         返回:
             int: ban剩余时长，-1时为永久ban，0表示未被ban
         """
-        logger.debug("获取用户ban时长", target=f"{group_id}:{user_id}")
-        user = await cls._get_data(user_id, group_id)
-        if not user and user_id:
-            user = await cls._get_data(user_id, None)
-        if user:
-            if user.duration == -1:
-                return -1
-            _time = time.time() - (user.ban_time + user.duration)
-            return 0 if _time > 0 else int(time.time() - user.ban_time - user.duration)
-        return 0
+        logger.debug("获取用户ban时长", session=user_id, group_id=group_id)
+        if not user_id and not group_id:
+            raise UserAndGroupIsNone()
+        index = await _ban_cache.get()
+        expire = index.get_expire(user_id, group_id)
+        if expire is None and user_id and group_id:
+            expire = index.get_expire(user_id, None)
+        if expire is None:
+            return 0
+        return -1 if expire == -1 else int(time.time() - expire)
 
     @classmethod
     async def is_ban(cls, user_id: str | None, group_id: str | None = None) -> bool:
@@ -109,12 +184,8 @@ class BanConsole(Model):
         返回:
             bool: 是否被ban
         """
-        logger.debug("检测是否被ban", target=f"{group_id}:{user_id}")
-        if await cls.check_ban_time(user_id, group_id):
-            return True
-        else:
-            await cls.unban(user_id, group_id)
-        return False
+        logger.debug("检测是否被ban", session=user_id, group_id=group_id)
+        return bool(await cls.check_ban_time(user_id, group_id))
 
     @classmethod
     async def ban(
@@ -141,7 +212,8 @@ class BanConsole(Model):
         target = await cls._get_data(user_id, group_id)
         if target:
             await cls.unban(user_id, group_id)
-        await cls.create(
+        version = cls.get_data_version()
+        data = await cls.create(
             user_id=user_id,
             group_id=group_id,
             ban_level=ban_level,
@@ -149,6 +221,9 @@ class BanConsole(Model):
             duration=duration,
             operator=operator or 0,
         )
+        if _ban_cache.advance(version):
+            expire = -1 if duration == -1 else data.ban_time + duration
+            _ban_cache.data.add(data.id, user_id, group_id, expire)  # type: ignore
 
     @classmethod
     async def unban(cls, user_id: str | None, group_id: str | None = None) -> bool:
@@ -164,6 +239,37 @@ class BanConsole(Model):
         user = await cls._get_data(user_id, group_id)
         if user:
             logger.debug("解除封禁", target=f"{group_id}:{user_id}")
+            version = cls.get_data_version()
             await user.delete()
+            if _ban_cache.advance(version):
+                _ban_cache.data.remove(user_id, group_id)  # type: ignore
             return True
         return False
+
+    @classmethod
+    async def clear_expired(cls) -> int:
+        """批量删除已到期的封禁数据
+
+        返回:
+            int: 删除数量
+        """
+        index = await _ban_cache.get()
+        if id_list := index.pop_expired(time.time()):
+            version = cls.get_data_version()
+            await cls.filter(id__in=id_list).delete()
+            _ban_cache.advance(version)
+            logger.debug(f"清理到期封禁数据 {len(id_list)} 条", "BanConsole")
+        return len(id_list)
+
+    @classmethod
+    async def _load_index(cls) -> BanIndex:
+        index = BanIndex()
+        for idx, user_id, group_id, ban_time, duration in await cls.all().values_list(
+            "id", "user_id", "group_id", "ban_time", "duration"
+        ):
+            expire = -1 if duration == -1 else ban_time + duration
+            index.add(idx, user_id, group_id, expire)  # type: ignore
+        return index
+
+
+_ban_cache = TableCache(BanConsole, BanConsole._load_index)
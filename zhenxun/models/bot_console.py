@@ -1,8 +1,21 @@
-from typing import Literal, overload
+from typing import Literal, NamedTuple, overload
 
 from tortoise import fields
 
-from zhenxun.services.db_context import Model
+from zhenxun.services.db_context import Model, TableCache
+
+
+class BotBlockData(NamedTuple):
+    """
+    解析后的bot状态与禁用列表
+    """
+
+    status: bool
+    """Bot状态"""
+    block_plugins: frozenset[str]
+    """禁用插件"""
+    block_tasks: frozenset[str]
+    """禁用被动技能"""
 
 
 class BotConsole(Model):
@@ -56,8 +69,8 @@ class BotConsole(Model):
         """
         if not bot_id:
             return await cls.all().values_list("bot_id", "status")
-        result = await cls.get_or_none(bot_id=bot_id)
-        return result.status if result else False
+        data = (await _block_cache.get()).get(bot_id)
+        return data.status if data else False
 
     @overload
     @classmethod
@@ -181,6 +194,37 @@ class BotConsole(Model):
         elif isinstance(data, list):
             return "".join(cls.format(item) for item in data)
 
+    @classmethod
+    async def _load_block_data(cls) -> dict[str, BotBlockData]:
+        """加载并解析所有bot的状态与禁用列表
+
+        返回:
+            dict[str, BotBlockData]: bot_id: 禁用列表
+        """
+        data_list = await cls.all().values_list(
+            "bot_id", "status", "block_plugins", "block_tasks"
+        )
+        return {
+            bot_id: BotBlockData(
+                status,
+                frozenset(cls.convert_module_format(block_plugins)),
+                frozenset(cls.convert_module_format(block_tasks)),
+            )
+            for bot_id, status, block_plugins, block_tasks in data_list
+        }
+
+    @classmethod
+    async def get_block_data(cls, bot_id: str) -> BotBlockData | None:
+        """获取bot解析后的状态与禁用列表，数据缓存于内存中
+
+        参数:
+            bot_id (str): bot_id
+
+        返回:
+            BotBlockData | None: 禁用列表
+        """
+        return (await _block_cache.get()).get(bot_id)
+
     @classmethod
     async def _toggle_field(
         cls,
@@ -410,6 +454,8 @@ class BotConsole(Model):
         返回:
             bool: 是否被禁用
         """
+        if data := await cls.get_block_data(bot_id):
+            return plugin_name in data.block_plugins
         bot_data, _ = await cls.get_or_create(bot_id=bot_id)
         return cls.format(plugin_name) in bot_data.block_plugins
 
@@ -425,6 +471,8 @@ class BotConsole(Model):
         返回:
             bool: 是否被禁用
         """
+        if data := await cls.get_block_data(bot_id):
+            return task_name in data.block_tasks
         bot_data, _ = await cls.get_or_create(bot_id=bot_id)
         return cls.format(task_name) in bot_data.block_tasks
 
@@ -436,3 +484,6 @@ class BotConsole(Model):
             "ALTER TABLE bot_console ADD available_plugins text default '';",
             "ALTER TABLE bot_console ADD available_tasks text default '';",
         ]
+
+
+_block_cache = TableCache(BotConsole, BotConsole._load_block_data)
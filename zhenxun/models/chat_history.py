@@ -3,7 +3,6 @@ from typing import Literal
 from typing_extensions import Self
 
 from tortoise import fields
-from tortoise.functions import Count
 
 from zhenxun.services.db_context import Model
 
@@ -26,6 +25,12 @@ class ChatHistory(Model):
     platform = fields.CharField(255, null=True)
     """平台"""
 
+    _indexes = (
+        ("group_id", "create_time"),
+        ("user_id", "group_id", "create_time"),
+    )
+    """启动后由 create_indexes 创建的索引"""
+
     class Meta:  # pyright: ignore [reportIncompatibleVariableOverride]
         table = "chat_history"
         table_description = "聊天记录数据表"
@@ -37,7 +42,7 @@ class ChatHistory(Model):
         limit: int = 10,
         order: str = "DESC",
         date_scope: tuple[datetime, datetime] | None = None,
-    ) -> list[Self]:
+    ) -> list[tuple[str, int]]:
         """获取排行数据
 
         参数:
@@ -45,18 +50,13 @@ class ChatHistory(Model):
             limit: 获取数量
             order: 排序类型，desc，des
             date_scope: 日期范围
+
+        返回:
+            list[tuple[str, int]]: 用户id，发言次数，数据来自每小时汇总表
         """
-        o = "-" if order == "DESC" else ""
-        query = cls.filter(group_id=gid) if gid else cls
-        if date_scope:
-            query = query.filter(create_time__range=date_scope)
-        return list(
-            await query.annotate(count=Count("user_id"))
-            .order_by(f"{o}count")
-            .group_by("user_id")
-            .limit(limit)
-            .values_list("user_id", "count")
-        )  # type: ignore
+        from zhenxun.models.chat_hour_count import ChatHourCount
+
+        return await ChatHourCount.get_group_msg_rank(gid, limit, order, date_scope)
 
     @classmethod
     async def get_group_first_msg_datetime(
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from tortoise import fields
+from tortoise.functions import Sum
+
+from zhenxun.models.chat_history import ChatHistory
+from zhenxun.services.db_context import Model
+from zhenxun.services.rollup import HourRollup, floor_hour
+
+
+class ChatHourCount(Model):
+    id = fields.IntField(pk=True, generated=True, auto_increment=True)
+    """自增id"""
+    hour = fields.DatetimeField(description="小时")
+    """小时"""
+    bot_id = fields.CharField(64, default="", description="bot id")
+    """bot id"""
+    group_id = fields.CharField(255, default="", description="群组id，私聊为空")
+    """群组id，私聊为空"""
+    user_id = fields.CharField(64, description="用户id")
+    """用户id"""
+    num = fields.BigIntField(default=0, description="消息数量")
+    """消息数量"""
+
+    class Meta:  # pyright: ignore [reportIncompatibleVariableOverride]
+        table = "chat_hour_count"
+        table_description = "每小时聊天记录数量"
+        unique_together = (("hour", "bot_id", "group_id", "user_id"),)
+        indexes = (("group_id", "hour"),)
+
+    @classmethod
+    async def get_group_msg_rank(
+        cls,
+        gid: str | None,
+        limit: int = 10,
+        order: str = "DESC",
+        date_scope: tuple[datetime, datetime] | None = None,
+    ) -> list[tuple[str, int]]:
+        """获取排行数据，时间范围精确到小时
+
+        参数:
+            gid: 群号
+            limit: 获取数量
+            order: 排序类型，desc，des
+            date_scope: 日期范围
+
+        返回:
+            list[tuple[str, int]]: 用户id，发言次数
+        """
+        o = "-" if order == "DESC" else ""
+        query = cls.filter(group_id=gid) if gid else cls
+        if date_scope:
+            query = query.filter(
+                hour__gte=floor_hour(date_scope[0]), hour__lte=date_scope[1]
+            )
+        return [
+            (user_id, int(count))
+            for user_id, count in await query.annotate(count=Sum("num"))
+            .order_by(f"{o}count")
+            .group_by("user_id")
+            .limit(limit)
+            .values_list("user_id", "count")
+        ]
+
+    @classmethod
+    async def get_active_groups(cls, since: datetime | None = None) -> set[str]:
+        """获取有发言记录的群组，时间精确到小时
+
+        参数:
+            since: 起始时间，为None时不限制.
+
+        返回:
+            set[str]: 群组id
+        """
+        query = cls.filter(group_id__not="")
+        if since:
+            query = query.filter(hour__gte=floor_hour(since))
+        return set(await query.distinct().values_list("group_id", flat=True))
+
+
+chat_rollup = HourRollup(ChatHistory, ChatHourCount, ("bot_id", "group_id", "user_id"))
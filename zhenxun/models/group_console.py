@@ -1,4 +1,4 @@
-from typing import Any, overload
+from typing import Any, NamedTuple, overload
 from typing_extensions import Self
 
 from tortoise import fields
@@ -6,10 +6,25 @@ from tortoise.backends.base.client import BaseDBAsyncClient
 
 from zhenxun.models.plugin_info import PluginInfo
 from zhenxun.models.task_info import TaskInfo
-from zhenxun.services.db_context import Model
+from zhenxun.services.db_context import Model, TableCache
 from zhenxun.utils.enum import PluginType
 
 
+class GroupBlockData(NamedTuple):
+    """
+    解析后的群组禁用列表
+    """
+
+    block_plugin: frozenset[str]
+    """禁用插件"""
+    superuser_block_plugin: frozenset[str]
+    """超级用户禁用插件"""
+    block_task: frozenset[str]
+    """禁用被动技能"""
+    superuser_block_task: frozenset[str]
+    """超级用户禁用被动"""
+
+
 class GroupConsole(Model):
     id = fields.IntField(pk=True, generated=True, auto_increment=True)
     """自增id"""
@@ -79,6 +94,46 @@ class GroupConsole(Model):
         elif isinstance(data, list):
             return "".join(cls.format(item) for item in data)
 
+    @classmethod
+    async def _load_block_data(cls) -> dict[str, dict[str | None, GroupBlockData]]:
+        """加载并解析所有群组的禁用列表
+
+        返回:
+            dict[str, dict[str | None, GroupBlockData]]: 群组id: {频道id: 禁用列表}
+        """
+        data: dict[str, dict[str | None, GroupBlockData]] = {}
+        for group_id, channel_id, *values in await cls.all().values_list(
+            "group_id", "channel_id", *GroupBlockData._fields
+        ):
+            data.setdefault(group_id, {})[channel_id] = GroupBlockData(
+                *(frozenset(cls.convert_module_format(v or "")) for v in values)
+            )
+        return data
+
+    @classmethod
+    async def get_block_data(
+        cls, group_id: str, channel_id: str | None = None
+    ) -> GroupBlockData | None:
+        """获取群组解析后的禁用列表，数据缓存于内存中
+
+        参数:
+            group_id: 群组id
+            channel_id: 频道id.
+
+        返回:
+            GroupBlockData | None: 禁用列表
+        """
+        return (await _block_cache.get()).get(group_id, {}).get(channel_id)
+
+    @classmethod
+    async def get_all_block_data(cls) -> dict[str, dict[str | None, GroupBlockData]]:
+        """获取所有群组解析后的禁用列表，数据缓存于内存中
+
+        返回:
+            dict[str, dict[str | None, GroupBlockData]]: 群组id: {频道id: 禁用列表}
+        """
+        return await _block_cache.get()
+
     @classmethod
     async def create(
         cls, using_db: BaseDBAsyncClient | None = None, **kwargs: Any
@@ -193,10 +248,8 @@ class GroupConsole(Model):
         返回:
             bool: 是否禁用被动
         """
-        return await cls.exists(
-            group_id=group_id,
-            superuser_block_plugin__contains=f"<{module},",
-        )
+        data = (await _block_cache.get()).get(group_id, {})
+        return any(module in d.superuser_block_plugin for d in data.values())
 
     @classmethod
     async def is_block_plugin(cls, group_id: str, module: str) -> bool:
@@ -209,10 +262,10 @@ class GroupConsole(Model):
         返回:
             bool: 是否禁用插件
         """
-        return await cls.exists(
-            group_id=group_id, block_plugin__contains=f"<{module},"
-        ) or await cls.exists(
-            group_id=group_id, superuser_block_plugin__contains=f"<{module},"
+        data = (await _block_cache.get()).get(group_id, {})
+        return any(
+            module in d.block_plugin or module in d.superuser_block_plugin
+            for d in data.values()
         )
 
     @classmethod
@@ -283,11 +336,8 @@ class GroupConsole(Model):
         返回:
             bool: 是否禁用被动
         """
-        return await cls.exists(
-            group_id=group_id,
-            channel_id=channel_id,
-            block_plugin__contains=f"<{module},",
-        )
+        data = await cls.get_block_data(group_id, channel_id)
+        return bool(data and module in data.block_plugin)
 
     @classmethod
     async def is_superuser_block_task(cls, group_id: str, task: str) -> bool:
@@ -300,10 +350,8 @@ class GroupConsole(Model):
         返回:
             bool: 是否禁用被动
         """
-        return await cls.exists(
-            group_id=group_id,
-            superuser_block_task__contains=f"<{task},",
-        )
+        data = (await _block_cache.get()).get(group_id, {})
+        return any(task in d.superuser_block_task for d in data.values())
 
     @classmethod
     async def is_block_task(
@@ -319,23 +367,12 @@ class GroupConsole(Model):
         返回:
             bool: 是否禁用被动
         """
-        if not channel_id:
-            return await cls.exists(
-                group_id=group_id,
-                channel_id__isnull=True,
-                block_task__contains=f"<{task},",
-            ) or await cls.exists(
-                group_id=group_id,
-                channel_id__isnull=True,
-                superuser_block_task__contains=f"<{task},",
-            )
-        return await cls.exists(
-            group_id=group_id, channel_id=channel_id, block_task__contains=f"<{task},"
-        ) or await cls.exists(
-            group_id=group_id,
-            channel_id__isnull=True,
-            superuser_block_task__contains=f"<{task},",
-        )
+        data = (await _block_cache.get()).get(group_id, {})
+        group = data.get(None)
+        if group and task in group.superuser_block_task:
+            return True
+        channel = data.get(channel_id)
+        return bool(channel and task in channel.block_task)
 
     @classmethod
     async def set_block_task(
@@ -399,3 +436,6 @@ class GroupConsole(Model):
             "ALTER TABLE group_console ADD superuser_block_task"
             " character varying(255) NOT NULL DEFAULT '';",
         ]
+
+
+_block_cache = TableCache(GroupConsole, GroupConsole._load_block_data)
@@ -22,6 +22,9 @@ class GroupInfoUser(Model):
     platform = fields.CharField(255, null=True, description="平台")
     """平台"""
 
+    _indexes = (("group_id", "user_id"),)
+    """启动后由 create_indexes 创建的索引"""
+
     class Meta:  # pyright: ignore [reportIncompatibleVariableOverride]
         table = "group_info_users"
         table_description = "群员信息数据表"
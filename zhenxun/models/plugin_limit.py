@@ -34,7 +34,18 @@ class PluginLimit(Model):
     """cd"""
     max_count = fields.IntField(null=True, description="最大调用次数")
     """最大调用次数"""
+    burst = fields.IntField(null=True, description="cd内允许连续调用的次数")
+    """cd内允许连续调用的次数"""
+    period = fields.IntField(null=True, description="次数限制时间段")
+    """次数限制时间段（秒），为空时每日刷新"""
 
     class Meta:  # pyright: ignore [reportIncompatibleVariableOverride]
         table = "plugin_limit"
         table_description = "插件限制"
+
+    @classmethod
+    async def _run_script(cls):
+        return [
+            "ALTER TABLE plugin_limit ADD burst integer;",
+            "ALTER TABLE plugin_limit ADD period integer;",
+        ]
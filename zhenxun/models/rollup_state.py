@@ -0,0 +1,18 @@
+from tortoise import fields
+
+from zhenxun.services.db_context import Model
+
+
+class RollupState(Model):
+    id = fields.IntField(pk=True, generated=True, auto_increment=True)
+    """自增id"""
+    name = fields.CharField(255, unique=True, description="汇总表名称")
+    """汇总表名称"""
+    last_id = fields.BigIntField(default=0, description="已汇总的最大源数据id")
+    """已汇总的最大源数据id"""
+    gaps = fields.JSONField(default=list, description="尚未提交的源数据id")
+    """小于 last_id 但汇总时尚未提交的源数据id，[id, 发现时间]"""
+
+    class Meta:  # pyright: ignore [reportIncompatibleVariableOverride]
+        table = "rollup_state"
+        table_description = "汇总表进度"
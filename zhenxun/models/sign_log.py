@@ -17,6 +17,9 @@ class SignLog(Model):
     platform = fields.CharField(255, null=True, description="平台")
     """平台"""
 
+    _indexes = (("user_id", "create_time"),)
+    """启动后由 create_indexes 创建的索引"""
+
     class Meta:  # pyright: ignore [reportIncompatibleVariableOverride]
         table = "sign_log"
         table_description = "用户签到记录表"
@@ -17,6 +17,13 @@ class Statistics(Model):
     bot_id = fields.CharField(255, null=True)
     """Bot Id"""
 
+    _indexes = (
+        ("user_id", "group_id", "create_time"),
+        ("group_id", "create_time"),
+        ("plugin_name", "create_time"),
+    )
+    """启动后由 create_indexes 创建的索引"""
+
     class Meta:  # pyright: ignore [reportIncompatibleVariableOverride]
         table = "statistics"
         table_description = "插件调用统计数据库"
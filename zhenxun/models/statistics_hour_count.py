@@ -0,0 +1,35 @@
+from tortoise import fields
+
+from zhenxun.models.statistics import Statistics
+from zhenxun.services.db_context import Model
+from zhenxun.services.rollup import HourRollup
+
+
+class StatisticsHourCount(Model):
+    id = fields.IntField(pk=True, generated=True, auto_increment=True)
+    """自增id"""
+    hour = fields.DatetimeField(description="小时")
+    """小时"""
+    bot_id = fields.CharField(64, default="", description="bot id")
+    """bot id"""
+    group_id = fields.CharField(255, default="", description="群组id，私聊为空")
+    """群组id，私聊为空"""
+    user_id = fields.CharField(64, description="用户id")
+    """用户id"""
+    plugin_name = fields.CharField(128, description="插件名称")
+    """插件名称"""
+    num = fields.BigIntField(default=0, description="调用次数")
+    """调用次数"""
+
+    class Meta:  # pyright: ignore [reportIncompatibleVariableOverride]
+        table = "statistics_hour_count"
+        table_description = "每小时插件调用次数"
+        unique_together = (("hour", "bot_id", "group_id", "user_id", "plugin_name"),)
+        indexes = (("plugin_name", "hour"),)
+
+
+statistics_rollup = HourRollup(
+    Statistics,
+    StatisticsHourCount,
+    ("bot_id", "group_id", "user_id", "plugin_name"),
+)
@@ -18,6 +18,9 @@ class UserGoldLog(Model):
     create_time = fields.DatetimeField(auto_now_add=True, description="创建时间")
     """创建时间"""
 
+    _indexes = (("user_id", "create_time"),)
+    """启动后由 create_indexes 创建的索引"""
+
     class Meta:  # pyright: ignore [reportIncompatibleVariableOverride]
         table = "user_gold_log"
         table_description = "用户金币记录表"
@@ -20,6 +20,9 @@ class UserPropsLog(Model):
     create_time = fields.DatetimeField(auto_now_add=True, description="创建时间")
     """创建时间"""
 
+    _indexes = (("user_id", "uuid", "create_time"),)
+    """启动后由 create_indexes 创建的索引"""
+
     class Meta:  # pyright: ignore [reportIncompatibleVariableOverride]
         table = "user_props_log"
         table_description = "用户道具记录表"
@@ -1,14 +1,85 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Generator
+import contextlib
+import time
+from typing import Any, Generic, TypeVar
+
 from nonebot.utils import is_coroutine_callable
 from tortoise import Tortoise
 from tortoise.connection import connections
+from tortoise.manager import Manager
 from tortoise.models import Model as Model_
+from tortoise.queryset import AwaitableQuery, QuerySet
 
 from zhenxun.configs.config import BotConfig
 
 from .log import logger
 
+T = TypeVar("T")
+
 SCRIPT_METHOD = []
+DISCONNECT_METHOD: list[Callable[[], Awaitable]] = []
+"""关闭数据库连接前执行的方法"""
 MODELS: list[str] = []
+MODEL_CLASSES: list[type["Model"]] = []
+
+DATA_VERSION: dict[type["Model"], int] = {}
+"""模型数据版本，每次写入后自增，供进程内缓存判断是否失效"""
+
+_index_task: asyncio.Task | None = None
+"""启动后在后台创建索引的任务"""
+
+
+class _WriteQuery:
+    """
+    包装QuerySet的写操作，执行完毕后更新模型数据版本
+    """
+
+    def __init__(self, query: Any, model: type["Model"]):
+        self._query = query
+        self._model = model
+
+    def __getattr__(self, item: str) -> Any:
+        attr = getattr(self._query, item)
+        if not callable(attr):
+            return attr
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = attr(*args, **kwargs)
+            # 链式调用返回的新查询同样需要更新数据版本
+            if isinstance(result, AwaitableQuery):
+                return _WriteQuery(result, self._model)
+            return result
+
+        return wrapper
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        result = yield from self._query.__await__()
+        self._model.bump_data_version()
+        return result
+
+
+class VersionQuerySet(QuerySet):
+    """
+    update/delete/bulk_create/bulk_update 后自动更新数据版本的QuerySet
+    """
+
+    def update(self, **kwargs: Any) -> Any:
+        return _WriteQuery(super().update(**kwargs), self.model)
+
+    def delete(self) -> Any:
+        return _WriteQuery(super().delete(), self.model)
+
+    def bulk_create(self, *args: Any, **kwargs: Any) -> Any:
+        return _WriteQuery(super().bulk_create(*args, **kwargs), self.model)
+
+    def bulk_update(self, *args: Any, **kwargs: Any) -> Any:
+        return _WriteQuery(super().bulk_update(*args, **kwargs), self.model)
+
+
+class VersionManager(Manager):
+    def get_queryset(self) -> QuerySet:
+        return VersionQuerySet(self._model)
 
 
 class Model(Model_):
@@ -21,10 +92,106 @@ class Model(Model_):
 
     def __init_subclass__(cls, **kwargs):
         MODELS.append(cls.__module__)
+        MODEL_CLASSES.append(cls)
 
         if func := getattr(cls, "_run_script", None):
             SCRIPT_METHOD.append((cls.__module__, func))
 
+    @classmethod
+    def get_data_version(cls) -> int:
+        """获取当前数据版本
+
+        返回:
+            int: 数据版本
+        """
+        return DATA_VERSION.get(cls, 0)
+
+    @classmethod
+    def bump_data_version(cls):
+        """数据发生写入，使相关缓存失效"""
+        DATA_VERSION[cls] = DATA_VERSION.get(cls, 0) + 1
+
+    async def save(self, *args, **kwargs):
+        await super().save(*args, **kwargs)
+        self.__class__.bump_data_version()
+
+    async def delete(self, *args, **kwargs):
+        await super().delete(*args, **kwargs)
+        self.__class__.bump_data_version()
+
+
+class TableCache(Generic[T]):
+    """
+    整表缓存，模型数据版本变动或超过ttl后在下一次读取时重新加载
+    """
+
+    def __init__(
+        self, model: type[Model], loader: Callable[[], Awaitable[T]], ttl: int = 300
+    ):
+        """
+        参数:
+            model: 模型
+            loader: 加载数据的方法
+            ttl: 最长有效时间（秒），防止原始sql等未经过ORM的写入导致数据长期不一致
+        """
+        self.model = model
+        self.loader = loader
+        self.ttl = ttl
+        self.data: T | None = None
+        self.version = -1
+        self.load_time = 0.0
+        self._lock = asyncio.Lock()
+
+    def is_valid(self) -> bool:
+        return (
+            self.data is not None
+            and self.version == self.model.get_data_version()
+            and time.time() - self.load_time < self.ttl
+        )
+
+    async def get(self) -> T:
+        """获取缓存数据
+
+        返回:
+            T: 缓存数据
+        """
+        if not self.is_valid():
+            async with self._lock:
+                if not self.is_valid():
+                    # 先记录版本，加载期间发生的写入会使下一次读取重新加载
+                    version = self.model.get_data_version()
+                    self.data = await self.loader()
+                    self.version = version
+                    self.load_time = time.time()
+                    logger.debug(
+                        f"重新加载 {self.model.__name__} 缓存, 数据版本: {version}",
+                        "TableCache",
+                    )
+        return self.data  # type: ignore
+
+    def advance(self, version: int) -> bool:
+        """写入后判断能否直接更新缓存数据
+
+        缓存在写入前为最新，且期间只发生了本次写入时，将缓存版本推进至当前版本
+
+        参数:
+            version: 写入前的数据版本
+
+        返回:
+            bool: 是否可以直接更新缓存数据
+        """
+        if (
+            self.data is not None
+            and self.version == version
+            and self.model.get_data_version() == version + 1
+        ):
+            self.version = version + 1
+            return True
+        return False
+
+    def clear(self):
+        self.data = None
+
 
 class DbUrlIsNode(Exception):
     """
@@ -42,9 +209,70 @@ class DbConnectError(Exception):
     pass
 
 
+async def _create_index(model: type["Model"], index: tuple[str, ...]):
+    db = Tortoise.get_connection("default")
+    dialect = db.capabilities.dialect
+    generator = db.schema_generator(db)
+    table = model._meta.db_table
+    columns = [model._meta.fields_map[field].source_field or field for field in index]
+    name = generator._generate_index_name("idx", model, columns)
+    if dialect == "mysql":
+        if await db.execute_query_dict(
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = %s "
+            "AND index_name = %s LIMIT 1",
+            [table, name],
+        ):
+            return
+        sql = (
+            f"ALTER TABLE `{table}` ADD INDEX `{name}` "
+            f"({', '.join(f'`{c}`' for c in columns)});"
+        )
+    elif dialect == "postgres":
+        # CONCURRENTLY 不阻塞写入，中断后会留下无效索引，需要删除后重建
+        if await db.execute_query_dict(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = $1 AND NOT i.indisvalid",
+            [name],
+        ):
+            await db.execute_script(f'DROP INDEX CONCURRENTLY "{name}";')
+        column_sql = ", ".join(f'"{c}"' for c in columns)
+        sql = (
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+            f'ON "{table}" ({column_sql});'
+        )
+    else:
+        sql = generator._get_index_sql(model, columns, safe=True)
+    logger.debug(f"检查索引: {table}.{name}")
+    await db.execute_script(sql)
+
+
+async def create_indexes():
+    """创建模型 _indexes 中声明的索引
+
+    大表的索引不写在 Meta.indexes 中，否则 generate_schemas(safe=True)
+    每次启动都会对已存在的表执行阻塞写入的 CREATE INDEX，
+    启动后在后台执行，索引名与 tortoise 建表时生成的一致，已存在的索引会被跳过，
+    postgres 在事务外使用 CREATE INDEX CONCURRENTLY，建索引期间不阻塞写入
+    """
+    for model in MODEL_CLASSES:
+        for index in getattr(model, "_indexes", ()):
+            try:
+                await _create_index(model, index)
+            except Exception as e:
+                logger.warning(
+                    f"创建索引 {model._meta.db_table}{list(index)} 失败", e=e
+                )
+
+
 async def init():
     if not BotConfig.db_url:
         raise DbUrlIsNode("数据库配置为空，请在.env.dev中配置DB_URL...")
+    for model in MODEL_CLASSES:
+        if not isinstance(model._meta.manager, VersionManager):
+            model._meta.manager = VersionManager(model)
+        # 重新连接后所有缓存的数据均已失效
+        model.bump_data_version()
     try:
         await Tortoise.init(
             db_url=BotConfig.db_url,
@@ -75,10 +303,21 @@ async def init():
             if sql_list:
                 logger.debug("SCRIPT_METHOD方法执行完毕!")
         await Tortoise.generate_schemas()
+        global _index_task
+        _index_task = asyncio.create_task(create_indexes())
         logger.info("Database loaded successfully!")
     except Exception as e:
         raise DbConnectError(f"数据库连接错误... e:{e}") from e
 
 
 async def disconnect():
+    for func in DISCONNECT_METHOD:
+        try:
+            await func()
+        except Exception as e:
+            logger.error(f"{func.__qualname__} 执行DISCONNECT_METHOD方法出错...", e=e)
+    if _index_task and not _index_task.done():
+        _index_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _index_task
     await connections.close_all()
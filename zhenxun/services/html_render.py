@@ -0,0 +1,245 @@
+import asyncio
+from collections import defaultdict
+import contextlib
+from functools import lru_cache
+import json
+from typing import Any, ClassVar, Literal
+
+import jinja2
+import nonebot
+from nonebot_plugin_htmlrender import get_browser
+from playwright.async_api import Page
+
+from .log import logger
+
+driver = nonebot.get_driver()
+
+READY_SCRIPT = """() => {
+    if (window.__ready !== undefined) return window.__ready === true;
+    return document.fonts.status === "loaded"
+        && Array.from(document.images).every((img) => img.complete);
+}"""
+"""模板设置了 window.__ready 时等待其为 true，否则等待字体与图片加载完成"""
+
+ECHARTS_HOOK = """(() => {
+    let lib;
+    Object.defineProperty(window, "echarts", {
+        configurable: true,
+        get() { return lib; },
+        set(value) {
+            lib = value;
+            if (!value) return;
+            let init = value.init;
+            Object.defineProperty(value, "init", {
+                configurable: true,
+                enumerable: true,
+                get() {
+                    if (!init) return init;
+                    return function (...args) {
+                        const chart = init.apply(this, args);
+                        window.__ready = false;
+                        chart.on("finished", () => { window.__ready = true; });
+                        return chart;
+                    };
+                },
+                set(fn) { init = fn; },
+            });
+        },
+    });
+})();"""
+"""使用echarts的模板在图表 finished 事件后设置 window.__ready"""
+
+
+@lru_cache
+def _environment(template_path: str) -> jinja2.Environment:
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(template_path), enable_async=True
+    )
+
+
+class _PooledPage:
+    __slots__ = ("crashed", "page", "uses")
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.uses = 0
+        self.crashed = False
+        page.on("crash", lambda _: setattr(self, "crashed", True))
+
+    @property
+    def alive(self) -> bool:
+        return not self.crashed and not self.page.is_closed()
+
+
+class HtmlRender:
+    """
+    html模板渲染
+
+    按 (模板路径, 页面参数) 保留预热好的页面，渲染后放回池中复用，
+    复用前重新打开模板路径，避免上次渲染的全局变量残留，
+    以模板的 window.__ready（或字体与图片加载完成）代替固定等待，
+    页面崩溃、渲染出错或使用次数达到 max_uses 后关闭重建
+    """
+
+    limit: ClassVar[int] = 4
+    """同时渲染的页面数量"""
+    max_idle: ClassVar[int] = 2
+    """每个模板保留的空闲页面数量"""
+    max_uses: ClassVar[int] = 50
+    """页面最大使用次数"""
+    ready_timeout: ClassVar[float] = 10_000
+    """等待页面就绪的超时时间（毫秒）"""
+
+    _idle: ClassVar[defaultdict[str, list[_PooledPage]]] = defaultdict(list)
+    _semaphore: ClassVar[asyncio.Semaphore | None] = None
+
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(cls.limit)
+        return cls._semaphore
+
+    @classmethod
+    def _pool_key(
+        cls, template_path: str, pages: dict[str, Any], device_scale_factor: float
+    ) -> str:
+        return json.dumps(
+            [template_path, pages, device_scale_factor], sort_keys=True, default=str
+        )
+
+    @classmethod
+    async def _new_page(
+        cls, template_path: str, pages: dict[str, Any], device_scale_factor: float
+    ) -> _PooledPage:
+        browser = await get_browser()
+        page = await browser.new_page(device_scale_factor=device_scale_factor, **pages)
+        page.on("console", lambda msg: logger.debug(f"浏览器控制台: {msg.text}"))
+        await page.add_init_script(ECHARTS_HOOK)
+        await page.goto(f"file://{template_path}")
+        return _PooledPage(page)
+
+    @classmethod
+    async def _acquire(
+        cls, key: str, template_path: str, pages: dict, device_scale_factor: float
+    ) -> _PooledPage:
+        idle = cls._idle[key]
+        while idle:
+            pooled = idle.pop()
+            if pooled.alive:
+                return pooled
+            await cls._close(pooled)
+        return await cls._new_page(template_path, pages, device_scale_factor)
+
+    @classmethod
+    async def _release(cls, key: str, pooled: _PooledPage):
+        idle = cls._idle[key]
+        if pooled.alive and pooled.uses < cls.max_uses and len(idle) < cls.max_idle:
+            idle.append(pooled)
+        else:
+            await cls._close(pooled)
+
+    @classmethod
+    async def _close(cls, pooled: _PooledPage):
+        with contextlib.suppress(Exception):
+            await pooled.page.close()
+
+    @classmethod
+    async def warmup(
+        cls,
+        template_path: str,
+        pages: dict[str, Any],
+        device_scale_factor: float = 2,
+    ):
+        """预先打开模板页面
+
+        参数:
+            template_path: 模板路径
+            pages: 页面参数，如 viewport
+            device_scale_factor: 缩放比例.
+        """
+        key = cls._pool_key(template_path, pages, device_scale_factor)
+        while len(cls._idle[key]) < cls.max_idle:
+            cls._idle[key].append(
+                await cls._new_page(template_path, pages, device_scale_factor)
+            )
+
+    @classmethod
+    async def template_to_pic(
+        cls,
+        template_path: str,
+        template_name: str,
+        templates: dict[str, Any],
+        pages: dict[str, Any],
+        filters: dict[str, Any] | None = None,
+        type: Literal["jpeg", "png"] = "png",
+        quality: int | None = None,
+        device_scale_factor: float = 2,
+        screenshot_timeout: float = 30_000,
+    ) -> bytes:
+        """使用jinja2模板生成图片
+
+        参数:
+            template_path: 模板路径
+            template_name: 模板名
+            templates: 模板参数
+            pages: 页面参数，如 viewport
+            filters: 自定义过滤器.
+            type: 图片类型.
+            quality: 图片质量，png时无效.
+            device_scale_factor: 缩放比例.
+            screenshot_timeout: 截图超时时间（毫秒）.
+
+        返回:
+            bytes: 图片
+        """
+        if filters:
+            env = jinja2.Environment(
+                loader=jinja2.FileSystemLoader(template_path), enable_async=True
+            )
+            env.filters.update(filters)
+        else:
+            env = _environment(template_path)
+        html = await env.get_template(template_name).render_async(**templates)
+        key = cls._pool_key(template_path, pages, device_scale_factor)
+        async with cls._get_semaphore():
+            pooled = await cls._acquire(key, template_path, pages, device_scale_factor)
+            try:
+                page = pooled.page
+                if pooled.uses:
+                    # set_content 不会重建 window，上次渲染声明的全局变量仍然存在
+                    await page.goto(f"file://{template_path}")
+                pooled.uses += 1
+                await page.set_content(html, wait_until="load")
+                try:
+                    await page.wait_for_function(
+                        READY_SCRIPT, timeout=cls.ready_timeout
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"{template_name} 等待页面就绪超时，直接截图", "HtmlRender", e=e
+                    )
+                result = await page.screenshot(
+                    full_page=True,
+                    type=type,
+                    quality=quality,
+                    timeout=screenshot_timeout,
+                )
+            except Exception:
+                pooled.crashed = True
+                raise
+            finally:
+                await cls._release(key, pooled)
+        return result
+
+    @classmethod
+    async def shutdown(cls):
+        """关闭所有空闲页面"""
+        for idle in cls._idle.values():
+            for pooled in idle:
+                await cls._close(pooled)
+        cls._idle.clear()
+
+
+@driver.on_shutdown
+async def _():
+    await HtmlRender.shutdown()
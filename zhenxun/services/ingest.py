@@ -0,0 +1,346 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+import json
+from pathlib import Path
+import shutil
+import time
+from typing import Any, ClassVar, TextIO
+
+from tortoise import timezone
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.fields import DatetimeField
+
+from zhenxun.configs.path_config import DATA_PATH
+
+from .db_context import DISCONNECT_METHOD, Model
+from .log import logger
+
+SPILL_PATH = DATA_PATH / "ingest"
+
+
+class IngestPipeline:
+    """
+    数据写入队列，消息处理时只放入元组，由后台任务批量写入数据库
+
+    队列达到 batch_size 或距离上次写入超过 flush_interval 秒时写入，
+    写入按 chunk_size 分批执行，重试时跳过已提交的分批，多次失败后未写入的数据
+    写入本地文件，在下一次写入成功时重新写入数据库，关闭数据库连接前会写入剩余数据
+    """
+
+    pipelines: ClassVar[list["IngestPipeline"]] = []
+
+    def __init__(
+        self,
+        model: type[Model],
+        fields: tuple[str, ...],
+        *,
+        max_size: int = 50000,
+        batch_size: int = 1000,
+        chunk_size: int = 500,
+        flush_interval: float = 60,
+        retry: int = 3,
+        after_flush: Callable[[], Awaitable[Any]] | None = None,
+    ):
+        """
+        参数:
+            model: 写入的模型
+            fields: 元组中各个值对应的字段
+            max_size: 队列最大长度，队列已满时 put 会等待写入.
+            batch_size: 队列达到该长度时立即写入.
+            chunk_size: 每次插入的数据条数.
+            flush_interval: 定时写入间隔（秒）.
+            retry: 写入失败时的重试次数.
+            after_flush: 写入数据库后执行的方法，如更新汇总表.
+        """
+        self.model = model
+        self.fields = fields
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.retry = retry
+        self.after_flush = after_flush
+        self.spill_file: Path = SPILL_PATH / f"{model._meta.db_table}.jsonl"
+        self._queue: asyncio.Queue[tuple] | None = None
+        self._full: asyncio.Event | None = None
+        self._lock: asyncio.Lock | None = None
+        self._task: asyncio.Task | None = None
+        self.flushed = 0
+        """已写入数据库的数据条数"""
+        self.spilled = 0
+        """写入本地文件的数据条数"""
+        self.failures = 0
+        """写入失败次数"""
+        self.last_flush_count = 0
+        """上一次写入的数据条数"""
+        self.last_flush_latency = 0.0
+        """上一次写入耗时（秒）"""
+        self.pipelines.append(self)
+
+    @property
+    def depth(self) -> int:
+        """队列中等待写入的数据条数"""
+        return self._queue.qsize() if self._queue else 0
+
+    def metrics(self) -> dict[str, Any]:
+        """获取队列统计数据
+
+        返回:
+            dict[str, Any]: 统计数据
+        """
+        return {
+            "table": self.model._meta.db_table,
+            "depth": self.depth,
+            "max_size": self.max_size,
+            "flushed": self.flushed,
+            "spilled": self.spilled,
+            "failures": self.failures,
+            "last_flush_count": self.last_flush_count,
+            "last_flush_latency": self.last_flush_latency,
+        }
+
+    def _start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_size)
+            self._full = asyncio.Event()
+            self._lock = asyncio.Lock()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)  # type: ignore
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()  # type: ignore
+            try:
+                # 停止时不中断正在进行的写入
+                await asyncio.shield(self.flush())
+            except Exception as e:
+                logger.error(
+                    f"{self.model.__name__} 批量写入出错", "IngestPipeline", e=e
+                )
+
+    async def put(self, row: tuple):
+        """放入一条数据，队列已满时等待写入
+
+        参数:
+            row: 与 fields 对应的值
+        """
+        self._start()
+        await self._queue.put(row)  # type: ignore
+        if self._queue.qsize() >= self.batch_size:  # type: ignore
+            self._full.set()  # type: ignore
+
+    async def flush(self) -> int:
+        """写入队列中的所有数据
+
+        返回:
+            int: 写入数据库的数据条数
+        """
+        if self._queue is None:
+            return 0
+        async with self._lock:  # type: ignore
+            rows = []
+            while not self._queue.empty():
+                rows.append(self._queue.get_nowait())
+            start = time.perf_counter()
+            count = 0
+            if rows:
+                count = await self._insert(rows)
+                if count < len(rows):
+                    # 只暂存未写入的数据，已提交的分批不会重复写入
+                    await self._spill(rows[count:])
+            if count == len(rows):
+                count += await self._replay()
+            self.last_flush_count = count
+            self.last_flush_latency = time.perf_counter() - start
+            self.flushed += count
+        if rows:
+            logger.debug(
+                "批量写入 %s %d 条，耗时 %.3fs，队列剩余 %d 条",
+                "IngestPipeline",
+                args=(
+                    self.model.__name__,
+                    count,
+                    self.last_flush_latency,
+                    self.depth,
+                ),
+            )
+        if count and self.after_flush:
+            try:
+                await self.after_flush()
+            except Exception as e:
+                logger.error(
+                    f"{self.model.__name__} 写入后处理出错", "IngestPipeline", e=e
+                )
+        return count
+
+    async def stop(self):
+        """停止后台任务并写入剩余数据"""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    async def _insert(self, rows: list[tuple]) -> int:
+        """分批写入数据，重试时从上一次成功的分批之后继续
+
+        参数:
+            rows: 数据
+
+        返回:
+            int: 已写入的数据条数，rows 中此前的数据均已提交
+        """
+        done = 0
+        for i in range(self.retry):
+            try:
+                db = self.model._meta.db
+                query, to_values = self._prepare_insert(db)
+                while done < len(rows):
+                    chunk = rows[done : done + self.chunk_size]
+                    await db.execute_many(query, [to_values(row) for row in chunk])
+                    done += len(chunk)
+                    self.model.bump_data_version()
+                    await asyncio.sleep(0)
+                return done
+            except Exception as e:
+                self.failures += 1
+                logger.warning(
+                    f"{self.model.__name__} 批量写入失败 {i + 1}/{self.retry}",
+                    "IngestPipeline",
+                    e=e,
+                )
+                if i + 1 < self.retry:
+                    await asyncio.sleep(2**i)
+        return done
+
+    def _prepare_insert(
+        self, db: BaseDBAsyncClient
+    ) -> tuple[str, Callable[[tuple], list]]:
+        """获取插入语句与元组转换方法，元组直接转换为数据库值，不构造模型实例
+
+        参数:
+            db: 数据库连接
+
+        返回:
+            tuple[str, Callable[[tuple], list]]: 插入语句，元组转换为插入参数的方法
+        """
+        executor = db.executor_class(self.model, db)
+        fields_map = self.model._meta.fields_map
+        columns = []
+        for name in executor.regular_columns:
+            field = fields_map[name]
+            if name in self.fields:
+                index, default = self.fields.index(name), None
+            else:
+                index, default = None, field.default
+                if isinstance(field, DatetimeField) and (
+                    field.auto_now or field.auto_now_add
+                ):
+                    default = timezone.now
+            columns.append((index, default, executor.column_map[name]))
+
+        def to_values(row: tuple) -> list:
+            values = []
+            for index, default, to_db in columns:
+                if index is not None:
+                    value = row[index]
+                else:
+                    value = default() if callable(default) else default
+                values.append(to_db(value, None))
+            return values
+
+        return executor.insert_query, to_values
+
+    @staticmethod
+    def _dump(row: tuple) -> str:
+        return json.dumps(row, ensure_ascii=False, default=str) + "\n"
+
+    def _load(self, line: str) -> tuple:
+        row = json.loads(line)
+        for i, name in enumerate(self.fields):
+            if row[i] and isinstance(
+                self.model._meta.fields_map.get(name), DatetimeField
+            ):
+                row[i] = datetime.fromisoformat(row[i])
+        return tuple(row)
+
+    def _write_spill(self, lines: list[str]):
+        self.spill_file.parent.mkdir(parents=True, exist_ok=True)
+        with self.spill_file.open("a", encoding="utf8") as f:
+            f.writelines(lines)
+
+    async def _spill(self, rows: list[tuple]):
+        await asyncio.to_thread(self._write_spill, [self._dump(row) for row in rows])
+        self.spilled += len(rows)
+        logger.warning(
+            f"{self.model.__name__} {len(rows)} 条数据已暂存至 {self.spill_file}",
+            "IngestPipeline",
+        )
+
+    @staticmethod
+    def _read_lines(f: TextIO, size: int) -> list[str]:
+        lines = []
+        while len(lines) < size and (line := f.readline()):
+            if line.strip():
+                lines.append(line)
+        return lines
+
+    def _keep_rest(self, f: TextIO, lines: list[str]):
+        """将未写入的数据与文件剩余内容写入新的暂存文件"""
+        tmp_file = self.spill_file.with_suffix(".tmp")
+        with tmp_file.open("w", encoding="utf8") as tmp:
+            tmp.writelines(lines)
+            shutil.copyfileobj(f, tmp)
+        f.close()
+        tmp_file.replace(self.spill_file)
+
+    async def _replay(self) -> int:
+        """按 batch_size 逐批读取暂存文件并写入，失败时保留未写入的部分
+
+        返回:
+            int: 写入数据库的数据条数
+        """
+        if not await asyncio.to_thread(self.spill_file.exists):
+            return 0
+        count = 0
+        f = await asyncio.to_thread(self.spill_file.open, encoding="utf8")
+        try:
+            while lines := await asyncio.to_thread(
+                self._read_lines, f, self.batch_size
+            ):
+                done = await self._insert([self._load(line) for line in lines])
+                count += done
+                if done < len(lines):
+                    await asyncio.to_thread(self._keep_rest, f, lines[done:])
+                    break
+            else:
+                f.close()
+                await asyncio.to_thread(self.spill_file.unlink)
+        finally:
+            f.close()
+        if count:
+            logger.info(
+                f"{self.model.__name__} 已重新写入暂存数据 {count} 条",
+                "IngestPipeline",
+            )
+        return count
+
+    @classmethod
+    async def stop_all(cls):
+        """停止所有写入队列并写入剩余数据"""
+        for pipeline in cls.pipelines:
+            try:
+                await pipeline.stop()
+            except Exception as e:
+                logger.error(
+                    f"{pipeline.model.__name__} 写入剩余数据失败",
+                    "IngestPipeline",
+                    e=e,
+                )
+
+
+DISCONNECT_METHOD.append(IngestPipeline.stop_all)
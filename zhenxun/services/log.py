@@ -1,5 +1,6 @@
+from collections.abc import Callable
 from datetime import datetime, timedelta
-from typing import Any, overload
+from typing import Any, ClassVar, overload
 
 import nonebot
 from nonebot import require
@@ -57,11 +58,44 @@ class logger:
 
     ERROR_TEMPLATE = "[<u><r>{}</r></u>]: {}"
 
+    LEVEL_DEBUG: ClassVar[int] = logger_.level("DEBUG").no
+    LEVEL_INFO: ClassVar[int] = logger_.level("INFO").no
+    LEVEL_WARNING: ClassVar[int] = logger_.level("WARNING").no
+    LEVEL_ERROR: ClassVar[int] = logger_.level("ERROR").no
+
+    level_no: ClassVar[int] = (
+        logger_.level(log_level.upper()).no if isinstance(log_level, str) else log_level
+    )
+    """当前日志等级，低于该等级的日志直接跳过，不进行任何格式化"""
+
+    @classmethod
+    def set_level(cls, level: str | int):
+        """设置日志等级
+
+        参数:
+            level: 日志等级名称或等级数值
+        """
+        cls.level_no = (
+            logger_.level(level.upper()).no if isinstance(level, str) else level
+        )
+
+    @classmethod
+    def is_enabled(cls, level: str) -> bool:
+        """日志等级是否启用，用于跳过日志参数的计算
+
+        参数:
+            level: 日志等级名称
+
+        返回:
+            bool: 是否启用
+        """
+        return logger_.level(level.upper()).no >= cls.level_no
+
     @overload
     @classmethod
     def info(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: int | str | None = None,
@@ -69,36 +103,39 @@ class logger:
         adapter: str | None = None,
         target: Any = None,
         platform: str | None = None,
+        args: tuple | None = None,
     ): ...
 
     @overload
     @classmethod
     def info(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: Session | None = None,
         target: Any = None,
         platform: str | None = None,
+        args: tuple | None = None,
     ): ...
 
     @overload
     @classmethod
     def info(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: uninfoSession | None = None,
         target: Any = None,
         platform: str | None = None,
+        args: tuple | None = None,
     ): ...
 
     @classmethod
     def info(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: int | str | Session | uninfoSession | None = None,
@@ -106,29 +143,22 @@ class logger:
         adapter: str | None = None,
         target: Any = None,
         platform: str | None = None,
+        args: tuple | None = None,
     ):
-        user_id: str | None = session  # type: ignore
-        if isinstance(session, Session):
-            user_id = session.id1
-            adapter = session.bot_type
-            if session.id3:
-                group_id = f"{session.id3}:{session.id2}"
-            elif session.id2:
-                group_id = f"{session.id2}"
-            platform = platform or session.platform
-        elif isinstance(session, uninfoSession):
-            user_id = session.user.id
-            adapter = session.adapter
-            if session.group:
-                group_id = session.group.id
-            platform = session.basic["scope"]
-        template = cls.__parser_template(
-            info, command, user_id, group_id, adapter, target, platform
+        if cls.level_no > cls.LEVEL_INFO:
+            return
+        cls.__log(
+            "INFO",
+            info,
+            command,
+            session=session,
+            group_id=group_id,
+            adapter=adapter,
+            target=target,
+            platform=platform,
+            e=None,
+            args=args,
         )
-        try:
-            logger_.opt(colors=True).info(template)
-        except Exception:
-            logger_.info(template)
 
     @classmethod
     def success(
@@ -149,7 +179,7 @@ class logger:
     @classmethod
     def warning(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: int | str | None = None,
@@ -158,13 +188,14 @@ class logger:
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ): ...
 
     @overload
     @classmethod
     def warning(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: Session | None = None,
@@ -172,13 +203,14 @@ class logger:
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ): ...
 
     @overload
     @classmethod
     def warning(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: uninfoSession | None = None,
@@ -186,12 +218,13 @@ class logger:
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ): ...
 
     @classmethod
     def warning(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: int | str | Session | uninfoSession | None = None,
@@ -200,37 +233,28 @@ class logger:
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ):
-        user_id: str | None = session  # type: ignore
-        if isinstance(session, Session):
-            user_id = session.id1
-            adapter = session.bot_type
-            if session.id3:
-                group_id = f"{session.id3}:{session.id2}"
-            elif session.id2:
-                group_id = f"{session.id2}"
-            platform = platform or session.platform
-        elif isinstance(session, uninfoSession):
-            user_id = session.user.id
-            adapter = session.adapter
-            if session.group:
-                group_id = session.group.id
-            platform = session.basic["scope"]
-        template = cls.__parser_template(
-            info, command, user_id, group_id, adapter, target, platform
+        if cls.level_no > cls.LEVEL_WARNING:
+            return
+        cls.__log(
+            "WARNING",
+            info,
+            command,
+            session=session,
+            group_id=group_id,
+            adapter=adapter,
+            target=target,
+            platform=platform,
+            e=e,
+            args=args,
         )
-        if e:
-            template += f" || 错误<r>{type(e)}: {e}</r>"
-        try:
-            logger_.opt(colors=True).warning(template)
-        except Exception as e:
-            logger_.warning(template)
 
     @overload
     @classmethod
     def error(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: int | str | None = None,
@@ -239,38 +263,41 @@ class logger:
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ): ...
 
     @overload
     @classmethod
     def error(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: Session | None = None,
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ): ...
 
     @overload
     @classmethod
     def error(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: uninfoSession | None = None,
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ): ...
 
     @classmethod
     def error(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: int | str | Session | uninfoSession | None = None,
@@ -279,37 +306,28 @@ class logger:
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ):
-        user_id: str | None = session  # type: ignore
-        if isinstance(session, Session):
-            user_id = session.id1
-            adapter = session.bot_type
-            if session.id3:
-                group_id = f"{session.id3}:{session.id2}"
-            elif session.id2:
-                group_id = f"{session.id2}"
-            platform = platform or session.platform
-        elif isinstance(session, uninfoSession):
-            user_id = session.user.id
-            adapter = session.adapter
-            if session.group:
-                group_id = session.group.id
-            platform = session.basic["scope"]
-        template = cls.__parser_template(
-            info, command, user_id, group_id, adapter, target, platform
+        if cls.level_no > cls.LEVEL_ERROR:
+            return
+        cls.__log(
+            "ERROR",
+            info,
+            command,
+            session=session,
+            group_id=group_id,
+            adapter=adapter,
+            target=target,
+            platform=platform,
+            e=e,
+            args=args,
         )
-        if e:
-            template += f" || 错误 <r>{type(e)}: {e}</r>"
-        try:
-            logger_.opt(colors=True).error(template)
-        except Exception as e:
-            logger_.error(template)
 
     @overload
     @classmethod
     def debug(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: int | str | None = None,
@@ -318,38 +336,71 @@ class logger:
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ): ...
 
     @overload
     @classmethod
     def debug(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: Session | None = None,
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ): ...
 
     @overload
     @classmethod
     def debug(
         cls,
-        info: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: uninfoSession | None = None,
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ): ...
 
     @classmethod
     def debug(
         cls,
-        info: str,
+        info: str | Callable[[], str],
+        command: str | None = None,
+        *,
+        session: int | str | Session | uninfoSession | None = None,
+        group_id: int | str | None = None,
+        adapter: str | None = None,
+        target: Any = None,
+        platform: str | None = None,
+        e: Exception | None = None,
+        args: tuple | None = None,
+    ):
+        if cls.level_no > cls.LEVEL_DEBUG:
+            return
+        cls.__log(
+            "DEBUG",
+            info,
+            command,
+            session=session,
+            group_id=group_id,
+            adapter=adapter,
+            target=target,
+            platform=platform,
+            e=e,
+            args=args,
+        )
+
+    @classmethod
+    def __log(
+        cls,
+        level: str,
+        info: str | Callable[[], str],
         command: str | None = None,
         *,
         session: int | str | Session | uninfoSession | None = None,
@@ -358,7 +409,12 @@ class logger:
         target: Any = None,
         platform: str | None = None,
         e: Exception | None = None,
+        args: tuple | None = None,
     ):
+        if callable(info):
+            info = info()
+        if args:
+            info = info % args
         user_id: str | None = session  # type: ignore
         if isinstance(session, Session):
             user_id = session.id1
@@ -380,9 +436,9 @@ class logger:
         if e:
             template += f" || 错误 <r>{type(e)}: {e}</r>"
         try:
-            logger_.opt(colors=True).debug(template)
-        except Exception as e:
-            logger_.debug(template)
+            logger_.opt(colors=True).log(level, template)
+        except Exception:
+            logger_.log(level, template)
 
     @classmethod
     def __parser_template(
@@ -0,0 +1,224 @@
+import asyncio
+from datetime import datetime
+import time
+from typing import ClassVar
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.functions import Sum
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
+
+from zhenxun.models.rollup_state import RollupState
+
+from .db_context import Model
+from .log import logger
+
+
+def floor_hour(time: datetime) -> datetime:
+    """将时间截断至整点
+
+    参数:
+        time: 时间
+
+    返回:
+        datetime: 整点时间
+    """
+    return time.replace(minute=0, second=0, microsecond=0)
+
+
+async def sum_num(query: QuerySet) -> int:
+    """统计汇总表查询结果中 num 的总和
+
+    参数:
+        query: 汇总表查询
+
+    返回:
+        int: 数据条数
+    """
+    result = await query.annotate(total=Sum("num")).values_list("total", flat=True)
+    return int(result[0] or 0) if result else 0
+
+
+class HourRollup:
+    """
+    按小时汇总源表的数据条数
+
+    源表需要有自增 id 与 create_time 字段，汇总表需要有 hour 与 num 字段，
+    以及 (hour, *fields) 的唯一约束，汇总进度记录在 rollup_state 表中
+
+    并发写入时较小的id可能晚于较大的id提交，汇总时跳过的id会记录下来，
+    之后每次汇总重新查询，超过 gap_timeout 秒仍不存在时视为已回滚
+    """
+
+    gap_timeout: ClassVar[float] = 600
+    """等待跳过的id提交的时间（秒）"""
+    max_gap: ClassVar[int] = 1000
+    """最多记录的跳过的id数量，相邻id相差超过该值时不记录"""
+
+    rollups: ClassVar[list["HourRollup"]] = []
+
+    def __init__(
+        self,
+        source: type[Model],
+        target: type[Model],
+        fields: tuple[str, ...],
+        chunk_size: int = 5000,
+    ):
+        """
+        参数:
+            source: 源表
+            target: 汇总表
+            fields: 汇总的字段
+            chunk_size: 每次读取的源数据条数.
+        """
+        self.source = source
+        self.target = target
+        self.fields = fields
+        self.chunk_size = chunk_size
+        self.name = target._meta.db_table
+        self._lock = asyncio.Lock()
+        self.rollups.append(self)
+
+    def _upsert_sql(self, dialect: str) -> str:
+        columns = ["hour", *self.fields, "num"]
+        if dialect == "mysql":
+            return (
+                f"INSERT INTO `{self.name}` ({', '.join(columns)}) "
+                f"VALUES ({', '.join(['%s'] * len(columns))}) "
+                "ON DUPLICATE KEY UPDATE num = num + VALUES(num)"
+            )
+        if dialect == "postgres":
+            placeholders = ", ".join(f"${i + 1}" for i in range(len(columns)))
+        else:
+            placeholders = ", ".join(["?"] * len(columns))
+        return (
+            f'INSERT INTO "{self.name}" ({", ".join(columns)}) '
+            f"VALUES ({placeholders}) "
+            f"ON CONFLICT (hour, {', '.join(self.fields)}) "
+            f'DO UPDATE SET num = "{self.name}".num + excluded.num'
+        )
+
+    def _aggregate(self, rows: list[tuple], conn: BaseDBAsyncClient) -> list[list]:
+        fields_map = self.target._meta.fields_map
+        to_db_hour = conn.executor_class(self.target, conn).column_map["hour"]
+        max_length = [getattr(fields_map[f], "max_length", None) for f in self.fields]
+        data: dict[tuple, int] = {}
+        for row in rows:
+            key = [floor_hour(row[1])]
+            for value, length in zip(row[2:], max_length):
+                value = value or ""
+                key.append(value[:length] if length else value)
+            key = tuple(key)
+            data[key] = data.get(key, 0) + 1
+        return [
+            [to_db_hour(key[0], self.target), *key[1:], num]
+            for key, num in data.items()
+        ]
+
+    def _find_gaps(self, last_id: int, ids: list[int]) -> list[int]:
+        gaps = []
+        for idx in ids:
+            if idx - last_id - 1 <= self.max_gap:
+                gaps.extend(range(last_id + 1, idx))
+            last_id = idx
+        return gaps
+
+    async def _save(self, rows: list[tuple], last_id: int, gaps: dict[int, float]):
+        async with in_transaction() as conn:
+            if rows:
+                await conn.execute_many(
+                    self._upsert_sql(conn.capabilities.dialect),
+                    self._aggregate(rows, conn),  # type: ignore
+                )
+            await (
+                RollupState.filter(name=self.name)
+                .using_db(conn)
+                .update(last_id=last_id, gaps=[list(g) for g in gaps.items()])
+            )
+        if rows:
+            self.target.bump_data_version()
+
+    async def run(self, max_rows: int | None = 50000) -> int:
+        """汇总新增的源数据
+
+        参数:
+            max_rows: 本次最多汇总的源数据条数，为None时汇总全部.
+
+        返回:
+            int: 汇总的源数据条数
+        """
+        async with self._lock:
+            state, _ = await RollupState.get_or_create(name=self.name)
+            last_id = state.last_id
+            now = time.time()
+            gaps = {
+                idx: seen
+                for idx, seen in state.gaps or []
+                if now - seen < self.gap_timeout
+            }
+            rows = []
+            if gaps:
+                rows = await self.source.filter(id__in=list(gaps)).values_list(
+                    "id", "create_time", *self.fields
+                )
+                for row in rows:
+                    del gaps[row[0]]
+            if rows or len(gaps) != len(state.gaps or []):
+                await self._save(rows, last_id, gaps)  # type: ignore
+            total = len(rows)
+            while max_rows is None or total < max_rows:
+                rows = (
+                    await self.source.filter(id__gt=last_id)
+                    .order_by("id")
+                    .limit(self.chunk_size)
+                    .values_list("id", "create_time", *self.fields)
+                )
+                if not rows:
+                    break
+                for idx in self._find_gaps(last_id, [row[0] for row in rows]):
+                    gaps[idx] = now
+                if len(gaps) > self.max_gap:
+                    # 只保留最新的部分，补齐历史数据时被删除的数据不会无限累积
+                    gaps = dict(sorted(gaps.items())[-self.max_gap :])
+                last_id = rows[-1][0]
+                await self._save(rows, last_id, gaps)  # type: ignore
+                total += len(rows)
+                if len(rows) < self.chunk_size:
+                    break
+                await asyncio.sleep(0)
+        if total:
+            logger.debug(
+                "汇总 %s %d 条数据至 %s",
+                "HourRollup",
+                args=(self.source.__name__, total, self.name),
+            )
+        return total
+
+    async def rebuild(self) -> int:
+        """清空汇总表并重新汇总全部源数据
+
+        返回:
+            int: 汇总的源数据条数
+        """
+        async with self._lock:
+            await self.target.all().delete()
+            await RollupState.filter(name=self.name).delete()
+        return await self.run(None)
+
+    @classmethod
+    async def run_all(cls, max_rows: int | None = 50000) -> dict[str, int]:
+        """汇总所有汇总表
+
+        参数:
+            max_rows: 每个汇总表最多汇总的源数据条数，为None时汇总全部.
+
+        返回:
+            dict[str, int]: 汇总表名称: 汇总的源数据条数
+        """
+        result = {}
+        for rollup in cls.rollups:
+            try:
+                result[rollup.name] = await rollup.run(max_rows)
+            except Exception as e:
+                logger.error(f"汇总 {rollup.name} 失败", "HourRollup", e=e)
+        return result
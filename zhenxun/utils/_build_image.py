@@ -1,10 +1,12 @@
 import base64
+from collections.abc import Awaitable, Callable, Coroutine, Generator
 import contextlib
+from contextvars import ContextVar
+from functools import lru_cache, wraps
 from io import BytesIO
-import itertools
 import math
 from pathlib import Path
-from typing import Literal, TypeAlias, overload
+from typing import Any, Generic, Literal, ParamSpec, TypeAlias, TypeVar, overload
 from typing_extensions import Self
 import uuid
 
@@ -34,6 +36,93 @@ height: 垂直居中
 width: 水平居中
 """
 
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_INLINE: ContextVar[bool] = ContextVar("build_image_inline", default=False)
+"""为True时BuildImage的方法直接在当前线程执行，由 BuildImage.compose 设置"""
+
+
+class _Done(Generic[R]):
+    """已完成的结果，await 时直接返回"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: R):
+        self.value = value
+
+    def __await__(self) -> Generator[Any, None, R]:
+        return self.value
+        yield
+
+
+def _run_sync(call: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+    """与 run_sync 相同，在 BuildImage.compose 中时直接执行"""
+    async_call = run_sync(call)
+
+    @wraps(call)
+    def _wrapper(*args: P.args, **kwargs: P.kwargs) -> Awaitable[R]:
+        if _INLINE.get():
+            return _Done(call(*args, **kwargs))
+        return async_call(*args, **kwargs)
+
+    return _wrapper
+
+
+def _run_inline(coro: Coroutine[Any, Any, R]) -> R:
+    """在当前线程中执行只等待BuildImage方法的协程"""
+    token = _INLINE.set(True)
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    else:
+        coro.close()
+        raise RuntimeError("BuildImage.compose 中只能等待BuildImage的方法")
+    finally:
+        _INLINE.reset(token)
+
+
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+"""测量多行文本使用的画布"""
+
+
+@lru_cache(maxsize=256)
+def _truetype(path: str, font_size: int) -> FreeTypeFont:
+    return ImageFont.truetype(path, font_size)
+
+
+@lru_cache(maxsize=64)
+def _circle_mask(r2: int) -> tImage:
+    """r2 x r2 的抗锯齿圆形遮罩"""
+    width = 1
+    antialias = 4
+    ellipse_box = [0, 0, r2 - 2, r2 - 2]
+    mask = Image.new("L", (r2 * antialias, r2 * antialias), "black")
+    draw = ImageDraw.Draw(mask)
+    for offset, fill in (width / -2.0, "black"), (width / 2.0, "white"):
+        left, top = ((value + offset) * antialias for value in ellipse_box[:2])
+        right, bottom = ((value - offset) * antialias for value in ellipse_box[2:])
+        draw.ellipse([left, top, right, bottom], fill=fill)
+    return mask.resize((r2, r2), Resampling.LANCZOS)
+
+
+@lru_cache(maxsize=64)
+def _corner_circle(radii: int) -> tImage:
+    """黑色方形内切白色圆形，用于分离4个角"""
+    circle = Image.new("L", (radii * 2, radii * 2), 0)
+    ImageDraw.Draw(circle).ellipse((0, 0, radii * 2, radii * 2), fill=255)
+    return circle
+
+
+@lru_cache(maxsize=8192)
+def _text_bbox(
+    font: FreeTypeFont | ImageFont.ImageFont, text: str
+) -> tuple[int, int, int, int]:
+    if "\n" in text:
+        return _MEASURE_DRAW.multiline_textbbox((0, 0), text, font=font)  # type: ignore
+    return font.getbbox(text)  # type: ignore
+
 
 class BuildImage:
     """
@@ -89,6 +178,61 @@ class BuildImage:
         """
         return cls(background=path)
 
+    @classmethod
+    def linear_gradient(
+        cls,
+        width: int,
+        height: int,
+        start: tuple[int, int, int],
+        end: tuple[int, int, int],
+    ) -> Self:
+        """水平渐变图片，第 x 列颜色为 start + (end - start) / width * x
+
+        参数:
+            width: 宽度
+            height: 高度
+            start: 左侧颜色
+            end: 右侧颜色
+
+        返回:
+            Self: BuildImage
+        """
+        bands = []
+        for c1, c2 in zip(start, end):
+            step = (c2 - c1) / width
+            row = bytes(round(c1 + step * x) for x in range(width))
+            band = Image.frombytes("L", (width, 1), row)
+            bands.append(band.resize((width, height), Resampling.NEAREST))
+        bands.append(Image.new("L", (width, height), 255))
+        image = cls(width, height)
+        image.markImg = Image.merge("RGBA", bands)
+        image.draw = ImageDraw.Draw(image.markImg)
+        return image
+
+    @classmethod
+    async def compose(
+        cls,
+        func: Callable[P, Coroutine[Any, Any, R]],
+        *args: P.args,
+        **kwargs: P.kwargs,
+    ) -> R:
+        """在一个工作线程中执行整个绘图过程
+
+        func 中对BuildImage方法的 await 直接在该线程中执行，
+        不再每个方法单独切换一次线程，func 中不能等待数据库、网络等其他异步操作
+
+        参数:
+            func: 绘图过程
+            args: func 的参数
+            kwargs: func 的参数
+
+        返回:
+            R: func 的返回值
+        """
+        if _INLINE.get():
+            return await func(*args, **kwargs)
+        return await run_sync(_run_inline)(func(*args, **kwargs))
+
     @classmethod
     async def build_text_image(
         cls,
@@ -192,7 +336,7 @@ class BuildImage:
     def load_font(
         cls, font: str | Path = "HYWenHei-85W.ttf", font_size: int = 10
     ) -> FreeTypeFont:
-        """加载字体
+        """加载字体，相同路径与大小的字体只加载一次
 
         参数:
             font: 字体名称
@@ -202,7 +346,7 @@ class BuildImage:
             FreeTypeFont: 字体
         """
         path = FONT_PATH / font if type(font) is str else font
-        return ImageFont.truetype(str(path), font_size)
+        return _truetype(str(path), font_size)
 
     @overload
     @classmethod
@@ -236,9 +380,7 @@ class BuildImage:
         _font = font
         if font and type(font) is str:
             _font = cls.load_font(font, font_size)
-        temp_image = Image.new("RGB", (1, 1), (255, 255, 255))
-        draw = ImageDraw.Draw(temp_image)
-        text_box = draw.textbbox((0, 0), str(text), font=_font)  # type: ignore
+        text_box = _text_bbox(_font or _MEASURE_DRAW.getfont(), str(text))  # type: ignore
         text_width = text_box[2] - text_box[0]
         text_height = text_box[3] - text_box[1]
         return text_width, text_height + 10
@@ -255,9 +397,7 @@ class BuildImage:
         返回:
             tuple[int, int]: 长宽
         """
-        temp_image = Image.new("RGB", (1, 1), (255, 255, 255))
-        draw = ImageDraw.Draw(temp_image)
-        text_box = draw.textbbox((0, 0), str(msg), font=self.font)
+        text_box = _text_bbox(self.font, str(msg))
         text_width = text_box[2] - text_box[0]
         text_height = text_box[3] - text_box[1]
         return text_width, text_height + 10
@@ -294,7 +434,7 @@ class BuildImage:
                 height = int((self.height - height) / 2)
         return width, height
 
-    @run_sync
+    @_run_sync
     def paste(
         self,
         image: Self | tImage,
@@ -327,7 +467,7 @@ class BuildImage:
             self.markImg.paste(_image, pos)  # type: ignore
         return self
 
-    @run_sync
+    @_run_sync
     def point(
         self, pos: tuple[int, int], fill: tuple[int, int, int] | None = None
     ) -> Self:
@@ -344,7 +484,7 @@ class BuildImage:
         self.draw.point(pos, fill=fill)
         return self
 
-    @run_sync
+    @_run_sync
     def ellipse(
         self,
         pos: tuple[int, int, int, int],
@@ -367,7 +507,7 @@ class BuildImage:
         self.draw.ellipse(pos, fill, outline, width)
         return self
 
-    @run_sync
+    @_run_sync
     def text(
         self,
         pos: tuple[int, int],
@@ -412,7 +552,7 @@ class BuildImage:
         self.draw.text(pos, str(text), fill=fill, font=font)
         return self
 
-    @run_sync
+    @_run_sync
     def save(self, path: str | Path):
         """
         保存图片
@@ -429,7 +569,7 @@ class BuildImage:
         """
         self.markImg.show()
 
-    @run_sync
+    @_run_sync
     def resize(self, ratio: float = 0, width: int = 0, height: int = 0) -> Self:
         """
         压缩图片
@@ -456,7 +596,7 @@ class BuildImage:
             self.draw = ImageDraw.Draw(self.markImg)
         return self
 
-    @run_sync
+    @_run_sync
     def crop(self, box: tuple[int, int, int, int]) -> Self:
         """
         裁剪图片
@@ -472,7 +612,7 @@ class BuildImage:
         self.draw = ImageDraw.Draw(self.markImg)
         return self
 
-    @run_sync
+    @_run_sync
     def transparent(self, alpha_ratio: float = 1, n: int = 0) -> Self:
         """
         图片透明化
@@ -486,10 +626,10 @@ class BuildImage:
         """
         self.markImg = self.markImg.convert("RGBA")
         x, y = self.markImg.size
-        for i, k in itertools.product(range(n, x - n), range(n, y - n)):
-            color = self.markImg.getpixel((i, k))
-            color = color[:-1] + (int(100 * alpha_ratio),)  # type: ignore
-            self.markImg.putpixel((i, k), color)
+        if x - n > n and y - n > n:
+            alpha = self.markImg.getchannel("A")
+            alpha.paste(int(100 * alpha_ratio), (n, n, x - n, y - n))
+            self.markImg.putalpha(alpha)
         self.draw = ImageDraw.Draw(self.markImg)
         return self
 
@@ -504,20 +644,40 @@ class BuildImage:
         base64_str = base64.b64encode(buf.getvalue()).decode()
         return f"base64://{base64_str}"
 
-    def pic2bytes(self) -> bytes:
-        """获取bytes
+    def pic2bytes(
+        self,
+        img_format: Literal["PNG", "JPEG", "WEBP"] = "PNG",
+        compress_level: int = 6,
+        quality: int = 85,
+    ) -> bytes:
+        """获取bytes，GIF图片保持为GIF
+
+        参数:
+            img_format: 编码格式.
+            compress_level: PNG压缩等级，0-9，越小编码越快.
+            quality: JPEG/WEBP质量.
 
         返回:
             bytes: bytes
         """
         buf = BytesIO()
-        img_format = self.markImg.format.upper() if self.markImg.format else "PNG"
-
-        if img_format == "GIF":
+        if self.markImg.format and self.markImg.format.upper() == "GIF":
             self.markImg.save(buf, format="GIF", save_all=True, loop=0)
+        elif img_format == "PNG":
+            self.markImg.save(buf, format="PNG", compress_level=compress_level)
+        elif img_format == "JPEG":
+            image = self.markImg
+            if image.mode in ("RGBA", "LA", "P"):
+                # JPEG没有透明通道，铺到白色背景上
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+            image.save(buf, format="JPEG", quality=quality)
         else:
-            self.markImg.save(buf, format="PNG")
-
+            self.markImg.save(buf, format=img_format, quality=quality)
         return buf.getvalue()
 
     def convert(self, type_: ModeType) -> Self:
@@ -533,7 +693,7 @@ class BuildImage:
         self.markImg = self.markImg.convert(type_)
         return self
 
-    @run_sync
+    @_run_sync
     def rectangle(
         self,
         xy: tuple[int, int, int, int],
@@ -556,7 +716,7 @@ class BuildImage:
         self.draw.rectangle(xy, fill, outline, width)
         return self
 
-    @run_sync
+    @_run_sync
     def polygon(
         self,
         xy: list[tuple[int, int]],
@@ -577,7 +737,7 @@ class BuildImage:
         self.draw.polygon(xy, fill, outline)
         return self
 
-    @run_sync
+    @_run_sync
     def line(
         self,
         xy: tuple[int, int, int, int],
@@ -598,7 +758,7 @@ class BuildImage:
         self.draw.line(xy, fill, width)
         return self
 
-    @run_sync
+    @_run_sync
     def circle(self) -> Self:
         """
         图像变圆
@@ -606,30 +766,16 @@ class BuildImage:
         返回:
             BuildImage: Self
         """
-        self.markImg.convert("RGBA")
         size = self.markImg.size
         r2 = min(size[0], size[1])
         if size[0] != size[1]:
             self.markImg = self.markImg.resize((r2, r2), Image.LANCZOS)  # type: ignore
-        width = 1
-        antialias = 4
-        ellipse_box = [0, 0, r2 - 2, r2 - 2]
-        mask = Image.new(
-            size=[int(dim * antialias) for dim in self.markImg.size],  # type: ignore
-            mode="L",
-            color="black",
-        )
-        draw = ImageDraw.Draw(mask)
-        for offset, fill in (width / -2.0, "black"), (width / 2.0, "white"):
-            left, top = ((value + offset) * antialias for value in ellipse_box[:2])
-            right, bottom = ((value - offset) * antialias for value in ellipse_box[2:])
-            draw.ellipse([left, top, right, bottom], fill=fill)
-        mask = mask.resize(self.markImg.size, Resampling.LANCZOS)
         with contextlib.suppress(ValueError):
-            self.markImg.putalpha(mask)
+            self.markImg.putalpha(_circle_mask(r2))
+        self.draw = ImageDraw.Draw(self.markImg)
         return self
 
-    @run_sync
+    @_run_sync
     def circle_corner(
         self,
         radii: int = 30,
@@ -649,10 +795,8 @@ class BuildImage:
             point_list = ["lt", "rt", "lb", "rb"]
         # 画圆（用于分离4个角）
         img = self.markImg.convert("RGBA")
-        alpha = img.split()[-1]
-        circle = Image.new("L", (radii * 2, radii * 2), 0)
-        draw = ImageDraw.Draw(circle)
-        draw.ellipse((0, 0, radii * 2, radii * 2), fill=255)  # 黑色方形内切白色圆形
+        alpha = img.getchannel("A")
+        circle = _corner_circle(radii)
         w, h = img.size
         if "lt" in point_list:
             alpha.paste(circle.crop((0, 0, radii, radii)), (0, 0))
@@ -670,7 +814,7 @@ class BuildImage:
         self.draw = ImageDraw.Draw(self.markImg)
         return self
 
-    @run_sync
+    @_run_sync
     def rotate(self, angle: int, expand: bool = False) -> Self:
         """
         旋转图片
@@ -685,7 +829,7 @@ class BuildImage:
         self.markImg = self.markImg.rotate(angle, expand=expand)
         return self
 
-    @run_sync
+    @_run_sync
     def transpose(self, angle: Transpose) -> Self:
         """
         旋转图片(包括边框)
@@ -699,7 +843,7 @@ class BuildImage:
         self.markImg.transpose(angle)
         return self
 
-    @run_sync
+    @_run_sync
     def filter(self, filter_: str, aud: int | None = None) -> Self:
         """
         图片变化
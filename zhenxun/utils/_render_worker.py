@@ -0,0 +1,27 @@
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import nonebot
+
+from ._build_image import BuildImage, _run_inline
+
+RenderFunc = Callable[..., Coroutine[Any, Any, BuildImage]]
+
+
+def init_worker():
+    """渲染进程初始化，导入 zhenxun.utils 等模块时需要已初始化的 nonebot"""
+    nonebot.init()
+
+
+def render(func: RenderFunc, args: tuple, kwargs: dict) -> bytes:
+    """在渲染进程中执行绘图函数
+
+    参数:
+        func: 返回BuildImage的绘图函数
+        args: func 的参数
+        kwargs: func 的参数
+
+    返回:
+        bytes: PNG图片
+    """
+    return _run_inline(func(*args, **kwargs)).pic2bytes()
@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from typing import overload
 
 from nonebot.adapters import Bot
@@ -12,6 +13,27 @@ from zhenxun.services.log import logger
 
 
 class CommonUtils:
+    @classmethod
+    def _is_qq_api(cls, session: Uninfo | Bot) -> bool:
+        if isinstance(session, Bot):
+            interface = get_interface(session)
+            return bool(
+                interface and interface.basic_info()["scope"] == SupportScope.qq_api
+            )
+        return session.scope == SupportScope.qq_api
+
+    @classmethod
+    async def _is_global_task_block(cls, bot_id: str, module: str) -> bool:
+        """被动全局关闭，bot休眠或bot禁用被动"""
+        if task := await TaskInfo.get_or_none(module=module):
+            """被动全局状态"""
+            if not task.status:
+                return True
+        if not await BotConsole.get_bot_status(bot_id):
+            """bot是否休眠"""
+            return True
+        return await BotConsole.is_block_task(bot_id, module)
+
     @classmethod
     async def task_is_block(
         cls, session: Uninfo | Bot, module: str, group_id: str | None = None
@@ -25,44 +47,55 @@ class CommonUtils:
         返回:
             bool: 是否可以发送
         """
-        if isinstance(session, Bot):
-            if interface := get_interface(session):
-                info = interface.basic_info()
-                if info["scope"] == SupportScope.qq_api:
-                    logger.info("q官bot放弃所有被动技能发言...")
-                    """q官bot放弃所有被动技能发言"""
-                    return False
-        if session.scene == SupportScope.qq_api:
+        if cls._is_qq_api(session):
             """q官bot放弃所有被动技能发言"""
             logger.info("q官bot放弃所有被动技能发言...")
             return False
         if not group_id and isinstance(session, Session):
             group_id = session.group.id if session.group else None
-        if task := await TaskInfo.get_or_none(module=module):
-            """被动全局状态"""
-            if not task.status:
-                return True
-        if not await BotConsole.get_bot_status(session.self_id):
-            """bot是否休眠"""
-            return True
-        block_tasks = await BotConsole.get_tasks(session.self_id, False)
-        if module in block_tasks:
-            """bot是否禁用被动"""
-            return True
-        if group_id:
-            if await GroupConsole.is_block_task(group_id, module):
-                """群组是否禁用被动"""
-                return True
-            if g := await GroupConsole.get_or_none(
-                group_id=group_id, channel_id__isnull=True
-            ):
-                """群组权限是否小于0"""
-                if g.level < 0:
-                    return True
+        if not group_id:
+            return await cls._is_global_task_block(session.self_id, module)
+        return group_id in await cls.task_is_block_many(session, module, [group_id])
+
+    @classmethod
+    async def task_is_block_many(
+        cls, session: Uninfo | Bot, module: str, group_ids: Iterable[str]
+    ) -> set[str]:
+        """批量判断被动技能是否可以发送，查询次数与群组数量无关
+
+        参数:
+            session: Uninfo 或 Bot
+            module: 被动技能模块名
+            group_ids: 群组id列表
+
+        返回:
+            set[str]: 禁用该被动的群组id
+        """
+        group_ids = set(group_ids)
+        if cls._is_qq_api(session):
+            """q官bot放弃所有被动技能发言"""
+            return set()
+        if await cls._is_global_task_block(session.self_id, module):
+            return group_ids
+        block_data = await GroupConsole.get_all_block_data()
+        """群组是否禁用被动"""
+        blocked = {
+            group_id
+            for group_id in group_ids
+            if (data := block_data.get(group_id, {}).get(None))
+            and (module in data.superuser_block_task or module in data.block_task)
+        }
+        """群组权限是否小于0"""
+        blocked |= group_ids & set(
+            await GroupConsole.filter(channel_id__isnull=True, level__lt=0).values_list(
+                "group_id", flat=True
+            )
+        )
+        """群组是否被ban"""
+        for group_id in group_ids - blocked:
             if await BanConsole.is_ban(None, group_id):
-                """群组是否被ban"""
-                return True
-        return False
+                blocked.add(group_id)
+        return blocked
 
     @staticmethod
     def format(name: str) -> str:
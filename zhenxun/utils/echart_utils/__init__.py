@@ -1,9 +1,8 @@
 import os
 import random
 
-from nonebot_plugin_htmlrender import template_to_pic
-
 from zhenxun.configs.path_config import TEMPLATE_PATH
+from zhenxun.services.html_render import HtmlRender
 from zhenxun.utils._build_image import BuildImage
 
 from .models import Barh
@@ -19,7 +18,7 @@ class ChartUtils:
         to_json["background_image"] = (
             f"./background/{random.choice(os.listdir(BACKGROUND_PATH))}"
         )
-        pic = await template_to_pic(
+        pic = await HtmlRender.template_to_pic(
             template_path=str((TEMPLATE_PATH / "bar_chart").absolute()),
             template_name="main.html",
             templates={"data": to_json},
@@ -27,6 +26,5 @@ class ChartUtils:
                 "viewport": {"width": 1000, "height": 1000},
                 "base_url": f"file://{TEMPLATE_PATH}",
             },
-            wait=2,
         )
         return BuildImage.open(pic)
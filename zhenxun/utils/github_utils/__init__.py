@@ -1,13 +1,20 @@
 from collections.abc import Generator
 
 from .const import GITHUB_REPO_URL_PATTERN
-from .func import get_fastest_archive_formats, get_fastest_raw_formats
+from .func import (
+    MirrorGroup,
+    get_fastest_archive_formats,
+    get_fastest_raw_formats,
+    get_mirror_stats,
+)
 from .models import GitHubStrategy, JsdelivrStrategy, RepoAPI, RepoInfo
 
 __all__ = [
     "GithubUtils",
+    "MirrorGroup",
     "get_fastest_archive_formats",
     "get_fastest_raw_formats",
+    "get_mirror_stats",
 ]
 
 
@@ -18,6 +18,15 @@ GIT_API_TREES_FORMAT = (
 CACHED_API_TTL = 300
 """缓存api ttl"""
 
+MIRROR_TTL = 600
+"""镜像探测结果有效时间"""
+
+MIRROR_PROBE_TIMEOUT = 6
+"""镜像探测超时时间"""
+
+MIRROR_MIN_PROBE_INTERVAL = 60
+"""镜像失败后重新探测的最小间隔"""
+
 RAW_CONTENT_FORMAT = "https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{path}"
 """raw content格式"""
 
@@ -1,64 +1,202 @@
-from aiocache import cached
+import asyncio
+import time
+from typing import Any, ClassVar
 
-from zhenxun.utils.http_utils import AsyncHttpx
+from zhenxun.services.log import logger
+from zhenxun.utils.http_utils import AsyncHttpx, MirrorStats
 
 from .const import (
     ARCHIVE_URL_FORMAT,
+    MIRROR_MIN_PROBE_INTERVAL,
+    MIRROR_PROBE_TIMEOUT,
+    MIRROR_TTL,
     RAW_CONTENT_FORMAT,
     RELEASE_ASSETS_FORMAT,
     RELEASE_SOURCE_FORMAT,
 )
 
 
-async def __get_fastest_formats(formats: dict[str, str]) -> list[str]:
-    sorted_urls = await AsyncHttpx.get_fastest_mirror(list(formats.keys()))
-    if not sorted_urls:
-        raise Exception("无法获取任意GitHub资源加速地址，请检查网络")
-    return [formats[url] for url in sorted_urls]
+class MirrorGroup:
+    """
+    一组可相互替代的GitHub资源加速地址
 
+    首次获取时探测所有镜像（并发调用只探测一次），探测结果超过 ttl 后先返回旧结果，
+    并在后台重新探测，镜像顺序根据探测与实际下载的耗时和失败率调整
+    """
 
-@cached()
-async def get_fastest_raw_formats() -> list[str]:
-    """获取最快的raw下载地址格式"""
-    formats: dict[str, str] = {
+    groups: ClassVar[list["MirrorGroup"]] = []
+
+    def __init__(self, name: str, formats: dict[str, str], ttl: float = MIRROR_TTL):
+        """
+        参数:
+            name: 名称
+            formats: 探测地址: 下载地址格式
+            ttl: 探测结果有效时间（秒）.
+        """
+        self.name = name
+        self.formats = formats
+        self.ttl = ttl
+        self.available: list[str] = []
+        """探测可用的镜像，按探测耗时排序"""
+        self.probe_time = 0.0
+        """上一次探测时间"""
+        self.probe_count = 0
+        """探测次数"""
+        self._task: asyncio.Task | None = None
+        self.groups.append(self)
+
+    async def _head(self, url: str) -> float:
+        begin_time = time.perf_counter()
+        await AsyncHttpx.head(url=url, timeout=MIRROR_PROBE_TIMEOUT)
+        return time.perf_counter() - begin_time
+
+    async def _probe(self):
+        urls = list(self.formats)
+        logger.debug(
+            f"开始探测 {self.name} 镜像，可能需要一段时间... | URL列表：{urls}",
+            "GithubUtils",
+        )
+        results = await asyncio.gather(
+            *(self._head(url) for url in urls), return_exceptions=True
+        )
+        elapsed: dict[str, float] = {}
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"探测镜像 {url} 失败，错误：{result}", "GithubUtils")
+                MirrorStats.record(self.formats[url], None)
+            else:
+                elapsed[url] = result
+                MirrorStats.record(self.formats[url], result)
+        self.probe_time = time.time()
+        self.probe_count += 1
+        if elapsed or not self.available:
+            self.available = sorted(elapsed, key=lambda url: elapsed[url])
+        logger.debug(f"{self.name} 可用镜像：{self.available}", "GithubUtils")
+
+    async def refresh(self):
+        """重新探测镜像，探测进行中时等待该次探测完成"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._probe())
+        await asyncio.shield(self._task)
+
+    def _refresh_background(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._probe())
+
+    def is_expired(self) -> bool:
+        """探测结果是否过期"""
+        elapsed = time.time() - self.probe_time
+        if elapsed > self.ttl:
+            return True
+        if elapsed < MIRROR_MIN_PROBE_INTERVAL:
+            return False
+        # 当前最优镜像频繁失败时提前重新探测
+        stat = MirrorStats.data.get(
+            MirrorStats.get_key(self.formats[self.available[0]])
+        )
+        return stat is not None and stat.error_rate > 0.5
+
+    async def get_formats(self) -> list[str]:
+        """获取按速度排序的下载地址格式
+
+        返回:
+            list[str]: 下载地址格式
+        """
+        if not self.available:
+            await self.refresh()
+        elif self.is_expired():
+            self._refresh_background()
+        if not self.available:
+            raise Exception("无法获取任意GitHub资源加速地址，请检查网络")
+        return MirrorStats.sort([self.formats[url] for url in self.available])
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取镜像状态
+
+        返回:
+            dict[str, Any]: 镜像状态
+        """
+        stats = MirrorStats.get_stats()
+        return {
+            "name": self.name,
+            "probe_time": self.probe_time,
+            "probe_count": self.probe_count,
+            "available": list(self.available),
+            "mirrors": {
+                url: stats.get(MirrorStats.get_key(url_format))
+                for url, url_format in self.formats.items()
+            },
+        }
+
+
+RAW_MIRRORS = MirrorGroup(
+    "raw",
+    {
         "https://raw.githubusercontent.com/": RAW_CONTENT_FORMAT,
         "https://ghproxy.cc/": f"https://ghproxy.cc/{RAW_CONTENT_FORMAT}",
         "https://mirror.ghproxy.com/": f"https://mirror.ghproxy.com/{RAW_CONTENT_FORMAT}",
         "https://gh-proxy.com/": f"https://gh-proxy.com/{RAW_CONTENT_FORMAT}",
         "https://cdn.jsdelivr.net/": "https://cdn.jsdelivr.net/gh/{owner}/{repo}@{branch}/{path}",
-    }
-    return await __get_fastest_formats(formats)
-
+    },
+)
+"""raw下载地址"""
 
-@cached()
-async def get_fastest_archive_formats() -> list[str]:
-    """获取最快的归档下载地址格式"""
-    formats: dict[str, str] = {
+ARCHIVE_MIRRORS = MirrorGroup(
+    "archive",
+    {
         "https://github.com/": ARCHIVE_URL_FORMAT,
         "https://ghproxy.cc/": f"https://ghproxy.cc/{ARCHIVE_URL_FORMAT}",
         "https://mirror.ghproxy.com/": f"https://mirror.ghproxy.com/{ARCHIVE_URL_FORMAT}",
         "https://gh-proxy.com/": f"https://gh-proxy.com/{ARCHIVE_URL_FORMAT}",
-    }
-    return await __get_fastest_formats(formats)
-
+    },
+)
+"""归档下载地址"""
 
-@cached()
-async def get_fastest_release_formats() -> list[str]:
-    """获取最快的发行版资源下载地址格式"""
-    formats: dict[str, str] = {
+RELEASE_MIRRORS = MirrorGroup(
+    "release",
+    {
         "https://objects.githubusercontent.com/": RELEASE_ASSETS_FORMAT,
         "https://ghproxy.cc/": f"https://ghproxy.cc/{RELEASE_ASSETS_FORMAT}",
         "https://mirror.ghproxy.com/": f"https://mirror.ghproxy.com/{RELEASE_ASSETS_FORMAT}",
         "https://gh-proxy.com/": f"https://gh-proxy.com/{RELEASE_ASSETS_FORMAT}",
-    }
-    return await __get_fastest_formats(formats)
+    },
+)
+"""发行版资源下载地址"""
+
+RELEASE_SOURCE_MIRRORS = MirrorGroup(
+    "release_source",
+    {
+        "https://codeload.github.com/": RELEASE_SOURCE_FORMAT,
+        "https://p.102333.xyz/": f"https://p.102333.xyz/{RELEASE_SOURCE_FORMAT}",
+    },
+)
+"""发行版源码下载地址"""
+
+
+async def get_fastest_raw_formats() -> list[str]:
+    """获取最快的raw下载地址格式"""
+    return await RAW_MIRRORS.get_formats()
+
+
+async def get_fastest_archive_formats() -> list[str]:
+    """获取最快的归档下载地址格式"""
+    return await ARCHIVE_MIRRORS.get_formats()
+
+
+async def get_fastest_release_formats() -> list[str]:
+    """获取最快的发行版资源下载地址格式"""
+    return await RELEASE_MIRRORS.get_formats()
 
 
-@cached()
 async def get_fastest_release_source_formats() -> list[str]:
     """获取最快的发行版源码下载地址格式"""
-    formats: dict[str, str] = {
-        "https://codeload.github.com/": RELEASE_SOURCE_FORMAT,
-        "https://p.102333.xyz/": f"https://p.102333.xyz/{RELEASE_SOURCE_FORMAT}",
-    }
-    return await __get_fastest_formats(formats)
+    return await RELEASE_SOURCE_MIRRORS.get_formats()
+
+
+def get_mirror_stats() -> list[dict[str, Any]]:
+    """获取所有镜像组的状态
+
+    返回:
+        list[dict[str, Any]]: 镜像组状态
+    """
+    return [group.get_stats() for group in MirrorGroup.groups]
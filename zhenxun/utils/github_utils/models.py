@@ -47,6 +47,24 @@ class RepoInfo(BaseModel):
             url_format.format(**self.to_dict(), path=path) for url_format in url_formats
         ]
 
+    async def get_raw_download_urls_list(self, paths: list[str]) -> list[list[str]]:
+        """批量获取raw下载地址，所有文件使用同一镜像顺序
+
+        参数:
+            paths: 文件路径列表
+
+        返回:
+            list[list[str]]: 每个文件的下载地址列表
+        """
+        if not paths:
+            return []
+        url_formats = await get_fastest_raw_formats()
+        repo = self.to_dict()
+        return [
+            [url_format.format(**repo, path=path) for url_format in url_formats]
+            for path in paths
+        ]
+
     async def get_archive_download_urls(self) -> list[str]:
         url_formats = await get_fastest_archive_formats()
         return [url_format.format(**self.to_dict()) for url_format in url_formats]
@@ -1,15 +1,20 @@
 import asyncio
 from asyncio.exceptions import TimeoutError
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
+import hashlib
+import importlib.util
 from pathlib import Path
 import time
-from typing import Any, ClassVar, Literal
+from typing import Any, ClassVar, Literal, TypeVar
 
 import aiofiles
 from anyio import EndOfStream
 import httpx
-from httpx import ConnectTimeout, HTTPStatusError, Response
+from httpx import URL, HTTPStatusError, Response
+import nonebot
+from nonebot.utils import run_sync
 from nonebot_plugin_alconna import UniMessage
 from nonebot_plugin_htmlrender import get_browser
 from playwright.async_api import Page
@@ -23,12 +28,252 @@ from zhenxun.utils.user_agent import get_user_agent
 
 # from .browser import get_browser
 
+driver = nonebot.get_driver()
+
+T = TypeVar("T")
+
+
+_request_cookies: ContextVar[httpx.Cookies | None] = ContextVar(
+    "_request_cookies", default=None
+)
+
+
+class _PooledClient(httpx.AsyncClient):
+    """
+    每次 send 使用独立 cookies 的客户端
+
+    重定向过程中响应设置的 cookies 会带到后续请求，请求结束后丢弃，
+    不同请求之间不共享 cookies
+    """
+
+    @property
+    def cookies(self) -> httpx.Cookies:
+        cookies = _request_cookies.get()
+        return httpx.Cookies() if cookies is None else cookies
+
+    @cookies.setter
+    def cookies(self, cookies: Any):
+        pass
+
+    async def send(self, request: httpx.Request, **kwargs: Any) -> Response:
+        token = _request_cookies.set(httpx.Cookies())
+        try:
+            return await super().send(request, **kwargs)
+        finally:
+            _request_cookies.reset(token)
+
+
+class HttpClientPool:
+    """
+    共享的 httpx.AsyncClient，按 (代理, verify) 复用连接
+
+    连接保持与 HTTP/2（需安装 h2）由 httpx 连接池处理，
+    单个域名的同时请求数由 host_limit 限制，
+    cookies 只在单次请求（包括重定向）内有效，避免不同请求之间相互影响
+    """
+
+    limits: ClassVar[httpx.Limits] = httpx.Limits(
+        max_connections=BotConfig.http_max_connections,
+        max_keepalive_connections=BotConfig.http_max_keepalive,
+        keepalive_expiry=BotConfig.http_keepalive_expiry,
+    )
+    """连接池限制"""
+    host_limit: ClassVar[int] = BotConfig.http_host_limit
+    """单个域名最大同时请求数"""
+    http2: ClassVar[bool] = (
+        BotConfig.http2 and importlib.util.find_spec("h2") is not None
+    )
+    """是否启用HTTP/2"""
+    _clients: ClassVar[dict[tuple, httpx.AsyncClient]] = {}
+    _host_semaphores: ClassVar[dict[str, asyncio.Semaphore]] = {}
+
+    @classmethod
+    def get_client(
+        cls, proxy: dict[str, str | None] | None = None, verify: bool = True
+    ) -> httpx.AsyncClient:
+        """获取共享客户端
+
+        参数:
+            proxy: 代理.
+            verify: verify.
+
+        返回:
+            httpx.AsyncClient: 客户端
+        """
+        key = (tuple(sorted(proxy.items())) if proxy else None, verify)
+        client = cls._clients.get(key)
+        if client is None or client.is_closed:
+            client = _PooledClient(
+                proxies=proxy,  # type: ignore
+                verify=verify,
+                http2=cls.http2,
+                limits=cls.limits,
+            )
+            cls._clients[key] = client
+        return client
+
+    @classmethod
+    @asynccontextmanager
+    async def host_slot(cls, url: str) -> AsyncGenerator[None, None]:
+        """占用域名的请求数，超过 host_limit 时等待
+
+        参数:
+            url: url
+        """
+        host = URL(url).host
+        semaphore = cls._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = cls._host_semaphores[host] = asyncio.Semaphore(cls.host_limit)
+        async with semaphore:
+            yield
+
+    @classmethod
+    async def close(cls):
+        """关闭所有客户端"""
+        clients = list(cls._clients.values())
+        cls._clients.clear()
+        cls._host_semaphores.clear()
+        for client in clients:
+            await client.aclose()
+
+
+class MirrorStat:
+    """单个镜像的请求统计"""
+
+    __slots__ = ("failure", "latency", "success")
+
+    def __init__(self):
+        self.latency: float | None = None
+        """成功请求耗时的指数移动平均（秒）"""
+        self.success = 0.0
+        """衰减后的成功次数"""
+        self.failure = 0.0
+        """衰减后的失败次数"""
+
+    @property
+    def error_rate(self) -> float:
+        total = self.success + self.failure
+        return self.failure / total if total else 0.0
+
+    def score(self, default_latency: float, penalty: float) -> float:
+        """预计获得成功响应所需时间，越小越好
+
+        参数:
+            default_latency: 没有成功记录时使用的耗时
+            penalty: 每次失败额外损失的时间
+        """
+        latency = default_latency if self.latency is None else self.latency
+        error_rate = min(self.error_rate, 0.95)
+        return latency + error_rate / (1 - error_rate) * penalty
+
+
+class MirrorStats:
+    """
+    按镜像（scheme://host[:port]）记录请求延迟与失败率，用于调整镜像顺序
+
+    新的请求结果权重为 alpha，旧的统计按 1 - alpha 衰减，
+    镜像恢复后排序会逐渐回到前面
+    """
+
+    alpha: ClassVar[float] = 0.3
+    """新结果的权重"""
+    failure_penalty: ClassVar[float] = 2
+    """每次失败额外损失的时间（秒），用于排序"""
+    data: ClassVar[dict[str, MirrorStat]] = {}
+
+    @classmethod
+    def get_key(cls, url: str) -> str:
+        """获取url对应的镜像
+
+        参数:
+            url: url
+
+        返回:
+            str: scheme://host[:port]
+        """
+        _url = URL(url)
+        port = f":{_url.port}" if _url.port else ""
+        return f"{_url.scheme}://{_url.host}{port}"
+
+    @classmethod
+    def record(cls, url: str, latency: float | None):
+        """记录一次请求结果
+
+        参数:
+            url: url
+            latency: 成功时的耗时（秒），失败时为None
+        """
+        stat = cls.data.setdefault(cls.get_key(url), MirrorStat())
+        stat.success *= 1 - cls.alpha
+        stat.failure *= 1 - cls.alpha
+        if latency is None:
+            stat.failure += 1
+            return
+        stat.success += 1
+        stat.latency = (
+            latency
+            if stat.latency is None
+            else stat.latency * (1 - cls.alpha) + latency * cls.alpha
+        )
+
+    @classmethod
+    def sort(cls, urls: list[str]) -> list[str]:
+        """按预计耗时排序，没有统计数据的镜像按已知的最大耗时计算，耗时相同时保持原顺序
+
+        参数:
+            urls: 已按优先级排列的url列表
+
+        返回:
+            list[str]: 排序后的url列表
+        """
+        stats = [cls.data.get(cls.get_key(url)) for url in urls]
+        latency = [stat.latency for stat in stats if stat and stat.latency is not None]
+        if not latency and not any(stats):
+            return urls
+        default_latency = max(latency) if latency else 1.0
+        scores = [
+            stat.score(default_latency, cls.failure_penalty)
+            if stat
+            else default_latency
+            for stat in stats
+        ]
+        return [url for _, url in sorted(zip(scores, urls), key=lambda x: x[0])]
+
+    @classmethod
+    def get_stats(cls) -> dict[str, dict[str, float | None]]:
+        """获取所有镜像的统计数据
+
+        返回:
+            dict[str, dict[str, float | None]]: 镜像: 统计数据
+        """
+        return {
+            key: {
+                "latency": stat.latency,
+                "error_rate": stat.error_rate,
+                "success": stat.success,
+                "failure": stat.failure,
+            }
+            for key, stat in cls.data.items()
+        }
+
+
+@driver.on_startup
+async def _():
+    HttpClientPool.get_client(AsyncHttpx.proxy)
+
+
+@driver.on_shutdown
+async def _():
+    await HttpClientPool.close()
+
 
 class AsyncHttpx:
     proxy: ClassVar[dict[str, str | None]] = {
         "http://": BotConfig.system_proxy,
         "https://": BotConfig.system_proxy,
     }
+    hedge_delay: ClassVar[float] = 2
+    """多个地址时，请求下一个地址前等待的时间（秒）"""
 
     @classmethod
     @retry(stop_max_attempt_number=3)
@@ -43,12 +288,13 @@ class AsyncHttpx:
         use_proxy: bool = True,
         proxy: dict[str, str] | None = None,
         timeout: int = 30,  # noqa: ASYNC109
+        hedge_delay: float | None = None,
         **kwargs,
     ) -> Response:
         """Get
 
         参数:
-            url: url
+            url: url，为列表时对冲请求各个地址，返回第一个成功的响应
             params: params
             headers: 请求头
             cookies: cookies
@@ -56,6 +302,7 @@ class AsyncHttpx:
             use_proxy: 使用默认代理
             proxy: 指定代理
             timeout: 超时时间
+            hedge_delay: 请求下一个地址前的等待时间（秒）.
         """
         urls = [url] if isinstance(url, str) else url
         return await cls._get_first_successful(
@@ -67,6 +314,7 @@ class AsyncHttpx:
             use_proxy=use_proxy,
             proxy=proxy,
             timeout=timeout,
+            hedge_delay=hedge_delay,
             **kwargs,
         )
 
@@ -74,16 +322,118 @@ class AsyncHttpx:
     async def _get_first_successful(
         cls,
         urls: list[str],
+        *,
+        hedge_delay: float | None = None,
         **kwargs,
     ) -> Response:
-        last_exception = None
-        for url in urls:
+        if len(urls) == 1:
+            return await cls._get_single(urls[0], **kwargs)
+        error_response: Response | None = None
+
+        async def request(url: str) -> Response:
+            nonlocal error_response
+            response = await cls._get_single(url, **kwargs)
+            if response.is_error:
+                error_response = response
+                response.raise_for_status()
+            return response
+
+        try:
+            return await cls._hedge(urls, request, delay=hedge_delay)
+        except HTTPStatusError:
+            # 所有地址均返回错误状态码时返回最后一个响应，由调用方判断状态码
+            if error_response is None:
+                raise
+            return error_response
+
+    @classmethod
+    async def _hedge(
+        cls,
+        urls: list[str],
+        request: Callable[[str], Awaitable[T]],
+        *,
+        delay: float | None = None,
+        discard: Callable[[T], Awaitable[Any]] | None = None,
+    ) -> T:
+        """对镜像列表发起对冲请求
+
+        先请求排序最靠前的镜像，超过 delay 秒未完成或请求失败时请求下一个镜像，
+        返回第一个成功的结果并取消其余请求
+
+        参数:
+            urls: 已按优先级排列的url列表
+            request: 请求单个url的方法，失败时抛出异常
+            delay: 请求下一个镜像前的等待时间（秒），为None时使用 hedge_delay.
+            discard: 丢弃多余的成功结果时调用的方法.
+
+        返回:
+            T: 第一个成功的结果
+        """
+        delay = cls.hedge_delay if delay is None else delay
+        waiting = MirrorStats.sort(urls)[::-1]
+        tasks: dict[asyncio.Task, str] = {}
+
+        finished = False
+
+        async def run(url: str) -> T:
+            start = time.perf_counter()
             try:
-                return await cls._get_single(url, **kwargs)
-            except Exception as e:
-                last_exception = e
-                if url != urls[-1]:
-                    logger.warning(f"获取 {url} 失败, 尝试下一个")
+                result = await request(url)
+            except asyncio.CancelledError:
+                # 其他地址已成功，将当前耗时作为该地址耗时的下限
+                if finished:
+                    MirrorStats.record(url, time.perf_counter() - start)
+                raise
+            except Exception:
+                MirrorStats.record(url, None)
+                raise
+            MirrorStats.record(url, time.perf_counter() - start)
+            return result
+
+        def launch():
+            if waiting:
+                url = waiting.pop()
+                tasks[asyncio.create_task(run(url))] = url
+
+        launch()
+        last_exception = None
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks,
+                    timeout=delay if waiting else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    logger.debug(
+                        "请求 %s 超过 %.1fs 未完成, 同时请求下一个地址",
+                        "AsyncHttpx",
+                        args=(", ".join(tasks.values()), delay),
+                    )
+                    launch()
+                    continue
+                results = []
+                for task in done:
+                    url = tasks.pop(task)
+                    if e := task.exception():
+                        last_exception = e
+                        logger.warning(f"获取 {url} 失败, 尝试下一个", e=e)
+                    else:
+                        results.append(task.result())
+                if results:
+                    if discard:
+                        for result in results[1:]:
+                            await discard(result)
+                    return results[0]
+                launch()
+        finally:
+            finished = True
+            if tasks:
+                for task in tasks:
+                    task.cancel()
+                for result in await asyncio.gather(*tasks, return_exceptions=True):
+                    if discard and not isinstance(result, BaseException):
+                        await discard(result)
         raise last_exception or Exception("All URLs failed")
 
     @classmethod
@@ -103,7 +453,8 @@ class AsyncHttpx:
         if not headers:
             headers = get_user_agent()
         _proxy = proxy or (cls.proxy if use_proxy else None)
-        async with httpx.AsyncClient(proxies=_proxy, verify=verify) as client:  # type: ignore
+        client = HttpClientPool.get_client(_proxy, verify)  # type: ignore
+        async with HttpClientPool.host_slot(url):
             return await client.get(
                 url,
                 params=params,
@@ -142,7 +493,8 @@ class AsyncHttpx:
         if not headers:
             headers = get_user_agent()
         _proxy = proxy or (cls.proxy if use_proxy else None)
-        async with httpx.AsyncClient(proxies=_proxy, verify=verify) as client:  # type: ignore
+        client = HttpClientPool.get_client(_proxy, verify)  # type: ignore
+        async with HttpClientPool.host_slot(url):
             return await client.head(
                 url,
                 params=params,
@@ -189,7 +541,8 @@ class AsyncHttpx:
         if not headers:
             headers = get_user_agent()
         _proxy = proxy or (cls.proxy if use_proxy else None)
-        async with httpx.AsyncClient(proxies=_proxy, verify=verify) as client:  # type: ignore
+        client = HttpClientPool.get_client(_proxy, verify)  # type: ignore
+        async with HttpClientPool.host_slot(url):
             return await client.post(
                 url,
                 content=content,
@@ -223,12 +576,23 @@ class AsyncHttpx:
         timeout: int = 30,  # noqa: ASYNC109
         stream: bool = False,
         follow_redirects: bool = True,
+        hedge_delay: float | None = None,
+        resume: bool | None = None,
+        size: int | None = None,
+        checksum: str | None = None,
+        hash_type: str = "sha256",
+        on_progress: Callable[[int], Any] | None = None,
         **kwargs,
     ) -> bool:
         """下载文件
 
+        文件先流式写入 path.part，校验通过后再重命名为 path，
+        下载中断时使用 Range 请求从 path.part 已有的位置继续下载，
+        并以 If-Range 携带 path.part.meta 中保存的 ETag/Last-Modified，
+        服务端文件已变化时返回 200 从头下载
+
         参数:
-            url: url
+            url: url，为列表时对冲请求各个地址
             path: 存储路径
             params: params
             verify: verify
@@ -237,97 +601,276 @@ class AsyncHttpx:
             headers: 请求头
             cookies: cookies
             timeout: 超时时间
-            stream: 是否使用流式下载（流式写入+进度条，适用于下载大文件）
+            stream: 是否显示下载进度条（适用于下载大文件）
+            follow_redirects: 是否跟随重定向
+            hedge_delay: 请求下一个地址前的等待时间（秒）.
+            resume: 是否从已有的 path.part 继续下载，
+                为None时仅在指定 size 或 checksum 时继续下载.
+            size: 文件大小，不为None时校验.
+            checksum: 文件哈希值，不为None时校验.
+            hash_type: 哈希算法.
+            on_progress: 每写入一段数据时以写入的字节数调用.
         """
         if isinstance(path, str):
             path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = path.with_name(f"{path.name}.part")
+        meta_path = path.with_name(f"{path.name}.part.meta")
+        if resume is None:
+            # 无法校验时不信任已有的 path.part
+            resume = size is not None or checksum is not None
+        if not resume:
+            await asyncio.to_thread(cls._remove_part, part_path, meta_path)
+        urls = url if isinstance(url, list) else [url]
+        if not headers:
+            headers = get_user_agent()
+        _proxy = proxy or (cls.proxy if use_proxy else None)
+        client = HttpClientPool.get_client(_proxy, verify)  # type: ignore
+
+        async def open_response(u: str) -> Response:
+            # 只等待响应头，由第一个响应的地址继续下载
+            offset, validator = await asyncio.to_thread(
+                cls._get_resume, part_path, meta_path
+            )
+            _headers = headers
+            if offset and validator:
+                _headers = {
+                    **headers,
+                    "Range": f"bytes={offset}-",
+                    "If-Range": validator,
+                }
+            async with HttpClientPool.host_slot(u):
+                request = client.build_request(
+                    "GET",
+                    u,
+                    params=params,
+                    headers=_headers,
+                    cookies=cookies,
+                    timeout=timeout,
+                    **kwargs,
+                )
+                response = await client.send(
+                    request, stream=True, follow_redirects=follow_redirects
+                )
+                try:
+                    if response.status_code != 416:
+                        response.raise_for_status()
+                except BaseException:
+                    await response.aclose()
+                    raise
+            return response
+
+        async def close_response(response: Response):
+            await response.aclose()
+
         try:
             for _ in range(3):
-                if not isinstance(url, list):
-                    url = [url]
-                for u in url:
+                try:
+                    response = await cls._hedge(
+                        urls, open_response, delay=hedge_delay, discard=close_response
+                    )
                     try:
-                        if not stream:
-                            response = await cls.get(
-                                u,
-                                params=params,
-                                headers=headers,
-                                cookies=cookies,
-                                use_proxy=use_proxy,
-                                proxy=proxy,
-                                timeout=timeout,
-                                follow_redirects=follow_redirects,
-                                **kwargs,
-                            )
-                            response.raise_for_status()
-                            content = response.content
-                            async with aiofiles.open(path, "wb") as wf:
-                                await wf.write(content)
-                                logger.info(f"下载 {u} 成功.. Path：{path.absolute()}")
+                        if response.status_code == 416:
+                            # path.part 已下载完成但未重命名
+                            await cls._check_part_range(response, part_path)
                         else:
-                            if not headers:
-                                headers = get_user_agent()
-                            _proxy = proxy or (cls.proxy if use_proxy else None)
-                            async with httpx.AsyncClient(
-                                proxies=_proxy,  # type: ignore
-                                verify=verify,
-                            ) as client:
-                                async with client.stream(
-                                    "GET",
-                                    u,
-                                    params=params,
-                                    headers=headers,
-                                    cookies=cookies,
-                                    timeout=timeout,
-                                    follow_redirects=True,
-                                    **kwargs,
-                                ) as response:
-                                    response.raise_for_status()
-                                    logger.info(
-                                        f"开始下载 {path.name}.. "
-                                        f"Url: {u}.. "
-                                        f"Path: {path.absolute()}"
-                                    )
-                                    async with aiofiles.open(path, "wb") as wf:
-                                        total = int(
-                                            response.headers.get("Content-Length", 0)
-                                        )
-                                        with rich.progress.Progress(  # type: ignore
-                                            rich.progress.TextColumn(path.name),  # type: ignore
-                                            "[progress.percentage]{task.percentage:>3.0f}%",  # type: ignore
-                                            rich.progress.BarColumn(bar_width=None),  # type: ignore
-                                            rich.progress.DownloadColumn(),  # type: ignore
-                                            rich.progress.TransferSpeedColumn(),  # type: ignore
-                                        ) as progress:
-                                            download_task = progress.add_task(
-                                                "Download",
-                                                total=total or None,
-                                            )
-                                            async for chunk in response.aiter_bytes():
-                                                await wf.write(chunk)
-                                                await wf.flush()
-                                                progress.update(
-                                                    download_task,
-                                                    completed=response.num_bytes_downloaded,
-                                                )
-                                        logger.info(
-                                            f"下载 {u} 成功.. Path：{path.absolute()}"
-                                        )
-                        return True
-                    except (TimeoutError, ConnectTimeout, HTTPStatusError):
-                        logger.warning(f"下载 {u} 失败.. 尝试下一个地址..")
-                    except EndOfStream as e:
-                        logger.warning(
-                            f"下载 {url} EndOfStream 异常 Path：{path.absolute()}", e=e
-                        )
-                        if path.exists():
-                            return True
+                            if response.status_code != 206:
+                                await asyncio.to_thread(
+                                    cls._save_validator, response, meta_path
+                                )
+                            if stream:
+                                logger.info(
+                                    f"开始下载 {path.name}.. "
+                                    f"Url: {response.url}.. "
+                                    f"Path: {path.absolute()}"
+                                )
+                            await cls._write_stream(
+                                response,
+                                part_path,
+                                show_progress=stream,
+                                on_progress=on_progress,
+                            )
+                    finally:
+                        await response.aclose()
+                    await cls._verify_file(part_path, size, checksum, hash_type)
+                    await asyncio.to_thread(part_path.replace, path)
+                    await asyncio.to_thread(meta_path.unlink, missing_ok=True)
+                    logger.info(f"下载 {response.url} 成功.. Path：{path.absolute()}")
+                    return True
+                except (TimeoutError, httpx.TransportError, HTTPStatusError):
+                    logger.warning(f"下载 {url} 失败.. 重新尝试..")
+                except EndOfStream as e:
+                    logger.warning(
+                        f"下载 {url} EndOfStream 异常.. 重新尝试.. "
+                        f"Path：{path.absolute()}",
+                        e=e,
+                    )
+                except FileVerifyError as e:
+                    await asyncio.to_thread(cls._remove_part, part_path, meta_path)
+                    logger.warning(f"下载 {url} 校验失败.. 重新尝试..", e=e)
             logger.error(f"下载 {url} 下载超时.. Path：{path.absolute()}")
         except Exception as e:
             logger.error(f"下载 {url} 错误 Path：{path.absolute()}", e=e)
         return False
 
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        return path.stat().st_size if path.exists() else 0
+
+    @staticmethod
+    def _remove_part(part_path: Path, meta_path: Path):
+        part_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+
+    @classmethod
+    def _get_resume(cls, part_path: Path, meta_path: Path) -> tuple[int, str | None]:
+        """获取继续下载的位置与 If-Range 校验值
+
+        没有保存校验值时删除 path.part，从头下载
+
+        参数:
+            part_path: path.part
+            meta_path: path.part.meta
+
+        返回:
+            tuple[int, str | None]: 已下载大小，校验值
+        """
+        validator = meta_path.read_text() if meta_path.exists() else ""
+        if not validator:
+            cls._remove_part(part_path, meta_path)
+            return 0, None
+        return cls._file_size(part_path), validator
+
+    @staticmethod
+    def _save_validator(response: Response, meta_path: Path):
+        """保存响应的 ETag（弱 ETag 不能用于 If-Range）或 Last-Modified
+
+        参数:
+            response: 从头下载的响应
+            meta_path: path.part.meta
+        """
+        etag = response.headers.get("ETag", "")
+        validator = (
+            etag
+            if etag and not etag.startswith("W/")
+            else response.headers.get("Last-Modified", "")
+        )
+        if validator:
+            meta_path.write_text(validator)
+        else:
+            meta_path.unlink(missing_ok=True)
+
+    @classmethod
+    async def _check_part_range(cls, response: Response, path: Path):
+        """416 响应时检查已下载大小是否与 Content-Range 中的文件大小一致
+
+        参数:
+            response: 416 响应
+            path: path.part
+
+        异常:
+            FileVerifyError: 大小不一致
+        """
+        content_range = response.headers.get("Content-Range", "")
+        total = content_range.rsplit("/", 1)[-1]
+        offset = await asyncio.to_thread(cls._file_size, path)
+        if total != str(offset):
+            raise FileVerifyError(
+                f"Range 超出文件大小 {content_range}，已下载大小 {offset}"
+            )
+
+    @classmethod
+    async def _write_stream(
+        cls,
+        response: Response,
+        path: Path,
+        *,
+        show_progress: bool = False,
+        on_progress: Callable[[int], Any] | None = None,
+    ):
+        """流式写入文件
+
+        响应为 206 时追加到已有文件末尾，否则覆盖已有文件
+
+        参数:
+            response: 流式响应
+            path: 存储路径
+            show_progress: 是否显示进度条.
+            on_progress: 每写入一段数据时以写入的字节数调用.
+        """
+        offset = 0
+        if response.status_code == 206:
+            offset = await asyncio.to_thread(cls._file_size, path)
+            content_range = response.headers.get("Content-Range", "")
+            start = content_range.removeprefix("bytes ").split("-", 1)[0]
+            if start != str(offset):
+                raise FileVerifyError(
+                    f"Content-Range {content_range} 与已下载大小 {offset} 不符"
+                )
+            logger.debug(f"从 {offset} 字节继续下载 {path.name}", "AsyncHttpx")
+        total = int(response.headers.get("Content-Length", 0))
+        total = total + offset if total else 0
+        async with aiofiles.open(path, "ab" if offset else "wb") as wf:
+            if not show_progress:
+                async for chunk in response.aiter_bytes():
+                    await wf.write(chunk)
+                    if on_progress:
+                        on_progress(len(chunk))
+                return
+            with rich.progress.Progress(  # type: ignore
+                rich.progress.TextColumn(path.name),  # type: ignore
+                "[progress.percentage]{task.percentage:>3.0f}%",  # type: ignore
+                rich.progress.BarColumn(bar_width=None),  # type: ignore
+                rich.progress.DownloadColumn(),  # type: ignore
+                rich.progress.TransferSpeedColumn(),  # type: ignore
+            ) as progress:
+                download_task = progress.add_task(
+                    "Download",
+                    total=total or None,
+                    completed=offset,
+                )
+                async for chunk in response.aiter_bytes():
+                    await wf.write(chunk)
+                    if on_progress:
+                        on_progress(len(chunk))
+                    progress.update(
+                        download_task,
+                        completed=offset + response.num_bytes_downloaded,
+                    )
+
+    @classmethod
+    @run_sync
+    def _verify_file(
+        cls,
+        path: Path,
+        size: int | None = None,
+        checksum: str | None = None,
+        hash_type: str = "sha256",
+    ):
+        """校验文件大小与哈希值
+
+        参数:
+            path: 文件路径
+            size: 文件大小，为None时不校验.
+            checksum: 文件哈希值，为None时不校验.
+            hash_type: 哈希算法.
+
+        异常:
+            FileVerifyError: 校验失败
+        """
+        if size is not None and (file_size := path.stat().st_size) != size:
+            raise FileVerifyError(f"文件大小 {file_size} 与预期 {size} 不符")
+        if checksum is None:
+            return
+        hasher = hashlib.new(hash_type)
+        with path.open("rb") as f:
+            while chunk := f.read(1024 * 1024):
+                hasher.update(chunk)
+        if hasher.hexdigest().lower() != checksum.lower():
+            raise FileVerifyError(
+                f"文件{hash_type} {hasher.hexdigest()} 与预期 {checksum} 不符"
+            )
+
     @classmethod
     async def gather_download_file(
         cls,
@@ -341,65 +884,80 @@ class AsyncHttpx:
         headers: dict[str, str] | None = None,
         cookies: dict[str, str] | None = None,
         timeout: int = 30,  # noqa: ASYNC109
+        sizes: list[int | None] | None = None,
+        checksums: list[str | None] | None = None,
+        on_progress: Callable[[int, int, int], Any] | None = None,
         **kwargs,
     ) -> list[bool]:
-        """分组同时下载文件
+        """同时下载文件
 
         参数:
             url_list: url列表
             path_list: 存储路径列表
-            limit_async_number: 限制同时请求数量
+            limit_async_number: 限制同时下载数量
             params: params
             use_proxy: 使用代理
             proxy: 指定代理
             headers: 请求头
             cookies: cookies
             timeout: 超时时间
+            sizes: 每个文件的大小，用于校验.
+            checksums: 每个文件的哈希值，用于校验.
+            on_progress: 以 (已写入字节数, 已完成文件数, 文件总数) 调用的汇总进度回调.
         """
-        if n := len(url_list) != len(path_list):
+        if (n := len(url_list)) != len(path_list):
             raise UrlPathNumberNotEqual(
                 f"Url数量与Path数量不对等，Url：{len(url_list)}，Path：{len(path_list)}"
             )
-        if limit_async_number and n > limit_async_number:
-            m = float(n) / limit_async_number
-            x = 0
-            j = limit_async_number
-            _split_url_list = []
-            _split_path_list = []
-            for _ in range(int(m)):
-                _split_url_list.append(url_list[x:j])
-                _split_path_list.append(path_list[x:j])
-                x += limit_async_number
-                j += limit_async_number
-            if int(m) < m:
-                _split_url_list.append(url_list[j:])
-                _split_path_list.append(path_list[j:])
-        else:
-            _split_url_list = [url_list]
-            _split_path_list = [path_list]
-        tasks = []
-        result_ = []
-        for x, y in zip(_split_url_list, _split_path_list):
-            tasks.extend(
-                asyncio.create_task(
-                    cls.download_file(
-                        url,
-                        path,
-                        params=params,
-                        headers=headers,
-                        cookies=cookies,
-                        use_proxy=use_proxy,
-                        timeout=timeout,
-                        proxy=proxy,
-                        **kwargs,
-                    )
+        semaphore = asyncio.Semaphore(limit_async_number or n or 1)
+        downloaded = 0
+        finished = 0
+
+        def report(length: int):
+            nonlocal downloaded
+            downloaded += length
+            if on_progress:
+                on_progress(downloaded, finished, n)
+
+        async def download(
+            url: str | list[str],
+            path: str | Path,
+            size: int | None,
+            checksum: str | None,
+        ) -> bool:
+            nonlocal finished
+            async with semaphore:
+                result = await cls.download_file(
+                    url,
+                    path,
+                    params=params,
+                    headers=headers,
+                    cookies=cookies,
+                    use_proxy=use_proxy,
+                    timeout=timeout,
+                    proxy=proxy,
+                    size=size,
+                    checksum=checksum,
+                    on_progress=report,
+                    **kwargs,
+                )
+            finished += 1
+            if on_progress:
+                on_progress(downloaded, finished, n)
+            return result
+
+        result = await asyncio.gather(
+            *(
+                download(url, path, size, checksum)
+                for url, path, size, checksum in zip(
+                    url_list, path_list, sizes or [None] * n, checksums or [None] * n
                 )
-                for url, path in zip(x, y)
             )
-            _x = await asyncio.gather(*tasks)
-            result_ = result_ + list(_x)
-            tasks.clear()
-        return result_
+        )
+        logger.debug(
+            f"下载完成 {sum(result)}/{n} 个文件，共 {downloaded} 字节", "AsyncHttpx"
+        )
+        return list(result)
 
     @classmethod
     async def get_fastest_mirror(cls, url_list: list[str]) -> list[str]:
@@ -519,5 +1077,9 @@ class UrlPathNumberNotEqual(Exception):
     pass
 
 
+class FileVerifyError(Exception):
+    pass
+
+
 class BrowserIsNone(Exception):
     pass
@@ -0,0 +1,214 @@
+from typing import ClassVar
+
+from zhenxun.models.bot_console import BotConsole
+from zhenxun.models.group_console import GroupConsole
+from zhenxun.models.level_user import LevelUser
+from zhenxun.models.plugin_info import PluginInfo
+from zhenxun.models.plugin_limit import PluginLimit
+from zhenxun.models.user_console import UserConsole
+from zhenxun.services.db_context import TableCache
+
+
+async def _load_plugins() -> dict[str, PluginInfo]:
+    return {p.module_path: p for p in await PluginInfo.all()}
+
+
+async def _load_plugin_limits() -> dict[int, list[PluginLimit]]:
+    plugin_limits: dict[int, list[PluginLimit]] = {}
+    for limit in await PluginLimit.filter(status=True).all():
+        plugin_limits.setdefault(limit.plugin_id, []).append(limit)  # type: ignore
+    return plugin_limits
+
+
+async def _load_groups() -> dict[tuple[str, str | None], GroupConsole]:
+    return {(g.group_id, g.channel_id): g for g in await GroupConsole.all()}
+
+
+async def _load_levels() -> tuple[dict[tuple[str, str], int], dict[str, int]]:
+    levels = {}
+    max_levels: dict[str, int] = {}
+    for user_id, group_id, level in await LevelUser.all().values_list(
+        "user_id", "group_id", "user_level"
+    ):
+        levels[(user_id, group_id)] = level
+        max_levels[user_id] = max(level, max_levels.get(user_id, level))
+    return levels, max_levels
+
+
+class AuthSnapshot:
+    """
+    权限检测所需数据的进程内快照
+
+    PluginInfo, PluginLimit, GroupConsole, LevelUser 整表加载至内存，
+    BotConsole 与群组禁用列表使用模型自身的缓存，
+    数据写入后在下一次读取时重新加载对应表，快照中的数据仅供读取
+    """
+
+    enabled: ClassVar[bool] = True
+    """是否启用快照，关闭时直接查询数据库"""
+
+    plugins = TableCache(PluginInfo, _load_plugins)
+    """module_path: PluginInfo"""
+    plugin_limits = TableCache(PluginLimit, _load_plugin_limits)
+    """plugin_id: 开启的PluginLimit"""
+    groups = TableCache(GroupConsole, _load_groups)
+    """(group_id, channel_id): GroupConsole"""
+    levels = TableCache(LevelUser, _load_levels)
+    """(user_id, group_id): 权限等级, user_id: 所有群组中最高的权限等级"""
+    users: ClassVar[set[str]] = set()
+    """已存在的用户id"""
+
+    @classmethod
+    def invalidate(cls):
+        """使快照失效"""
+        cls.plugins.clear()
+        cls.plugin_limits.clear()
+        cls.groups.clear()
+        cls.levels.clear()
+        cls.users.clear()
+
+    @classmethod
+    async def get_plugin(cls, module_path: str) -> PluginInfo | None:
+        """获取插件
+
+        参数:
+            module_path: 模块路径
+
+        返回:
+            PluginInfo | None: PluginInfo
+        """
+        if not cls.enabled:
+            return await PluginInfo.get_or_none(module_path=module_path)
+        return (await cls.plugins.get()).get(module_path)
+
+    @classmethod
+    async def get_plugin_limits(cls, plugin: PluginInfo) -> list[PluginLimit]:
+        """获取插件开启的限制
+
+        参数:
+            plugin: PluginInfo
+
+        返回:
+            list[PluginLimit]: 限制列表
+        """
+        if not cls.enabled:
+            return await plugin.plugin_limit.filter(status=True).all()  # type: ignore
+        return (await cls.plugin_limits.get()).get(plugin.id, [])
+
+    @classmethod
+    async def get_bot_status(cls, bot_id: str) -> bool:
+        """获取bot状态
+
+        参数:
+            bot_id: bot_id
+
+        返回:
+            bool: bot状态
+        """
+        return await BotConsole.get_bot_status(bot_id)
+
+    @classmethod
+    async def is_bot_block_plugin(cls, bot_id: str, module: str) -> bool:
+        """bot是否禁用插件
+
+        参数:
+            bot_id: bot_id
+            module: 模块名
+
+        返回:
+            bool: 是否禁用
+        """
+        return await BotConsole.is_block_plugin(bot_id, module)
+
+    @classmethod
+    async def get_group(
+        cls, group_id: str, channel_id: str | None = None
+    ) -> GroupConsole | None:
+        """获取群组
+
+        参数:
+            group_id: 群组id
+            channel_id: 频道id.
+
+        返回:
+            GroupConsole | None: GroupConsole
+        """
+        if not cls.enabled:
+            return await GroupConsole.get_group(group_id, channel_id)
+        return (await cls.groups.get()).get((group_id, channel_id))
+
+    @classmethod
+    async def is_super_group(cls, group_id: str) -> bool:
+        """是否超级用户指定群
+
+        参数:
+            group_id: 群组id
+
+        返回:
+            bool: 是否超级用户指定群
+        """
+        return group.is_super if (group := await cls.get_group(group_id)) else False
+
+    @classmethod
+    async def is_superuser_block_plugin(cls, group_id: str, module: str) -> bool:
+        """群组是否被超级用户禁用插件
+
+        参数:
+            group_id: 群组id
+            module: 模块名
+
+        返回:
+            bool: 是否禁用
+        """
+        return await GroupConsole.is_superuser_block_plugin(group_id, module)
+
+    @classmethod
+    async def is_normal_block_plugin(
+        cls, group_id: str, module: str, channel_id: str | None = None
+    ) -> bool:
+        """群组是否禁用插件
+
+        参数:
+            group_id: 群组id
+            module: 模块名
+            channel_id: 频道id.
+
+        返回:
+            bool: 是否禁用
+        """
+        return await GroupConsole.is_normal_block_plugin(group_id, module, channel_id)
+
+    @classmethod
+    async def check_level(cls, user_id: str, group_id: str | None, level: int) -> bool:
+        """检查用户权限等级是否大于 level
+
+        参数:
+            user_id: 用户id
+            group_id: 群组id
+            level: 权限等级
+
+        返回:
+            bool: 是否大于level
+        """
+        if not cls.enabled:
+            return await LevelUser.check_level(user_id, group_id, level)
+        levels, max_levels = await cls.levels.get()
+        if group_id:
+            user_level = levels.get((user_id, group_id))
+        else:
+            user_level = max_levels.get(user_id)
+        return user_level is not None and user_level >= level
+
+    @classmethod
+    async def touch_user(cls, user_id: str, platform: str | None = None):
+        """确保用户数据存在，已确认存在的用户不再查询数据库
+
+        参数:
+            user_id: 用户id
+            platform: 平台.
+        """
+        if cls.enabled and user_id in cls.users:
+            return
+        await UserConsole.get_user(user_id, platform)
+        if cls.enabled:
+            cls.users.add(user_id)
@@ -0,0 +1,304 @@
+import asyncio
+from collections import OrderedDict
+import contextlib
+import hashlib
+from pathlib import Path
+import time
+from typing import ClassVar
+
+import aiofiles
+import ujson as json
+
+from zhenxun.configs.path_config import TEMP_PATH
+from zhenxun.services.log import logger
+from zhenxun.utils.http_utils import AsyncHttpx
+from zhenxun.utils.user_agent import get_user_agent
+
+CACHE_PATH = TEMP_PATH / "image_cache"
+"""缓存目录"""
+OBJECT_PATH = CACHE_PATH / "objects"
+"""按内容sha256存储的图片"""
+META_PATH = CACHE_PATH / "meta"
+"""url对应的图片sha256与校验信息"""
+
+
+class CacheEntry:
+    """url对应的缓存信息"""
+
+    __slots__ = ("digest", "etag", "expire", "last_modified")
+
+    def __init__(
+        self,
+        digest: str,
+        expire: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ):
+        self.digest = digest
+        """图片sha256"""
+        self.expire = expire
+        """过期时间，过期后向服务器重新校验"""
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def to_dict(self) -> dict:
+        return {
+            "digest": self.digest,
+            "expire": self.expire,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+
+class ImageCache:
+    """
+    头像等远程图片缓存
+
+    内存中按最近使用保留 max_memory 字节的图片，图片本体按内容sha256存储于
+    TEMP_PATH/image_cache，超过 max_size 时删除最久未使用的图片，
+    超过 ttl 后使用 ETag/Last-Modified 向服务器重新校验，
+    同一url同时只会有一个请求，请求失败时返回已有的旧图片
+    """
+
+    ttl: ClassVar[float] = 60 * 60
+    """缓存有效时间（秒）"""
+    max_memory: ClassVar[int] = 32 * 1024 * 1024
+    """内存缓存最大字节数"""
+    max_size: ClassVar[int] = 128 * 1024 * 1024
+    """磁盘缓存最大字节数"""
+    limit: ClassVar[int] = 10
+    """批量获取时同时请求的数量"""
+    timeout: ClassVar[int] = 10
+    """请求超时时间"""
+
+    _memory: ClassVar[OrderedDict[str, bytes]] = OrderedDict()
+    """digest: 图片"""
+    _memory_size: ClassVar[int] = 0
+    _index: ClassVar[OrderedDict[str, int] | None] = None
+    """digest: 文件大小，按最近使用排序"""
+    _size: ClassVar[int] = 0
+    _entries: ClassVar[dict[str, CacheEntry]] = {}
+    """url: 缓存信息"""
+    _pending: ClassVar[dict[str, asyncio.Task]] = {}
+
+    @classmethod
+    def _url_key(cls, url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    @classmethod
+    def _object_file(cls, digest: str):
+        return OBJECT_PATH / digest[:2] / digest
+
+    @classmethod
+    def _remember(cls, digest: str, content: bytes):
+        """放入内存缓存，超出容量时淘汰最久未使用的图片"""
+        if digest in cls._memory:
+            cls._memory.move_to_end(digest)
+            return
+        if len(content) > cls.max_memory:
+            return
+        cls._memory[digest] = content
+        cls._memory_size += len(content)
+        while cls._memory_size > cls.max_memory:
+            _, old = cls._memory.popitem(last=False)
+            cls._memory_size -= len(old)
+
+    @classmethod
+    def _scan_index(cls) -> OrderedDict[str, int]:
+        files = []
+        for file in OBJECT_PATH.glob("*/*"):
+            if file.suffix:
+                continue
+            with contextlib.suppress(FileNotFoundError):
+                stat = file.stat()
+                files.append((stat.st_mtime, file.name, stat.st_size))
+        files.sort()
+        return OrderedDict((digest, size) for _, digest, size in files)
+
+    @classmethod
+    async def _load_index(cls) -> OrderedDict[str, int]:
+        if cls._index is None:
+            index = await asyncio.to_thread(cls._scan_index)
+            if cls._index is None:
+                cls._index = index
+                cls._size = sum(index.values())
+        return cls._index
+
+    @staticmethod
+    def _remove_files(files: list[Path]):
+        for file in files:
+            file.unlink(missing_ok=True)
+
+    @classmethod
+    async def _add(cls, digest: str, size: int):
+        """记录磁盘上的图片，超出容量时删除最久未使用的图片"""
+        index = await cls._load_index()
+        if digest in index:
+            index.move_to_end(digest)
+            return
+        index[digest] = size
+        cls._size += size
+        evicted = []
+        while cls._size > cls.max_size and len(index) > 1:
+            old, old_size = index.popitem(last=False)
+            cls._size -= old_size
+            evicted.append(cls._object_file(old))
+            if (content := cls._memory.pop(old, None)) is not None:
+                cls._memory_size -= len(content)
+        if evicted:
+            await asyncio.to_thread(cls._remove_files, evicted)
+
+    @classmethod
+    async def _load_entry(cls, url: str) -> CacheEntry | None:
+        if entry := cls._entries.get(url):
+            return entry
+        file = META_PATH / f"{cls._url_key(url)}.json"
+        try:
+            async with aiofiles.open(file, encoding="utf8") as f:
+                entry = CacheEntry(**json.loads(await f.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"读取图片缓存信息失败 {file}", "ImageCache", e=e)
+            return None
+        cls._entries[url] = entry
+        return entry
+
+    @classmethod
+    async def _save_entry(cls, url: str, entry: CacheEntry):
+        cls._entries[url] = entry
+        await asyncio.to_thread(META_PATH.mkdir, parents=True, exist_ok=True)
+        async with aiofiles.open(
+            META_PATH / f"{cls._url_key(url)}.json", "w", encoding="utf8"
+        ) as f:
+            await f.write(json.dumps(entry.to_dict()))
+
+    @classmethod
+    async def _read_object(cls, digest: str) -> bytes | None:
+        if (content := cls._memory.get(digest)) is not None:
+            cls._memory.move_to_end(digest)
+            await cls._add(digest, len(content))
+            return content
+        try:
+            async with aiofiles.open(cls._object_file(digest), "rb") as f:
+                content = await f.read()
+        except FileNotFoundError:
+            index = await cls._load_index()
+            if digest in index:
+                cls._size -= index.pop(digest)
+            return None
+        await cls._add(digest, len(content))
+        cls._remember(digest, content)
+        return content
+
+    @classmethod
+    async def _write_object(cls, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        file = cls._object_file(digest)
+        if not await asyncio.to_thread(file.exists):
+            await asyncio.to_thread(file.parent.mkdir, parents=True, exist_ok=True)
+            tmp_file = file.with_name(f"{digest}.tmp")
+            async with aiofiles.open(tmp_file, "wb") as f:
+                await f.write(content)
+            await asyncio.to_thread(tmp_file.replace, file)
+        await cls._add(digest, len(content))
+        cls._remember(digest, content)
+        return digest
+
+    @classmethod
+    async def _fetch(
+        cls, url: str, entry: CacheEntry | None, stale: bytes | None
+    ) -> bytes | None:
+        headers = get_user_agent()
+        if entry and stale is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        try:
+            response = await AsyncHttpx.get(url, headers=headers, timeout=cls.timeout)
+            if response.status_code == 304 and entry and stale is not None:
+                entry.expire = time.time() + cls.ttl
+                await cls._save_entry(url, entry)
+                return stale
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning(f"获取图片 {url} 失败", "ImageCache", e=e)
+            return stale
+        content = response.content
+        digest = await cls._write_object(content)
+        await cls._save_entry(
+            url,
+            CacheEntry(
+                digest,
+                time.time() + cls.ttl,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            ),
+        )
+        return content
+
+    @classmethod
+    async def _get(cls, url: str) -> bytes | None:
+        entry = await cls._load_entry(url)
+        content = await cls._read_object(entry.digest) if entry else None
+        if entry and content is not None and entry.expire > time.time():
+            return content
+        return await cls._fetch(url, entry, content)
+
+    @classmethod
+    async def get(cls, url: str) -> bytes | None:
+        """获取图片
+
+        参数:
+            url: 图片url
+
+        返回:
+            bytes | None: 图片，获取失败且没有缓存时为None
+        """
+        entry = cls._entries.get(url)
+        if (
+            entry
+            and entry.expire > time.time()
+            and (content := cls._memory.get(entry.digest)) is not None
+        ):
+            cls._memory.move_to_end(entry.digest)
+            await cls._add(entry.digest, len(content))
+            return content
+        task = cls._pending.get(url)
+        if task is None:
+            task = cls._pending[url] = asyncio.create_task(cls._get(url))
+            task.add_done_callback(lambda _: cls._pending.pop(url, None))
+        return await asyncio.shield(task)
+
+    @classmethod
+    async def get_many(
+        cls, urls: list[str | None], limit: int | None = None
+    ) -> list[bytes | None]:
+        """批量获取图片，未缓存的图片同时请求
+
+        参数:
+            urls: 图片url列表，为None时对应结果为None
+            limit: 同时请求的数量，为None时使用 ImageCache.limit.
+
+        返回:
+            list[bytes | None]: 与urls顺序一致的图片
+        """
+        semaphore = asyncio.Semaphore(limit or cls.limit)
+
+        async def get(url: str | None) -> bytes | None:
+            if not url:
+                return None
+            async with semaphore:
+                return await cls.get(url)
+
+        return list(await asyncio.gather(*(get(url) for url in urls)))
+
+    @classmethod
+    def clear_memory(cls):
+        """清空内存缓存"""
+        cls._memory.clear()
+        cls._memory_size = 0
+        cls._entries.clear()
+        cls._index = None
+        cls._size = 0
@@ -0,0 +1,131 @@
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+import hashlib
+from pathlib import Path
+from typing import Any, ClassVar
+
+import aiofiles
+import ujson as json
+
+from zhenxun.configs.path_config import TEMP_PATH
+from zhenxun.services.log import logger
+from zhenxun.utils._build_image import BuildImage
+
+CACHE_PATH = TEMP_PATH / "render_cache"
+"""渲染结果目录"""
+
+
+class RenderCache:
+    """
+    图片渲染缓存
+
+    以 sha256(模板名, 模板版本, 输入数据) 为key将渲染结果存储于 TEMP_PATH/render_cache，
+    输入数据相同时直接返回已有图片，同一key同时只会渲染一次，
+    超过 max_size 时删除最久未使用的图片
+    """
+
+    max_size: ClassVar[int] = 256 * 1024 * 1024
+    """磁盘缓存最大字节数"""
+
+    _index: ClassVar[OrderedDict[str, int] | None] = None
+    """key: 文件大小，按最近使用排序"""
+    _size: ClassVar[int] = 0
+    _pending: ClassVar[dict[str, asyncio.Task]] = {}
+
+    @classmethod
+    def make_key(cls, template: str, version: str | int, data: Any) -> str:
+        """生成缓存key
+
+        参数:
+            template: 模板名
+            version: 模板版本
+            data: 输入数据，需要可以json序列化
+
+        返回:
+            str: key
+        """
+        raw = json.dumps([template, str(version), data], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @classmethod
+    def _file(cls, key: str) -> Path:
+        return CACHE_PATH / f"{key}.png"
+
+    @classmethod
+    def _load_index(cls) -> OrderedDict[str, int]:
+        if cls._index is None:
+            CACHE_PATH.mkdir(parents=True, exist_ok=True)
+            files = sorted(
+                (file.stat().st_mtime, file.stem, file.stat().st_size)
+                for file in CACHE_PATH.glob("*.png")
+            )
+            cls._index = OrderedDict((key, size) for _, key, size in files)
+            cls._size = sum(cls._index.values())
+        return cls._index
+
+    @classmethod
+    def _add(cls, key: str, size: int):
+        index = cls._load_index()
+        index[key] = size
+        cls._size += size
+        while cls._size > cls.max_size and len(index) > 1:
+            old, old_size = index.popitem(last=False)
+            cls._size -= old_size
+            cls._file(old).unlink(missing_ok=True)
+
+    @classmethod
+    async def _render(
+        cls, key: str, render: Callable[[], Awaitable[BuildImage | bytes]]
+    ) -> Path:
+        result = await render()
+        content = result.pic2bytes() if isinstance(result, BuildImage) else result
+        file = cls._file(key)
+        tmp_file = file.with_suffix(".tmp")
+        async with aiofiles.open(tmp_file, "wb") as f:
+            await f.write(content)
+        tmp_file.replace(file)
+        cls._add(key, len(content))
+        return file
+
+    @classmethod
+    async def get(
+        cls,
+        template: str,
+        data: Any,
+        render: Callable[[], Awaitable[BuildImage | bytes]],
+        version: str | int = 0,
+    ) -> Path:
+        """获取渲染结果，没有缓存时调用render渲染
+
+        参数:
+            template: 模板名
+            data: 决定渲染结果的全部输入数据，需要可以json序列化
+            render: 渲染函数
+            version: 模板版本，绘制方式改变时修改.
+
+        返回:
+            Path: 图片路径
+        """
+        key = cls.make_key(template, version, data)
+        index = cls._load_index()
+        if key in index:
+            file = cls._file(key)
+            if file.exists():
+                index.move_to_end(key)
+                return file
+            cls._size -= index.pop(key)
+        task = cls._pending.get(key)
+        if task is None:
+            logger.debug(f"渲染 {template}: {key}", "RenderCache")
+            task = cls._pending[key] = asyncio.create_task(cls._render(key, render))
+            task.add_done_callback(lambda _: cls._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    @classmethod
+    def clear(cls):
+        """删除全部缓存"""
+        for key in cls._load_index():
+            cls._file(key).unlink(missing_ok=True)
+        cls._index = None
+        cls._size = 0
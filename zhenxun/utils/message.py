@@ -1,6 +1,8 @@
 import base64
+from collections import OrderedDict
 from io import BytesIO
 from pathlib import Path
+from typing import ClassVar, Literal
 
 import nonebot
 from nonebot.adapters.onebot.v11 import Message, MessageSegment
@@ -45,9 +47,57 @@ MESSAGE_TYPE = (
 
 class Config(BaseModel):
     image_to_bytes: bool = False
+    image_format: Literal["PNG", "JPEG", "WEBP"] = "PNG"
+    """BuildImage发送时的编码格式"""
+    image_compress_level: int = 6
+    """PNG压缩等级，0-9，越小编码越快"""
+    image_quality: int = 85
+    """JPEG/WEBP质量"""
 
 
 class MessageUtils:
+    file_cache_size: ClassVar[int] = 32 * 1024 * 1024
+    """图片文件内存缓存最大字节数"""
+    _file_cache: ClassVar[OrderedDict[Path, tuple[int, int, bytes]]] = OrderedDict()
+    """路径: (mtime_ns, 文件大小, 文件内容)"""
+    _file_cache_bytes: ClassVar[int] = 0
+
+    @classmethod
+    def _read_file(cls, path: Path) -> bytes:
+        """读取图片文件，文件修改时间与大小未变化时使用内存缓存
+
+        参数:
+            path: 图片路径
+
+        返回:
+            bytes: 文件内容
+        """
+        stat = path.stat()
+        if (cache := cls._file_cache.get(path)) and cache[:2] == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            cls._file_cache.move_to_end(path)
+            return cache[2]
+        content = path.read_bytes()
+        if old := cls._file_cache.pop(path, None):
+            cls._file_cache_bytes -= len(old[2])
+        if len(content) <= cls.file_cache_size:
+            cls._file_cache[path] = (stat.st_mtime_ns, stat.st_size, content)
+            cls._file_cache_bytes += len(content)
+            while cls._file_cache_bytes > cls.file_cache_size:
+                _, (_, _, old_content) = cls._file_cache.popitem(last=False)
+                cls._file_cache_bytes -= len(old_content)
+        return content
+
+    @classmethod
+    def _image_bytes(cls, image: BuildImage) -> bytes:
+        """按配置编码BuildImage"""
+        config = nonebot.get_plugin_config(Config)
+        return image.pic2bytes(
+            config.image_format, config.image_compress_level, config.image_quality
+        )
+
     @classmethod
     def __build_message(cls, msg_list: list[MESSAGE_TYPE]) -> list[Text | Image]:
         """构造消息
@@ -74,8 +124,7 @@ class MessageUtils:
                 if msg.exists():
                     if config.image_to_bytes:
                         logger.debug("图片转为bytes发送", "MessageUtils")
-                        image = BuildImage.open(msg)
-                        message_list.append(Image(raw=image.pic2bytes()))
+                        message_list.append(Image(raw=cls._read_file(msg)))
                     else:
                         message_list.append(Image(path=msg))
                 else:
@@ -85,7 +134,7 @@ class MessageUtils:
             elif isinstance(msg, BytesIO):
                 message_list.append(Image(raw=msg))
             elif isinstance(msg, BuildImage):
-                message_list.append(Image(raw=msg.pic2bytes()))
+                message_list.append(Image(raw=cls._image_bytes(msg)))
             else:
                 message_list.append(msg)
         return message_list
@@ -132,11 +181,9 @@ class MessageUtils:
             if isinstance(_message, list):
                 for i in range(len(_message.copy())):
                     if isinstance(_message[i], Path):
-                        _message[i] = Image(
-                            raw=BuildImage.open(_message[i]).pic2bytes()
-                        )
+                        _message[i] = Image(raw=cls._read_file(_message[i]))
                     elif isinstance(_message[i], BuildImage):
-                        _message[i] = Image(raw=_message[i].pic2bytes())
+                        _message[i] = Image(raw=cls._image_bytes(_message[i]))
             node_list.append(
                 CustomNode(uid=uin, name=name, content=UniMessage(_message))
             )
@@ -1,14 +1,14 @@
 import asyncio
 from collections.abc import Awaitable, Callable
 import random
-from typing import Literal
+from typing import ClassVar, Literal
 
-import httpx
 import nonebot
 from nonebot.adapters import Bot
+from nonebot.exception import ActionFailed, NetworkError
 from nonebot.utils import is_coroutine_callable
 from nonebot_plugin_alconna import SupportScope
-from nonebot_plugin_alconna.uniseg import Receipt, Target, UniMessage
+from nonebot_plugin_alconna.uniseg import Image, Receipt, Target, UniMessage
 from nonebot_plugin_uninfo import SceneType, Uninfo, get_interface
 from nonebot_plugin_uninfo.model import Member
 from pydantic import BaseModel
@@ -17,9 +17,11 @@ from zhenxun.configs.config import BotConfig
 from zhenxun.models.friend_user import FriendUser
 from zhenxun.models.group_console import GroupConsole
 from zhenxun.services.log import logger
+from zhenxun.utils.common_utils import CommonUtils
 from zhenxun.utils.exception import NotFindSuperuser
-from zhenxun.utils.http_utils import AsyncHttpx
+from zhenxun.utils.manager.image_cache import ImageCache
 from zhenxun.utils.message import MessageUtils
+from zhenxun.utils.utils import RateLimiter
 
 driver = nonebot.get_driver()
 
@@ -206,13 +208,8 @@ class PlatformUtils:
             user_id: 用户id
             platform: 平台
         """
-        url = None
-        if platform == "qq":
-            if user_id.isdigit():
-                url = f"http://q1.qlogo.cn/g?b=qq&nk={user_id}&s=160"
-            else:
-                url = f"https://q.qlogo.cn/qqapp/{appid}/{user_id}/640"
-        return await AsyncHttpx.get_content(url) if url else None
+        url = cls.get_user_avatar_url(user_id, platform, appid)
+        return await ImageCache.get(url) if url else None
 
     @classmethod
     def get_user_avatar_url(
@@ -240,15 +237,7 @@ class PlatformUtils:
             platform: 平台
         """
         if platform == "qq":
-            url = f"http://p.qlogo.cn/gh/{gid}/{gid}/640/"
-            async with httpx.AsyncClient() as client:
-                for _ in range(3):
-                    try:
-                        return (await client.get(url)).content
-                    except Exception:
-                        logger.error(
-                            "获取群头像错误", "Util", target=gid, platform=platform
-                        )
+            return await ImageCache.get(f"http://p.qlogo.cn/gh/{gid}/{gid}/640/")
         return None
 
     @classmethod
@@ -468,15 +457,223 @@ class PlatformUtils:
         return target
 
 
+class BroadcastResult(BaseModel):
+    success: list[str] = []
+    """发送成功的群组"""
+    failed: dict[str, str] = {}
+    """发送失败的群组: 错误信息"""
+    skipped: list[str] = []
+    """检测未通过跳过的群组"""
+
+
+class Broadcaster:
+    """
+    群聊广播
+
+    各Bot同时发送，同一Bot按 interval 限速，发送前批量过滤禁用被动的群组，
+    url图片只下载一次，网络错误时指数退避重试
+    """
+
+    interval: ClassVar[float] = 2
+    """同一Bot两次发送的间隔（秒）"""
+    retry: ClassVar[int] = 2
+    """网络错误重试次数"""
+    retry_delay: ClassVar[float] = 2
+    """首次重试等待时间（秒），之后每次翻倍"""
+    progress_step: ClassVar[int] = 100
+    """每发送多少个群组记录一次进度"""
+
+    _limiter: ClassVar[RateLimiter | None] = None
+
+    @classmethod
+    def _get_limiter(cls) -> RateLimiter:
+        if cls._limiter is None or cls._limiter.interval != cls.interval:
+            cls._limiter = RateLimiter(cls.interval)
+        return cls._limiter
+
+    @classmethod
+    async def _prepare_message(cls, message: str | UniMessage) -> UniMessage:
+        """构造消息，url图片下载一次后所有群组共用"""
+        if isinstance(message, str):
+            return MessageUtils.build_message(message)
+        result = UniMessage()
+        for seg in message:
+            if isinstance(seg, Image) and seg.url and not seg.raw:
+                if content := await ImageCache.get(seg.url):
+                    seg = Image(raw=content)
+            result.append(seg)
+        return result
+
+    @classmethod
+    async def _wait(cls, bot: Bot):
+        # 先占用发送时间再等待，同一Bot的多个广播同时进行时也不会超过速率
+        limiter = cls._get_limiter()
+        delay = limiter.left_time(bot.self_id)
+        limiter.consume(bot.self_id)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @classmethod
+    def _can_retry(cls, e: Exception) -> bool:
+        """是否为可以重试的临时错误
+
+        平台返回的错误（如Bot被禁言、群组已解散）重试也不会成功，
+        超时时消息可能已经发出，重试会重复发送
+        """
+        if isinstance(e, ActionFailed | TimeoutError):
+            return False
+        if isinstance(e, NetworkError):
+            msg = getattr(e, "msg", None) or str(e)
+            return "timeout" not in msg.lower() and not isinstance(
+                e.__cause__, TimeoutError
+            )
+        return isinstance(e, ConnectionError)
+
+    @classmethod
+    async def _send(cls, bot: Bot, target: Target, message: UniMessage):
+        for i in range(cls.retry + 1):
+            await cls._wait(bot)
+            try:
+                await message.send(target, bot)
+                return
+            except Exception as e:
+                if i == cls.retry or not cls._can_retry(e):
+                    raise
+                await asyncio.sleep(cls.retry_delay * 2**i)
+
+    @classmethod
+    async def _send_bot(
+        cls,
+        bot: Bot,
+        groups: list[GroupConsole],
+        message: UniMessage,
+        check_func: Callable[[Bot, str], Awaitable] | None,
+        result: BroadcastResult,
+        log_cmd: str | None,
+    ):
+        for i, group in enumerate(groups, 1):
+            key = f"{group.group_id}:{group.channel_id}"
+            try:
+                if check_func:
+                    if is_coroutine_callable(check_func):
+                        is_run = await check_func(bot, group.group_id)
+                    else:
+                        is_run = check_func(bot, group.group_id)
+                    if not is_run:
+                        logger.debug(
+                            "广播方法检测运行方法为 False, 已跳过...",
+                            log_cmd,
+                            group_id=group.group_id,
+                        )
+                        result.skipped.append(key)
+                        continue
+                target = PlatformUtils.get_target(
+                    group_id=group.group_id, channel_id=group.channel_id
+                )
+                if not target:
+                    logger.warning("target为空", log_cmd, target=key)
+                    result.failed[key] = "target为空"
+                    continue
+                await cls._send(bot, target, message)
+                result.success.append(key)
+                logger.debug("发送成功", log_cmd, target=key)
+            except Exception as e:
+                result.failed[key] = str(e)
+                logger.error("发送失败", log_cmd, target=key, e=e)
+            if i % cls.progress_step == 0:
+                logger.info(f"Bot: {bot.self_id} 广播进度 {i}/{len(groups)}", log_cmd)
+
+    @classmethod
+    async def _get_groups(cls, bot: Bot, log_cmd: str | None) -> list[GroupConsole]:
+        try:
+            group_list, _ = await PlatformUtils.get_group_list(bot)
+            return group_list
+        except Exception as e:
+            logger.error(f"Bot: {bot.self_id} 获取群聊列表失败", command=log_cmd, e=e)
+            return []
+
+    @classmethod
+    async def broadcast(
+        cls,
+        message: str | UniMessage,
+        bot_list: list[Bot],
+        ignore_group: set[str] | None = None,
+        check_func: Callable[[Bot, str], Awaitable] | None = None,
+        task: str | None = None,
+        log_cmd: str | None = None,
+    ) -> BroadcastResult:
+        """向Bot列表的所有群组广播，同一群组只由第一个Bot发送
+
+        参数:
+            message: 广播消息内容
+            bot_list: Bot列表
+            ignore_group: 忽略群聊列表.
+            check_func: 发送前对群聊检测方法，判断是否发送.
+            task: 被动技能模块名，发送前批量过滤禁用该被动的群组.
+            log_cmd: 日志标记.
+
+        返回:
+            BroadcastResult: 广播结果
+        """
+        result = BroadcastResult()
+        group_lists = await asyncio.gather(
+            *(cls._get_groups(bot, log_cmd) for bot in bot_list)
+        )
+        used_group: set[str] = set()
+        bot_groups: list[tuple[Bot, list[GroupConsole]]] = []
+        for bot, group_list in zip(bot_list, group_lists):
+            groups = []
+            for group in group_list:
+                key = f"{group.group_id}:{group.channel_id}"
+                if key in used_group or (
+                    ignore_group
+                    and (
+                        group.group_id in ignore_group
+                        or group.channel_id in ignore_group
+                    )
+                ):
+                    logger.debug(
+                        "广播方法群组重复, 已跳过...", log_cmd, group_id=group.group_id
+                    )
+                    continue
+                used_group.add(key)
+                groups.append(group)
+            if task and groups:
+                blocked = await CommonUtils.task_is_block_many(
+                    bot, task, [g.group_id for g in groups]
+                )
+                result.skipped.extend(
+                    f"{g.group_id}:{g.channel_id}"
+                    for g in groups
+                    if g.group_id in blocked
+                )
+                groups = [g for g in groups if g.group_id not in blocked]
+            bot_groups.append((bot, groups))
+        uni_message = await cls._prepare_message(message)
+        await asyncio.gather(
+            *(
+                cls._send_bot(bot, groups, uni_message, check_func, result, log_cmd)
+                for bot, groups in bot_groups
+            )
+        )
+        logger.info(
+            f"广播完成 成功: {len(result.success)} 失败: {len(result.failed)} "
+            f"跳过: {len(result.skipped)}",
+            log_cmd,
+        )
+        return result
+
+
 async def broadcast_group(
     message: str | UniMessage,
     bot: Bot | list[Bot] | None = None,
     bot_id: str | set[str] | None = None,
-    ignore_group: set[int] | None = None,
+    ignore_group: set[str] | None = None,
     check_func: Callable[[Bot, str], Awaitable] | None = None,
     log_cmd: str | None = None,
     platform: Literal["qq", "dodo", "kaiheila"] | None = None,
-):
+    task: str | None = None,
+) -> BroadcastResult:
     """获取所有Bot或指定Bot对象广播群聊
 
     参数:
@@ -487,6 +684,10 @@ async def broadcast_group(
         check_func: 发送前对群聊检测方法，判断是否发送.
         log_cmd: 日志标记.
         platform: 指定平台
+        task: 被动技能模块名，发送前批量过滤禁用该被动的群组.
+
+    返回:
+        BroadcastResult: 广播结果
     """
     if platform and platform not in ["qq", "dodo", "kaiheila"]:
         raise ValueError("指定平台不支持")
@@ -504,64 +705,14 @@ async def broadcast_group(
         if isinstance(bot_id, str):
             _bot_id_list = [bot_id]
         for id_ in _bot_id_list:
-            if bot_id in bot_dict:
-                bot_list.append(bot_dict[bot_id])
+            if id_ in bot_dict:
+                bot_list.append(bot_dict[id_])
             else:
                 logger.warning(f"Bot:{id_} 对象未连接或不存在")
     else:
         bot_list = list(bot_dict.values())
-    _used_group = []
-    for _bot in bot_list:
-        try:
-            if platform and platform != PlatformUtils.get_platform(_bot):
-                continue
-            group_list, _ = await PlatformUtils.get_group_list(_bot)
-            if group_list:
-                for group in group_list:
-                    key = f"{group.group_id}:{group.channel_id}"
-                    try:
-                        if (
-                            ignore_group
-                            and (
-                                group.group_id in ignore_group
-                                or group.channel_id in ignore_group
-                            )
-                        ) or key in _used_group:
-                            logger.debug(
-                                "广播方法群组重复, 已跳过...",
-                                log_cmd,
-                                group_id=group.group_id,
-                            )
-                            continue
-                        is_run = False
-                        if check_func:
-                            if is_coroutine_callable(check_func):
-                                is_run = await check_func(_bot, group.group_id)
-                            else:
-                                is_run = check_func(_bot, group.group_id)
-                        if not is_run:
-                            logger.debug(
-                                "广播方法检测运行方法为 False, 已跳过...",
-                                log_cmd,
-                                group_id=group.group_id,
-                            )
-                            continue
-                        target = PlatformUtils.get_target(
-                            user_id=None,
-                            group_id=group.group_id,
-                            channel_id=group.channel_id,
-                        )
-                        if target:
-                            _used_group.append(key)
-                            message_list = message
-                            await MessageUtils.build_message(message_list).send(
-                                target, _bot
-                            )
-                            logger.debug("发送成功", log_cmd, target=key)
-                            await asyncio.sleep(random.randint(1, 3))
-                        else:
-                            logger.warning("target为空", log_cmd, target=key)
-                    except Exception as e:
-                        logger.error("发送失败", log_cmd, target=key, e=e)
-        except Exception as e:
-            logger.error(f"Bot: {_bot.self_id} 获取群聊列表失败", command=log_cmd, e=e)
+    if platform:
+        bot_list = [b for b in bot_list if PlatformUtils.get_platform(b) == platform]
+    return await Broadcaster.broadcast(
+        message, bot_list, ignore_group, check_func, task, log_cmd
+    )
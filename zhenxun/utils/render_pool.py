@@ -0,0 +1,83 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+import multiprocessing
+import pickle
+from typing import Any, ClassVar
+
+import nonebot
+
+from zhenxun.configs.config import BotConfig
+from zhenxun.services.log import logger
+from zhenxun.utils._build_image import BuildImage
+from zhenxun.utils._render_worker import RenderFunc, init_worker, render
+
+driver = nonebot.get_driver()
+
+
+class RenderPool:
+    """
+    图片渲染进程池，BotConfig.render_processes 大于0时启用
+
+    func 需要是渲染进程中可以导入的模块级函数或类方法（如 ImageTemplate.table_page），
+    且只等待BuildImage的方法，参数需要可以pickle，
+    未启用、参数无法pickle或进程池异常时在线程中渲染
+    """
+
+    processes: ClassVar[int] = BotConfig.render_processes
+    """渲染进程数"""
+    _executor: ClassVar[ProcessPoolExecutor | None] = None
+
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor | None:
+        if cls.processes <= 0:
+            return None
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(
+                cls.processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+            )
+        return cls._executor
+
+    @classmethod
+    async def render(cls, func: RenderFunc, *args: Any, **kwargs: Any) -> bytes:
+        """渲染图片
+
+        参数:
+            func: 返回BuildImage的绘图函数
+            args: func 的参数
+            kwargs: func 的参数
+
+        返回:
+            bytes: PNG图片
+        """
+        if executor := cls._get_executor():
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    executor, partial(render, func, args, kwargs)
+                )
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                logger.debug(
+                    f"{func.__qualname__} 无法在渲染进程中执行，使用线程渲染",
+                    "RenderPool",
+                    e=e,
+                )
+            except BrokenProcessPool as e:
+                logger.warning("渲染进程池异常，重新创建", "RenderPool", e=e)
+                cls.shutdown()
+        image = await BuildImage.compose(func, *args, **kwargs)
+        return image.pic2bytes()
+
+    @classmethod
+    def shutdown(cls):
+        """关闭进程池"""
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+
+
+@driver.on_shutdown
+async def _():
+    RenderPool.shutdown()
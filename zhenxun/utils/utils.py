@@ -1,16 +1,16 @@
-from collections import defaultdict
-from datetime import datetime
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
 import os
 from pathlib import Path
 import time
 from typing import Any
 
-import httpx
 import pypinyin
 import pytz
 
 from zhenxun.configs.config import Config
 from zhenxun.services.log import logger
+from zhenxun.utils.manager.image_cache import ImageCache
 
 
 class ResourceDirManager:
@@ -52,6 +52,116 @@ class ResourceDirManager:
             cls.__tree_append(path)
 
 
+class LimitEntry:
+    """
+    限制器数据
+    """
+
+    __slots__ = ("expire", "value")
+
+    def __init__(self, value: Any, expire: float):
+        self.value = value
+        """数据"""
+        self.expire = expire
+        """过期时间"""
+
+
+class LimiterStore:
+    """
+    限制器数据存储，数据按键过期，超出容量时淘汰最久未使用的键
+
+    过期数据在读取时移除，并在写入新键时定期清理
+    """
+
+    def __init__(self, max_size: int = 100000, sweep_interval: float = 60):
+        """
+        参数:
+            max_size: 最大容量.
+            sweep_interval: 清理过期数据的间隔（秒）.
+        """
+        self._data: OrderedDict[Any, LimitEntry] = OrderedDict()
+        self.max_size = max_size
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_entry(self, key: Any) -> LimitEntry | None:
+        """获取未过期的数据，不会创建新键
+
+        参数:
+            key: 键
+
+        返回:
+            LimitEntry | None: 数据
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry.expire <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """获取未过期的值，不会创建新键
+
+        参数:
+            key: 键
+            default: 默认值.
+
+        返回:
+            Any: 值
+        """
+        entry = self.get_entry(key)
+        return default if entry is None else entry.value
+
+    def set(self, key: Any, value: Any, expire: float):
+        """设置值
+
+        参数:
+            key: 键
+            value: 值
+            expire: 过期时间
+        """
+        if entry := self._data.get(key):
+            entry.value = value
+            entry.expire = expire
+            self._data.move_to_end(key)
+            return
+        now = time.time()
+        if now >= self._next_sweep:
+            self.sweep(now)
+        while len(self._data) >= self.max_size:
+            self._data.popitem(last=False)
+        self._data[key] = LimitEntry(value, expire)
+
+    def pop(self, key: Any):
+        """移除键
+
+        参数:
+            key: 键
+        """
+        self._data.pop(key, None)
+
+    def sweep(self, now: float | None = None):
+        """清理过期数据
+
+        参数:
+            now: 当前时间.
+        """
+        now = now or time.time()
+        self._next_sweep = now + self.sweep_interval
+        for key in [k for k, v in self._data.items() if v.expire <= now]:
+            del self._data[key]
+
+    def clear(self):
+        """清空数据"""
+        self._data.clear()
+
+
 class CountLimiter:
     """
     每日调用命令次数限制
@@ -59,26 +169,32 @@ class CountLimiter:
 
     tz = pytz.timezone("Asia/Shanghai")
 
-    def __init__(self, max_num):
-        self.today = -1
-        self.count = defaultdict(int)
+    def __init__(self, max_num: int, max_size: int = 100000):
+        self.store = LimiterStore(max_size)
         self.max = max_num
+        self.reset_time = self.__next_reset_time()
+
+    def __next_reset_time(self) -> float:
+        """下一次重置次数的时间，即次日零点"""
+        tomorrow = datetime.now(self.tz).date() + timedelta(days=1)
+        return self.tz.localize(
+            datetime(tomorrow.year, tomorrow.month, tomorrow.day)
+        ).timestamp()
 
     def check(self, key) -> bool:
-        day = datetime.now(self.tz).day
-        if day != self.today:
-            self.today = day
-            self.count.clear()
-        return self.count[key] < self.max
+        if time.time() >= self.reset_time:
+            self.reset_time = self.__next_reset_time()
+            self.store.clear()
+        return self.store.get(key, 0) < self.max
 
     def get_num(self, key):
-        return self.count[key]
+        return self.store.get(key, 0)
 
     def increase(self, key, num=1):
-        self.count[key] += num
+        self.store.set(key, self.store.get(key, 0) + num, self.reset_time)
 
     def reset(self, key):
-        self.count[key] = 0
+        self.store.pop(key)
 
 
 class UserBlockLimiter:
@@ -86,21 +202,18 @@ class UserBlockLimiter:
     检测用户是否正在调用命令
     """
 
-    def __init__(self):
-        self.flag_data = defaultdict(bool)
-        self.time = time.time()
+    def __init__(self, block_time: float = 30, max_size: int = 100000):
+        self.store = LimiterStore(max_size)
+        self.block_time = block_time
 
     def set_true(self, key: Any):
-        self.time = time.time()
-        self.flag_data[key] = True
+        self.store.set(key, True, time.time() + self.block_time)
 
     def set_false(self, key: Any):
-        self.flag_data[key] = False
+        self.store.pop(key)
 
     def check(self, key: Any) -> bool:
-        if time.time() - self.time > 30:
-            self.set_false(key)
-        return not self.flag_data[key]
+        return not self.store.get(key, False)
 
 
 class FreqLimiter:
@@ -108,20 +221,95 @@ class FreqLimiter:
     命令冷却，检测用户是否处于冷却状态
     """
 
-    def __init__(self, default_cd_seconds: int):
-        self.next_time = defaultdict(float)
+    def __init__(self, default_cd_seconds: int, max_size: int = 100000):
+        self.store = LimiterStore(max_size)
         self.default_cd = default_cd_seconds
 
     def check(self, key: Any) -> bool:
-        return time.time() >= self.next_time[key]
+        return time.time() >= self.store.get(key, 0.0)
 
     def start_cd(self, key: Any, cd_time: int = 0):
-        self.next_time[key] = time.time() + (
-            cd_time if cd_time > 0 else self.default_cd
-        )
+        next_time = time.time() + (cd_time if cd_time > 0 else self.default_cd)
+        self.store.set(key, next_time, next_time)
+
+    def left_time(self, key: Any) -> float:
+        return self.store.get(key, 0.0) - time.time()
+
+
+class RateLimiter:
+    """
+    速率限制（GCRA），每个键只记录一个理论到达时间
+
+    等价于容量为 burst，每 interval 秒恢复一个令牌的令牌桶，
+    burst 为 1 时与 FreqLimiter 相同
+    """
+
+    def __init__(self, interval: float, burst: int = 1, max_size: int = 100000):
+        """
+        参数:
+            interval: 恢复一次调用次数所需的时间（秒）
+            burst: 允许连续调用的次数.
+            max_size: 最大容量.
+        """
+        self.store = LimiterStore(max_size)
+        self.interval = interval
+        self.tolerance = interval * (max(burst, 1) - 1)
+
+    def check(self, key: Any) -> bool:
+        return time.time() >= self.store.get(key, 0.0) - self.tolerance
+
+    def consume(self, key: Any):
+        now = time.time()
+        tat = max(self.store.get(key, now), now) + self.interval
+        self.store.set(key, tat, tat)
+
+    def left_time(self, key: Any) -> float:
+        return self.store.get(key, 0.0) - self.tolerance - time.time()
+
+
+class WindowLimiter:
+    """
+    滑动窗口次数限制，任意 period 秒内最多调用 max_count 次
+
+    每个键记录窗口内每次调用的时间
+    """
+
+    def __init__(self, max_count: int, period: float, max_size: int = 100000):
+        """
+        参数:
+            max_count: 最大调用次数
+            period: 时间段（秒）
+            max_size: 最大容量.
+        """
+        self.store = LimiterStore(max_size)
+        self.max_count = max_count
+        self.period = period
+
+    def _get_calls(self, key: Any, now: float) -> deque[float] | None:
+        calls: deque[float] | None = self.store.get(key)
+        if calls:
+            while calls and calls[0] <= now - self.period:
+                calls.popleft()
+        return calls
+
+    def check(self, key: Any) -> bool:
+        calls = self._get_calls(key, time.time())
+        return not calls or len(calls) < self.max_count
+
+    def consume(self, key: Any):
+        now = time.time()
+        calls = self._get_calls(key, now)
+        if calls is None:
+            calls = deque(maxlen=self.max_count)
+        calls.append(now)
+        self.store.set(key, calls, now + self.period)
 
     def left_time(self, key: Any) -> float:
-        return self.next_time[key] - time.time()
+        now = time.time()
+        calls = self._get_calls(key, now)
+        if not calls or len(calls) < self.max_count:
+            return 0
+        return calls[0] + self.period - now
 
 
 def cn2py(word: str) -> str:
@@ -139,14 +327,7 @@ async def get_user_avatar(uid: int | str) -> bytes | None:
     参数:
         uid: 用户id
     """
-    url = f"http://q1.qlogo.cn/g?b=qq&nk={uid}&s=160"
-    async with httpx.AsyncClient() as client:
-        for _ in range(3):
-            try:
-                return (await client.get(url)).content
-            except Exception:
-                logger.error("获取用户头像错误", "Util", target=uid)
-    return None
+    return await ImageCache.get(f"http://q1.qlogo.cn/g?b=qq&nk={uid}&s=160")
 
 
 async def get_group_avatar(gid: int | str) -> bytes | None:
@@ -155,14 +336,7 @@ async def get_group_avatar(gid: int | str) -> bytes | None:
     参数:
         gid: 群号
     """
-    url = f"http://p.qlogo.cn/gh/{gid}/{gid}/640/"
-    async with httpx.AsyncClient() as client:
-        for _ in range(3):
-            try:
-                return (await client.get(url)).content
-            except Exception:
-                logger.error("获取群头像错误", "Util", target=gid)
-    return None
+    return await ImageCache.get(f"http://p.qlogo.cn/gh/{gid}/{gid}/640/")
 
 
 def change_pixiv_image_links(